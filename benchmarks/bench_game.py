@@ -0,0 +1,228 @@
+"""
+Headless benchmarks of the game's hot paths.
+
+Runs every benchmark with the dummy SDL video and audio drivers, prints the time per call and compares
+it with a saved baseline. The script exits with status 1 when a benchmark got slower than the baseline
+by more than the threshold, so it can guard the frame budget in CI.
+
+Usage::
+
+    python benchmarks/bench_game.py --save-baseline     # record benchmarks/baseline.json
+    python benchmarks/bench_game.py --threshold 0.25    # fail on a regression of more than 25 %
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+
+from kpo.game import Game  # noqa: E402
+from kpo.render import NullRenderer  # noqa: E402
+from kpo.sim import TICK_MS  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def measure(func, number, repeat=5, setup=None):
+    """
+    Time a function and return the best time per call over several repeats.
+
+    :param func: The function to time.
+    :type func: callable
+    :param number: The number of calls per repeat.
+    :type number: int
+    :param repeat: The number of repeats. Default is 5.
+    :type repeat: int
+    :param setup: A function called before every repeat, outside the timing.
+    :type setup: callable
+    :return: The best time per call in seconds.
+    :rtype: float
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def fill_fruits(game, count):
+    """
+    Replace the fruits of the game with a fixed grid of fruits that stay on screen.
+
+    :param game: The game.
+    :type game: kpo.game.Game
+    :param count: The number of fruits.
+    :type count: int
+    """
+    fruits = game.fruits
+    fruits.clear()
+    width, height = game.current_resolution
+    for i in range(count):
+        fruits.add(i % len(fruits.names), 100 + (i * 37) % (width - 200), 200 + (i * 53) % (height - 300), -1)
+
+
+def start_game(game):
+    """
+    Put the game into the gameplay state as if START had been clicked.
+
+    :param game: The game.
+    :type game: kpo.game.Game
+    """
+    game.reset_game()
+    game.state = "game"
+    game.start_ticks = pygame.time.get_ticks()
+    game.background_img = game.ig_background_image
+
+
+def run_benchmarks(game):
+    """
+    Run all benchmarks.
+
+    :param game: The game to benchmark.
+    :type game: kpo.game.Game
+    :return: {benchmark name: seconds per call}
+    :rtype: dict
+    """
+    results = {}
+
+    # One world tick as run_game runs it: the fruits fly up and leave the screen, spawns are added and
+    # a short stroke of the pointer, moving across the screen from tick to tick, slices the fruits it crosses
+    width, height = game.current_resolution
+    strokes = itertools.cycle([[(x, y), (x + 40, y + 10)]
+                               for x, y in zip(range(100, width - 300, 37), range(150, height - 150, 11))])
+
+    def start_ticks(count):
+        start_game(game)
+        game.fruit_speed = -20
+        # Fruits leaving the screen cost lives; the session must not end during the benchmark
+        game.world.lives = 10 ** 9
+        fill_fruits(game, count)
+
+    def tick():
+        game.advance_world(TICK_MS, next(strokes), [])
+
+    for count in (10, 100, 1000, 10000):
+        results[f'advance_world[{count}]'] = measure(tick, number=20, setup=lambda: start_ticks(count))
+
+    for count in (100, 1000):
+        fill_fruits(game, count)
+        results[f'display_fruits[{count}]'] = measure(game.display_fruits, number=max(20, 20000 // count))
+
+    # Advance the clock by one spawn interval per call, so every call pops and adds the spawns that came due
+    def spawn():
+        game.world.time += game.world.spawn_interval * TICK_MS
+        game.spawn_random_fruits()
+        if len(game.fruits) > 1000:
+            game.fruits.clear()
+    results['spawn_random_fruits'] = measure(spawn, number=5000)
+
+    def hud():
+        game.display_timer()
+        game.display_score()
+        game.display_lives()
+        game.display_fps()
+        game.display_pause()
+    results['display_hud'] = measure(hud, number=500)
+
+    # The game-over update against a leaderboard with a long history
+    game.leaderboard.extend(('player', (i * 7919) % 5000, (i * 104729) % 600 / 10) for i in range(200000))
+
+    def update_best_scores():
+        game.score = 350
+        game.end_time = 30.0
+        game.update_best_scores()
+    results['update_best_scores'] = measure(update_best_scores, number=200)
+
+    resolutions = [(1280, 720), (1400, 800)]
+
+    def update_resolution():
+        resolutions.reverse()
+        game.update_resolution(resolutions[0])
+    results['update_resolution'] = measure(update_resolution, number=10)
+    game.update_resolution((1400, 800))
+
+    # Measure the work of a frame with one world tick, not the wait for the frame cap
+    start_game(game)
+    game.fruit_speed = 0
+    game.max_fps = 0
+    game.pacer.adaptive = False
+
+    def frame():
+        game.accumulator = TICK_MS
+        game.run_game(max_frames=1)
+    results['run_game_frame[100 fruits]'] = measure(frame, number=100, setup=lambda: fill_fruits(game, 100))
+
+    # The same frame without drawing: the cost of the game logic alone
+    renderer = game.renderer
+    game.renderer = NullRenderer(game.screen)
+    results['run_game_frame[100 fruits, null]'] = measure(frame, number=100, setup=lambda: fill_fruits(game, 100))
+    game.renderer = renderer
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the results next to the baseline and collect the regressions.
+
+    :param results: {benchmark name: seconds per call}
+    :type results: dict
+    :param baseline: {benchmark name: seconds per call} of the baseline.
+    :type baseline: dict
+    :param threshold: The allowed slowdown, e.g. 0.25 for 25 %.
+    :type threshold: float
+    :return: The names of the benchmarks that regressed.
+    :rtype: list
+    """
+    regressions = []
+    for name, seconds in results.items():
+        line = f'{name:<30} {seconds * 1e6:12.1f} us'
+        if name in baseline:
+            change = seconds / baseline[name] - 1
+            line += f'  {change:+7.1%}'
+            if change > threshold:
+                line += '  REGRESSION'
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of the game")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="path of the baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="save the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        results = run_benchmarks(Game(data_dir=data_dir))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+# Imported first, so the startup profile includes the imports of the package
+from kpo import startup  # noqa: F401
@@ -0,0 +1,137 @@
+"""
+Prebaked asset pack.
+
+Decoding the background JPGs and scaling them to the window size dominates startup and every
+resolution change. :func:`bake` does that work once at build time and writes the pre-scaled pixels
+of every background for every supported resolution, and of every fruit image, as raw buffers into
+``kpo/prebaked``. At runtime :func:`load_prebaked` memory-maps such a buffer and wraps it in a surface
+with ``pygame.image.frombuffer``, so no image has to be decoded or scaled.
+
+Run ``python -m kpo.assets`` to bake the pack into the source tree; ``setup.py build`` bakes it into
+the built package.
+"""
+import glob
+import mmap
+import os
+
+import pygame
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PREBAKED_DIR = os.path.join(BASE_DIR, 'prebaked')
+
+# The resolution the game is laid out, played and drawn at; frames are scaled to the window size.
+LOGICAL_RESOLUTION = (1400, 800)
+# The resolutions backgrounds are prebaked at.
+RESOLUTIONS = [LOGICAL_RESOLUTION]
+BACKGROUNDS = {
+    'background': os.path.join('background', 'background.jpg'),
+    'WelcomeScreen': os.path.join('background', 'WelcomeScreen.jpg'),
+}
+FRUIT_IMAGE_SIZE = (100, 100)
+
+# Mappings whose pixels are still used by an unconverted surface.
+_mapped = {}
+
+
+def prebaked_path(name, size, fmt, prebaked_dir=PREBAKED_DIR):
+    """
+    Get the path of a prebaked pixel buffer.
+
+    :param name: The name of the asset.
+    :type name: str
+    :param size: The size of the image (width, height).
+    :type size: tuple
+    :param fmt: The pixel format, 'RGB' or 'RGBA'.
+    :type fmt: str
+    :param prebaked_dir: The directory of the asset pack.
+    :type prebaked_dir: str
+    :return: The path of the buffer file.
+    :rtype: str
+    """
+    return os.path.join(prebaked_dir, f'{name}-{size[0]}x{size[1]}.{fmt.lower()}')
+
+
+def _to_bytes(surface, fmt):
+    # pygame.image.tostring was renamed to tobytes in pygame 2.1.3
+    to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+    return to_bytes(surface, fmt)
+
+
+def _write(path, data):
+    with open(path + '.tmp', 'wb') as file:
+        file.write(data)
+    os.replace(path + '.tmp', path)
+
+
+def bake(package_dir=BASE_DIR, prebaked_dir=None):
+    """
+    Write the pre-scaled pixel buffers of all backgrounds and fruit images.
+
+    :param package_dir: The directory of the kpo package holding the source images.
+    :type package_dir: str
+    :param prebaked_dir: The directory to write the buffers to. Default is ``prebaked`` in the package directory.
+    :type prebaked_dir: str
+    :return: The paths of the written files.
+    :rtype: list
+    """
+    prebaked_dir = prebaked_dir or os.path.join(package_dir, 'prebaked')
+    os.makedirs(prebaked_dir, exist_ok=True)
+    written = []
+
+    for name, relative_path in BACKGROUNDS.items():
+        image = pygame.image.load(os.path.join(package_dir, relative_path))
+        for size in RESOLUTIONS:
+            path = prebaked_path(name, size, 'RGB', prebaked_dir)
+            _write(path, _to_bytes(pygame.transform.scale(image, size), 'RGB'))
+            written.append(path)
+
+    for image_path in sorted(glob.glob(os.path.join(package_dir, 'fruits', '*.png'))):
+        name = 'fruit_' + os.path.splitext(os.path.basename(image_path))[0]
+        image = pygame.transform.scale(pygame.image.load(image_path), FRUIT_IMAGE_SIZE)
+        path = prebaked_path(name, FRUIT_IMAGE_SIZE, 'RGBA', prebaked_dir)
+        _write(path, _to_bytes(image, 'RGBA'))
+        written.append(path)
+
+    return written
+
+
+def load_prebaked(name, size, fmt='RGB', prebaked_dir=PREBAKED_DIR):
+    """
+    Load a prebaked image through a memory mapping of its pixel buffer.
+
+    When a display mode is set, the surface is converted to the display format (``convert`` for RGB,
+    ``convert_alpha`` for RGBA) so it blits fast, and the mapping is closed again.
+
+    :param name: The name of the asset.
+    :type name: str
+    :param size: The size of the image (width, height).
+    :type size: tuple
+    :param fmt: The pixel format, 'RGB' or 'RGBA'. Default is 'RGB'.
+    :type fmt: str
+    :param prebaked_dir: The directory of the asset pack.
+    :type prebaked_dir: str
+    :return: The image, or None if the asset pack has no buffer of that size.
+    :rtype: pygame.Surface or None
+    """
+    path = prebaked_path(name, size, fmt, prebaked_dir)
+    expected_size = size[0] * size[1] * len(fmt)
+    try:
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size != expected_size:
+                return None
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+    surface = pygame.image.frombuffer(mapping, tuple(size), fmt)
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha() if fmt == 'RGBA' else surface.convert()
+        mapping.close()
+    else:
+        _mapped[path] = mapping
+    return surface
+
+
+if __name__ == '__main__':
+    for written_path in bake():
+        print(written_path)
@@ -0,0 +1,137 @@
+import os
+import threading
+
+import pygame
+
+from kpo.scores import write_atomic
+
+
+class AudioManager:
+    """
+    Loads sound effects through a cache of decoded samples and plays them on a fixed pool of voices.
+
+    Decoding an MP3 costs far more than reading its samples, so the first load of a sound writes the
+    decoded samples to :attr:`cache_dir`, keyed on the source file and the mixer format, and later
+    loads build the sound straight from them.
+
+    Sounds are only played on ``voices`` reserved mixer channels. When all of them are busy, the voice
+    that started first is stopped and reused, and a sound is started at most once per frame (see
+    :meth:`end_frame`), so a combo of slices costs the same as a single slice.
+    """
+
+    def __init__(self, cache_dir, voices=4):
+        """
+        Initialize the audio manager.
+
+        :param cache_dir: The directory the decoded samples are kept in.
+        :type cache_dir: str
+        :param voices: The number of mixer channels reserved for sound effects. Default is 4.
+        :type voices: int
+        """
+        self.cache_dir = cache_dir
+        self.voices = voices
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.played = 0
+        self.stolen = 0
+        self.limited = 0
+        self._channels = None
+        self._started = []
+        self._frame_sounds = set()
+        self._lock = threading.Lock()
+
+    def cache_path(self, path):
+        """
+        Get the path of the decoded samples of a sound file for the current mixer format.
+
+        :param path: The path of the sound file.
+        :type path: str
+        :return: The path of the cache file, or None if the mixer is not initialized.
+        :rtype: str or None
+        """
+        mixer_format = pygame.mixer.get_init()
+        if not mixer_format:
+            return None
+        frequency, size, channels = mixer_format
+        stat = os.stat(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f'{name}-{stat.st_size}-{stat.st_mtime_ns}-'
+                                            f'{frequency}-{size}-{channels}.pcm')
+
+    def load(self, path):
+        """
+        Load a sound effect, from the cache of decoded samples if possible.
+
+        :param path: The path of the sound file.
+        :type path: str
+        :return: The sound, or None if the file is not found.
+        :rtype: pygame.mixer.Sound or None
+        """
+        try:
+            cache_path = self.cache_path(path)
+        except FileNotFoundError:
+            return None
+        sound = None
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'rb') as file:
+                    sound = pygame.mixer.Sound(buffer=file.read())
+                with self._lock:
+                    self.cache_hits += 1
+            except OSError:
+                pass
+        if sound is None:
+            try:
+                sound = pygame.mixer.Sound(path)
+            except FileNotFoundError:
+                return None
+            with self._lock:
+                self.cache_misses += 1
+            if cache_path is not None:
+                try:
+                    write_atomic(cache_path, sound.get_raw())
+                except OSError as error:
+                    print(f"Error: could not cache the samples of '{path}': {error}")
+        return sound
+
+    def _voices(self):
+        if self._channels is None:
+            if pygame.mixer.get_num_channels() < self.voices:
+                pygame.mixer.set_num_channels(self.voices)
+            pygame.mixer.set_reserved(self.voices)
+            self._channels = [pygame.mixer.Channel(i) for i in range(self.voices)]
+            self._started = [0] * self.voices
+        return self._channels
+
+    def play(self, sound):
+        """
+        Play a sound effect on a free voice, or on the oldest voice if none is free.
+
+        :param sound: The sound to play. None is ignored, e.g. for a sound that failed to load.
+        :type sound: pygame.mixer.Sound or None
+        :return: True if the sound was started, False if it was dropped.
+        :rtype: bool
+        """
+        if sound is None or not pygame.mixer.get_init():
+            return False
+        if sound in self._frame_sounds:
+            self.limited += 1
+            return False
+        self._frame_sounds.add(sound)
+
+        channels = self._voices()
+        voice = next((i for i, channel in enumerate(channels) if not channel.get_busy()), None)
+        if voice is None:
+            voice = min(range(len(channels)), key=self._started.__getitem__)
+            channels[voice].stop()
+            self.stolen += 1
+        channels[voice].play(sound)
+        self.played += 1
+        self._started[voice] = self.played
+        return True
+
+    def end_frame(self):
+        """
+        Allow every sound to be started again in the next frame.
+        """
+        self._frame_sounds.clear()
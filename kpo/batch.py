@@ -0,0 +1,263 @@
+"""
+Batch simulation of headless sessions for difficulty tuning.
+
+Sessions are played by bot policies on a :class:`kpo.sim.World` without a display, spread over a process
+pool, and summarized into score and survival time distributions. A parameter grid can be swept in one
+run, e.g.::
+
+    kpo-sim --games 10000 --workers 8 --policy greedy \\
+        --set speed_increase_interval=3000,5000,8000 --set spawn_interval=31,41 --output results.csv
+"""
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from kpo.fruit import FRUIT_SIZE
+from kpo.sim import TICK_MS, World
+
+# The World attributes that can be changed with --set
+PARAMETERS = {
+    'speed_increase_interval': int,
+    'speed_step': float,
+    'spawn_interval': int,
+}
+
+
+class IdleBot:
+    """
+    Never touches the screen; the baseline every other policy is compared with.
+    """
+
+    def __call__(self, world):
+        return []
+
+
+class SweepBot:
+    """
+    Swipes back and forth along a fixed row, like a player who does not aim.
+    """
+
+    def __init__(self, speed=40, row=0.3):
+        """
+        Initialize the bot.
+
+        :param speed: The pointer speed in pixels per tick. Default is 40.
+        :type speed: int or float
+        :param row: The height of the row as a fraction of the screen height, from the top. Default is 0.3.
+        :type row: float
+        """
+        self.speed = speed
+        self.row = row
+        self.x = 0
+        self.direction = 1
+
+    def __call__(self, world):
+        width, height = world.resolution
+        y = int(height * self.row)
+        start = self.x
+        self.x += self.direction * self.speed
+        if not 0 <= self.x <= width:
+            self.direction = -self.direction
+            self.x = min(max(self.x, 0), width)
+        return [(int(start), y), (int(self.x), y)]
+
+
+class GreedyBot:
+    """
+    Chases the fruit closest to leaving the screen with a pointer of limited speed.
+    """
+
+    def __init__(self, speed=60):
+        """
+        Initialize the bot.
+
+        :param speed: The pointer speed in pixels per tick. Default is 60.
+        :type speed: int or float
+        """
+        self.speed = speed
+        self.position = None
+
+    def __call__(self, world):
+        width, height = world.resolution
+        if self.position is None:
+            self.position = np.array([width / 2, height / 2])
+        fruits = world.fruits
+        count = len(fruits)
+        if not count:
+            return []
+        # Fruits rise from the bottom edge, so the one with the smallest y leaves the screen first
+        target = int(np.argmin(fruits.y[:count]))
+        goal = np.array([fruits.x[target], fruits.y[target]]) + FRUIT_SIZE / 2
+        start = self.position
+        step = goal - start
+        distance = np.hypot(*step)
+        if distance > self.speed:
+            step *= self.speed / distance
+        self.position = start + step
+        return [(int(start[0]), int(start[1])), (int(self.position[0]), int(self.position[1]))]
+
+
+POLICIES = {
+    'idle': IdleBot,
+    'sweep': SweepBot,
+    'greedy': GreedyBot,
+}
+
+
+def play(seed, policy='greedy', parameters=None, resolution=(1400, 800), max_ticks=36000):
+    """
+    Play one session with a bot.
+
+    :param seed: The seed of the session.
+    :type seed: int
+    :param policy: The name of the bot policy in :data:`POLICIES`. Default is 'greedy'.
+    :type policy: str
+    :param parameters: {World attribute: value} to change before the session starts.
+    :type parameters: dict
+    :param resolution: The size of the playing field. Default is (1400, 800).
+    :type resolution: tuple
+    :param max_ticks: The length at which a session is stopped. Default is 36000 ticks (10 minutes).
+    :type max_ticks: int
+    :return: The seed, score, survival time in seconds and whether the session hit max_ticks.
+    :rtype: dict
+    """
+    world = World(resolution, seed=seed)
+    for name, value in (parameters or {}).items():
+        setattr(world, name, value)
+    bot = POLICIES[policy]()
+    ticks = 0
+    while not world.over and ticks < max_ticks:
+        world.step(TICK_MS, bot(world))
+        ticks += 1
+    return {'seed': seed, 'score': world.score, 'survival': ticks * TICK_MS / 1000, 'capped': not world.over}
+
+
+def _play_job(job):
+    # Unpacks a job for Pool.imap_unordered, which passes a single argument
+    parameters, kwargs = job
+    result = play(parameters=parameters, **kwargs)
+    result.update(parameters)
+    return result
+
+
+def run_batch(games, workers=None, policy='greedy', parameters=None, seed=0, max_ticks=36000):
+    """
+    Play many sessions, spread over a process pool, and yield their results as they finish.
+
+    :param games: The number of sessions.
+    :type games: int
+    :param workers: The number of processes. Default is the number of CPUs; 1 plays in this process.
+    :type workers: int
+    :param policy: The name of the bot policy. Default is 'greedy'.
+    :type policy: str
+    :param parameters: {World attribute: value} for every session.
+    :type parameters: dict
+    :param seed: The seed of the first session; session i uses seed + i. Default is 0.
+    :type seed: int
+    :param max_ticks: The length at which a session is stopped. Default is 36000 ticks.
+    :type max_ticks: int
+    :return: An iterator of the results of :func:`play`, with the parameters added, in completion order.
+    :rtype: iterator
+    """
+    parameters = dict(parameters or {})
+    jobs = ((parameters, {'seed': seed + game, 'policy': policy, 'max_ticks': max_ticks}) for game in range(games))
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        yield from map(_play_job, jobs)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_play_job, jobs, chunksize=max(1, min(64, games // (workers * 8))))
+
+
+def summarize(results):
+    """
+    Summarize the score and survival time distributions of sessions.
+
+    :param results: The results of :func:`play`.
+    :type results: list
+    :return: {'games', 'capped', and mean, p10, p50, p90 and max of 'score' and 'survival'}
+    :rtype: dict
+    """
+    summary = {'games': len(results), 'capped': sum(result['capped'] for result in results)}
+    for key in ('score', 'survival'):
+        values = np.array([result[key] for result in results], dtype=float)
+        p10, p50, p90 = np.percentile(values, (10, 50, 90)) if len(values) else (0, 0, 0)
+        summary[key] = {'mean': values.mean() if len(values) else 0, 'p10': p10, 'p50': p50, 'p90': p90,
+                        'max': values.max() if len(values) else 0}
+    return summary
+
+
+def parse_grid(settings):
+    """
+    Build the parameter grid from --set options.
+
+    :param settings: Options like 'spawn_interval=31,41'.
+    :type settings: list
+    :return: One {World attribute: value} per combination.
+    :rtype: list
+    :raises ValueError: If an option is malformed or names an unknown parameter.
+    """
+    axes = []
+    for setting in settings:
+        name, _, values = setting.partition('=')
+        if name not in PARAMETERS or not values:
+            raise ValueError(f"Invalid --set '{setting}'; expected one of {', '.join(PARAMETERS)} "
+                             f"followed by =value[,value...]")
+        axes.append([(name, PARAMETERS[name](value)) for value in values.split(',')])
+    return [dict(combination) for combination in itertools.product(*axes)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless Fruit Ninja sessions with bots and "
+                                                 "summarize the score and survival time")
+    parser.add_argument('--games', type=int, default=1000, help="sessions per parameter combination (default: 1000)")
+    parser.add_argument('--workers', type=int, help="number of processes (default: number of CPUs)")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy', help="bot policy (default: greedy)")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=V1[,V2...]',
+                        help=f"World parameter values to sweep; one of {', '.join(PARAMETERS)}")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first session (default: 0)")
+    parser.add_argument('--max-ticks', type=int, default=36000, help="stop sessions after this many ticks")
+    parser.add_argument('--output', help="CSV file the result of every session is written to as it finishes")
+    args = parser.parse_args()
+
+    try:
+        grid = parse_grid(args.set)
+    except ValueError as error:
+        parser.error(str(error))
+
+    output = open(args.output, 'w', newline='') if args.output else None
+    writer = None
+    try:
+        for parameters in grid:
+            start = time.perf_counter()
+            results = []
+            for result in run_batch(args.games, args.workers, args.policy, parameters, args.seed, args.max_ticks):
+                results.append(result)
+                if output:
+                    if writer is None:
+                        writer = csv.DictWriter(output, fieldnames=list(result) + [name for name in PARAMETERS
+                                                                                   if name not in result])
+                        writer.writeheader()
+                    writer.writerow(result)
+            summary = summarize(results)
+            label = ' '.join(f'{name}={value}' for name, value in parameters.items()) or 'defaults'
+            print(f"{label}: {summary['games']} games in {time.perf_counter() - start:.1f} s, "
+                  f"{summary['capped']} reached the tick limit")
+            for key, unit in (('score', ''), ('survival', ' s')):
+                stats = summary[key]
+                print(f"  {key:<8} mean {stats['mean']:8.1f}{unit}  p10 {stats['p10']:8.1f}{unit}  "
+                      f"p50 {stats['p50']:8.1f}{unit}  p90 {stats['p90']:8.1f}{unit}  max {stats['max']:8.1f}{unit}")
+            sys.stdout.flush()
+    finally:
+        if output:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
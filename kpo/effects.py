@@ -0,0 +1,164 @@
+import numpy as np
+import pygame
+
+# Color of the juice splashing out of a sliced fruit, by fruit type.
+JUICE_COLORS = {
+    'watermelon': (220, 20, 60),
+    'apple': (170, 230, 60),
+    'banana': (255, 225, 50),
+}
+DEFAULT_JUICE_COLOR = (255, 255, 255)
+
+# Downward acceleration of juice particles in pixels per millisecond squared.
+GRAVITY = 0.002
+
+
+class ParticlePool:
+    """
+    Fixed-size pool of juice particles stored in preallocated NumPy arrays.
+
+    All particles live equally long, so they die in the order they were emitted. The pool is therefore
+    a ring buffer: the live particles are the ``count`` slots starting at ``head``, emitting writes after
+    the newest particle (overwriting the oldest one when the pool is full) and expiring just moves
+    ``head`` forward. Updating works in place on the whole arrays, so no memory is allocated per frame.
+    """
+
+    def __init__(self, capacity=512, lifetime=450, size=6, seed=None):
+        """
+        Initialize an empty particle pool.
+
+        :param capacity: The maximum number of live particles. Default is 512.
+        :type capacity: int
+        :param lifetime: How long a particle lives in milliseconds. Default is 450.
+        :type lifetime: int or float
+        :param size: The width and height of a particle in pixels. Default is 6.
+        :type size: int
+        :param seed: The seed of the generator used for particle velocities. Default is random.
+        :type seed: int
+        """
+        self.capacity = capacity
+        self.lifetime = lifetime
+        self.size = size
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.born = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.palette = []
+        self.head = 0
+        self.count = 0
+        self._scratch = np.zeros(capacity)
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """
+        Remove all particles.
+        """
+        self.head = 0
+        self.count = 0
+
+    def emit(self, x_pos, y_pos, color, amount, now):
+        """
+        Emit a burst of particles flying out of a point.
+
+        :param x_pos: The x-coordinate of the point.
+        :type x_pos: int or float
+        :param y_pos: The y-coordinate of the point.
+        :type y_pos: int or float
+        :param color: The color of the particles.
+        :type color: tuple
+        :param amount: The number of particles.
+        :type amount: int
+        :param now: The current time in milliseconds.
+        :type now: int or float
+        """
+        if color not in self.palette:
+            self.palette.append(color)
+        amount = min(amount, self.capacity)
+        slots = (self.head + self.count + np.arange(amount)) % self.capacity
+        angles = self._rng.uniform(0, 2 * np.pi, amount)
+        speeds = self._rng.uniform(0.1, 0.4, amount)
+        self.x[slots] = x_pos
+        self.y[slots] = y_pos
+        self.vx[slots] = np.cos(angles) * speeds
+        self.vy[slots] = np.sin(angles) * speeds
+        self.born[slots] = now
+        self.color[slots] = self.palette.index(color)
+
+        overflow = self.count + amount - self.capacity
+        if overflow > 0:
+            self.head = (self.head + overflow) % self.capacity
+        self.count = min(self.count + amount, self.capacity)
+
+    def update(self, dt, now):
+        """
+        Move the particles and retire the ones that outlived their lifetime.
+
+        :param dt: The time since the last update in milliseconds.
+        :type dt: int or float
+        :param now: The current time in milliseconds.
+        :type now: int or float
+        """
+        while self.count and now - self.born[self.head] >= self.lifetime:
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+        if not self.count:
+            return
+        np.multiply(self.vx, dt, out=self._scratch)
+        np.add(self.x, self._scratch, out=self.x)
+        np.multiply(self.vy, dt, out=self._scratch)
+        np.add(self.y, self._scratch, out=self.y)
+        np.add(self.vy, GRAVITY * dt, out=self.vy)
+
+    def draw(self, renderer):
+        """
+        Draw the live particles.
+
+        :param renderer: The renderer to draw with.
+        :type renderer: kpo.render.Renderer
+        """
+        end = self.head + self.count
+        windows = [(self.head, min(end, self.capacity))]
+        if end > self.capacity:
+            windows.append((0, end - self.capacity))
+        size = self.size
+        palette = self.palette
+        for start, stop in windows:
+            for x_pos, y_pos, color in zip(self.x[start:stop].tolist(), self.y[start:stop].tolist(),
+                                           self.color[start:stop].tolist()):
+                renderer.draw_rect(palette[color], (x_pos, y_pos, size, size))
+
+
+class OverlayCache:
+    """
+    Full-screen translucent overlays, created once per resolution, color and opacity.
+    """
+
+    def __init__(self):
+        self._surfaces = {}
+
+    def get(self, size, color, alpha):
+        """
+        Get an overlay surface, creating it on first use.
+
+        :param size: The size of the overlay (width, height).
+        :type size: tuple
+        :param color: The fill color.
+        :type color: tuple
+        :param alpha: The opacity from 0 to 255.
+        :type alpha: int
+        :return: The overlay.
+        :rtype: pygame.Surface
+        """
+        key = (tuple(size), color, alpha)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(key[0])
+            surface.set_alpha(alpha)
+            surface.fill(color)
+            self._surfaces[key] = surface
+        return surface
@@ -2,17 +2,27 @@ import random
 import pygame
 import os
 
+import numpy as np
+
+from kpo.assets import load_prebaked
+
+# Width and height of a fruit on screen, in pixels.
+FRUIT_SIZE = 100
+FRUITS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fruits')
+
 
 class Fruit:
     """
     Represents a fruit in the game with a specific type, position, and speed.
 
-    The Fruit class handles loading and displaying fruit images, setting positions, and managing
-    the fruit's movement within the game.
+    The Fruit class handles loading and displaying fruit images and holds the fruit's position.
+    Fruits are small slotted records; :class:`FruitPool` recycles them so handing fruits out does
+    not allocate once the game is running.
     """
+    __slots__ = ('name', 'speed', 'x_pos', 'y_pos')
     images = {}
 
-    def __init__(self, name, speed, resolution):
+    def __init__(self, name, speed, resolution, x_pos=None, y_pos=None):
         """
                 Initialize a new Fruit object.
 
@@ -22,81 +32,321 @@ class Fruit:
                 :type speed: int or float
                 :param resolution: The screen resolution, used to set initial positions.
                 :type resolution: tuple
+                :param x_pos: The initial x-coordinate. Default is a random position on the screen.
+                :type x_pos: int or float
+                :param y_pos: The initial y-coordinate. Default is the bottom edge of the screen.
+                :type y_pos: int or float
                 """
         self.name = name
-        self._x_pos = random.randint(100, resolution[0] - 100)
-        self._y_pos = resolution[1]
         self.speed = speed
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        img_path = os.path.join(base_dir, 'fruits', name + '.png')
+        self.x_pos = random.randint(100, resolution[0] - 100) if x_pos is None else x_pos
+        self.y_pos = resolution[1] if y_pos is None else y_pos
+
+    @classmethod
+    def load_image(cls, name):
+        """
+                Load and cache the image of a fruit type.
 
-        if name not in Fruit.images:
-            try:
-                img = pygame.image.load(img_path).convert_alpha()
-                Fruit.images[name] = pygame.transform.scale(img, (100, 100))
-            except FileNotFoundError:
-                print(f"Error: Image file '{img_path}' not found.")
-                Fruit.images[name] = pygame.Surface((100, 100))
+                The image is decoded only the first time a fruit of the given type is drawn, so
+                fruits can be created and moved without a display. It is run-length encoded, which
+                skips its transparent corners when blitting and makes drawing a fruit several times faster.
 
-        self.img = Fruit.images[name]
-        self.img_pos = [self._x_pos, self._y_pos]
+                :param name: The name of the fruit, used to find the corresponding image file.
+                :type name: str
+                :return: The fruit image scaled to 100x100.
+                :rtype: pygame.Surface
+                """
+        if name not in cls.images:
+            image = load_prebaked('fruit_' + name, (FRUIT_SIZE, FRUIT_SIZE), 'RGBA')
+            if image is None:
+                img_path = os.path.join(FRUITS_DIR, name + '.png')
+                try:
+                    img = pygame.image.load(img_path).convert_alpha()
+                    image = pygame.transform.scale(img, (FRUIT_SIZE, FRUIT_SIZE))
+                except FileNotFoundError:
+                    print(f"Error: Image file '{img_path}' not found.")
+                    image = pygame.Surface((FRUIT_SIZE, FRUIT_SIZE))
+            image.set_alpha(image.get_alpha(), pygame.RLEACCEL)
+            cls.images[name] = image
+        return cls.images[name]
 
     @property
-    def x_pos(self):
+    def img(self):
         """
-               Get the current x-coordinate of the fruit.
+                Get the image of the fruit.
 
-               :return: The x-coordinate of the fruit.
-               :rtype: int
-               """
-        return self._x_pos
+                :return: The fruit image.
+                :rtype: pygame.Surface
+                """
+        return Fruit.load_image(self.name)
 
     @property
-    def y_pos(self):
+    def img_pos(self):
         """
-                Get the current y-coordinate of the fruit.
+                Get the current position of the fruit's image.
 
-                :return: The y-coordinate of the fruit.
-                :rtype: int
+                :return: The position of the fruit's image as a list [x, y].
+                :rtype: list
                 """
-        return self._y_pos
+        return [self.x_pos, self.y_pos]
+
+
+class FruitPool:
+    """
+    Free list of Fruit objects.
 
-    @x_pos.setter
-    def x_pos(self, value):
+    Released fruits are kept and handed out again by :meth:`acquire`, so fruits are only allocated
+    until the pool holds as many as are in use at the same time.
+    """
+
+    def __init__(self):
+        self._free = []
+
+    def __len__(self):
+        return len(self._free)
+
+    def acquire(self, name, speed, x_pos, y_pos):
         """
-                Set the x-coordinate of the fruit.
+        Get a fruit from the pool, creating one only if the pool is empty.
 
-                :param value: The new x-coordinate value to set.
-                :type value: int
-                """
-        self._x_pos = value
+        :param name: The name of the fruit.
+        :type name: str
+        :param speed: The speed of the fruit.
+        :type speed: int or float
+        :param x_pos: The x-coordinate of the fruit.
+        :type x_pos: int or float
+        :param y_pos: The y-coordinate of the fruit.
+        :type y_pos: int or float
+        :return: The fruit.
+        :rtype: Fruit
+        """
+        if not self._free:
+            return Fruit(name, speed, None, x_pos, y_pos)
+        fruit = self._free.pop()
+        fruit.name = name
+        fruit.speed = speed
+        fruit.x_pos = x_pos
+        fruit.y_pos = y_pos
+        return fruit
 
-    @y_pos.setter
-    def y_pos(self, value):
+    def release(self, fruits):
         """
-                Set the y-coordinate of the fruit.
+        Return fruits to the pool. The fruits must not be used afterwards.
 
-                :param value: The new y-coordinate value to set.
-                :type value: int
-                """
-        self._y_pos = value
+        :param fruits: The fruits to return.
+        :type fruits: list
+        """
+        self._free.extend(fruits)
 
-    @property
-    def img_pos(self):
+
+class FruitStore:
+    """
+    Stores all live fruits as NumPy columns instead of a list of Fruit objects.
+
+    Every fruit is a row of the x, y, speed and kind columns, where kind is the index of the fruit
+    type in :attr:`names`. Only the first ``len(store)`` rows are live. Moving, culling and hit-testing
+    work on whole columns at once, and removed rows are filled with rows from the end of the store
+    (swap-remove), so the order of fruits is not preserved.
+
+    Fruits never move sideways, so the store also keeps a broad-phase index of rows by screen
+    column (:attr:`cells`, one column per fruit width). Slicing only tests the fruits in the
+    columns a pointer path crosses instead of every fruit in the store.
+    """
+
+    def __init__(self, names, capacity=64):
         """
-                Get the current position of the fruit's image.
+        Initialize an empty fruit store.
 
-                :return: The position of the fruit's image as a list [x, y].
-                :rtype: list
-                """
-        return self._img_pos
+        :param names: The names of the fruit types, indexed by the kind column.
+        :type names: list
+        :param capacity: The number of rows allocated up front. The store grows when it is full.
+        :type capacity: int
+        """
+        self.names = names
+        self.pool = FruitPool()
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.kind = np.zeros(capacity, dtype=np.int16)
+        self.cells = {}
+
+    def __len__(self):
+        return self.count
 
-    @img_pos.setter
-    def img_pos(self, pos_x_y):
+    def __getitem__(self, index):
         """
-                Set the position of the fruit's image.
+        Get a live fruit as a Fruit object.
 
-                :param pos_x_y: The new position of the fruit's image as a list [x, y].
-                :type pos_x_y: list
-                """
-        self._img_pos = pos_x_y
+        :param index: The row of the fruit.
+        :type index: int
+        :return: A Fruit from :attr:`pool` holding a copy of the row.
+        :rtype: Fruit
+        """
+        if not -self.count <= index < self.count:
+            raise IndexError('fruit index out of range')
+        index %= self.count
+        return self.pool.acquire(self.names[self.kind[index]], self.speed[index].item(),
+                                 self.x[index].item(), self.y[index].item())
+
+    def _columns(self):
+        return self.x, self.y, self.speed, self.kind
+
+    def _grow(self):
+        capacity = 2 * len(self.x)
+        for name, column in zip(('x', 'y', 'speed', 'kind'), self._columns()):
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def add(self, kind, x_pos, y_pos, speed):
+        """
+        Append a fruit to the store.
+
+        :param kind: The index of the fruit type in :attr:`names`.
+        :type kind: int
+        :param x_pos: The x-coordinate of the fruit.
+        :type x_pos: int or float
+        :param y_pos: The y-coordinate of the fruit.
+        :type y_pos: int or float
+        :param speed: The speed of the fruit when it was spawned.
+        :type speed: int or float
+        """
+        if self.count == len(self.x):
+            self._grow()
+        row = self.count
+        self.x[row] = x_pos
+        self.y[row] = y_pos
+        self.speed[row] = speed
+        self.kind[row] = kind
+        self.count += 1
+        self.cells.setdefault(int(x_pos // FRUIT_SIZE), set()).add(row)
+
+    def clear(self):
+        """
+        Remove all fruits, keeping the allocated columns.
+        """
+        self.count = 0
+        self.cells.clear()
+
+    def move(self, dy):
+        """
+        Move all fruits vertically.
+
+        :param dy: The vertical displacement in pixels.
+        :type dy: int or float
+        """
+        self.y[:self.count] += dy
+
+    def hit_point(self, px, py):
+        """
+        Find the fruits whose box contains a point.
+
+        :param px: The x-coordinate of the point.
+        :type px: int or float
+        :param py: The y-coordinate of the point.
+        :type py: int or float
+        :return: A boolean mask over the live rows.
+        :rtype: numpy.ndarray
+        """
+        x = self.x[:self.count]
+        y = self.y[:self.count]
+        return (x <= px) & (px < x + FRUIT_SIZE) & (y <= py) & (py < y + FRUIT_SIZE)
+
+    def hit_path(self, points):
+        """
+        Find the fruits touched by a pointer path.
+
+        Every segment between two consecutive points is tested against the fruit boxes, so a fast
+        swipe slices the fruits it passes over even if no sampled point lies inside them. A single
+        point is tested like :meth:`hit_point`.
+
+        :param points: The pointer positions (x, y), oldest first.
+        :type points: list
+        :return: A boolean mask over the live rows.
+        :rtype: numpy.ndarray
+        """
+        mask = np.zeros(self.count, dtype=bool)
+        if len(points) == 1:
+            segments = [(points[0], points[0])]
+        else:
+            segments = zip(points, points[1:])
+
+        for (x0, y0), (x1, y1) in segments:
+            # Boxes starting in (min_x - FRUIT_SIZE, max_x] can overlap the segment horizontally
+            first = int((min(x0, x1) - FRUIT_SIZE) // FRUIT_SIZE)
+            last = int(max(x0, x1) // FRUIT_SIZE)
+            candidates = [row for cell in range(first, last + 1) for row in self.cells.get(cell, ())]
+            if not candidates:
+                continue
+            rows = np.array(candidates)
+            mask[rows[self._segment_hits(rows, x0, y0, x1, y1)]] = True
+        return mask
+
+    def _segment_hits(self, rows, x0, y0, x1, y1):
+        # Slab test of the segment against the boxes of the given rows
+        t_min = np.zeros(len(rows))
+        t_max = np.ones(len(rows))
+        inside = np.ones(len(rows), dtype=bool)
+        for start, delta, low in ((x0, x1 - x0, self.x[rows]), (y0, y1 - y0, self.y[rows])):
+            high = low + FRUIT_SIZE
+            if delta == 0:
+                inside &= (low <= start) & (start < high)
+            else:
+                t_low = (low - start) / delta
+                t_high = (high - start) / delta
+                np.maximum(t_min, np.minimum(t_low, t_high), out=t_min)
+                np.minimum(t_max, np.maximum(t_low, t_high), out=t_max)
+        return inside & (t_min <= t_max)
+
+    def below(self, limit):
+        """
+        Find the fruits that moved above a vertical limit, i.e. left the top of the screen.
+
+        :param limit: The y-coordinate limit.
+        :type limit: int or float
+        :return: A boolean mask over the live rows.
+        :rtype: numpy.ndarray
+        """
+        return self.y[:self.count] < limit
+
+    def take(self, mask, into):
+        """
+        Get the fruits selected by a mask as Fruit objects from :attr:`pool`.
+
+        :param mask: A boolean mask over the live rows.
+        :type mask: numpy.ndarray
+        :param into: The list to append the fruits to.
+        :type into: list
+        """
+        for index in np.flatnonzero(mask).tolist():
+            into.append(self[index])
+
+    def remove(self, mask):
+        """
+        Remove the fruits selected by a mask.
+
+        The holes left by removed rows below the new length are filled with the live rows
+        beyond it, so only as many rows move as are removed.
+
+        :param mask: A boolean mask over the live rows.
+        :type mask: numpy.ndarray
+        """
+        removed = np.flatnonzero(mask)
+        if not len(removed):
+            return
+        length = self.count - len(removed)
+        holes = removed[removed < length]
+        tail = np.flatnonzero(~mask[length:]) + length
+
+        cells = self.cells
+        for row, x_pos in zip(removed.tolist(), self.x[removed].tolist()):
+            cells[int(x_pos // FRUIT_SIZE)].discard(row)
+        for hole, row, x_pos in zip(holes.tolist(), tail.tolist(), self.x[tail].tolist()):
+            cell = cells[int(x_pos // FRUIT_SIZE)]
+            cell.discard(row)
+            cell.add(hole)
+
+        for column in self._columns():
+            column[holes] = column[tail]
+        self.count = length
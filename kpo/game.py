@@ -1,73 +1,271 @@
 import json
 import os
 
+import numpy as np
 import pygame
 import sys
-import random
-
-from kpo.fruit import Fruit
+import time
+
+from kpo.assets import LOGICAL_RESOLUTION, load_prebaked
+from kpo.audio import AudioManager
+from kpo.effects import DEFAULT_JUICE_COLOR, JUICE_COLORS, OverlayCache, ParticlePool
+from kpo.fruit import FRUIT_SIZE, Fruit
+from kpo.loader import AssetLoader
+from kpo.pacer import FramePacer
+from kpo.profiler import FrameProfiler
+from kpo.render import RENDERERS
+from kpo.scores import FileWriter, ScoreWriter, default_data_dir, read_legacy_scores, write_json_atomic
+from kpo.screens import ScreenCache, StaticScreen
+from kpo.sim import TICK_MS, World
+from kpo.startup import StartupProfile
+from kpo.text import TextCache
+
+# Assets that must be loaded before the menu can be shown.
+MENU_ASSETS = ('font', 'welcome_screen')
+# Number of best scores shown on the game-over screen
+BEST_SCORES_COUNT = 5
+# Events the game handles. All other events are dropped before they reach the event queue, so they
+# neither cost time to fetch nor wake the loop up while it waits for input.
+HANDLED_EVENTS = (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.KEYDOWN, pygame.WINDOWEXPOSED)
+
+
+class _WorldAttribute:
+    """
+    Forward a Game attribute to the attribute of the same name on the game's World.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, game, owner=None):
+        if game is None:
+            return self
+        return getattr(game.world, self.name)
+
+    def __set__(self, game, value):
+        setattr(game.world, self.name, value)
 
 
 class Game:
-    def __init__(self, res_x=1400, res_y=800):
+    fruits = _WorldAttribute()
+    fruit_types = _WorldAttribute()
+    speed_increase_interval = _WorldAttribute()
+    last_speed_increase_time = _WorldAttribute()
+    fruit_speed = _WorldAttribute()
+    score = _WorldAttribute()
+    lives = _WorldAttribute()
+
+    def __init__(self, res_x=1400, res_y=800, dirty_rects=False, background_loading=False, data_dir=None,
+                 render_backend='pygame'):
         """
         Initialize the game with the given resolution.
 
         This method sets up the initial state of the game, including screen resolution, assets loading,
         and initializing Pygame modules.
 
-        :param res_x: The width of the game window. Default is 1400.
+        :param res_x: The width of the game window. The game is played at :data:`kpo.assets.LOGICAL_RESOLUTION` and
+            scaled to the window. Default is 1400.
         :type res_x: int
         :param res_y: The height of the game window. Default is 800.
         :type res_y: int
+        :param dirty_rects: Whether to redraw and present only the changed areas of the screen. Default is False.
+        :type dirty_rects: bool
+        :param background_loading: Whether assets are loaded on worker threads while the window already
+            shows a loading screen. Default is False, which loads all assets before returning.
+        :type background_loading: bool
+        :param data_dir: The directory the best scores are kept in. Default is :func:`kpo.scores.default_data_dir`.
+        :type data_dir: str
+        :param render_backend: The name of the render backend in :data:`kpo.render.RENDERERS`: 'pygame' draws
+            to the window, 'null' draws nothing and 'recording' draws nothing but counts the draw calls.
+            Default is 'pygame'.
+        :type render_backend: str
         """
+        self.startup = StartupProfile()
+        self.startup.mark('imports')
         self.setting_buttons_rects = None
         self.buttons_rects = None
         self.background_img = None
         self.start_bg_img = None
         self.ig_background_image = None
-        pygame.init()
-        pygame.mixer.init()
+        # Only the subsystems the menu needs; the mixer is started with the first game
+        pygame.display.init()
+        pygame.font.init()
+        self.startup.mark('pygame init')
         pygame.display.set_caption("Fruit Ninja")
-        self.current_resolution = (res_x, res_y)
-        self.screen = pygame.display.set_mode(self.current_resolution)
+        # The game is laid out and played at the logical resolution whatever the size of the window
+        self.current_resolution = LOGICAL_RESOLUTION
+        self.window_resolution = (res_x, res_y)
+        self.screen = pygame.display.set_mode(self.window_resolution)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
         self.clock = pygame.time.Clock()
-        self.fruits = []
-        self.fruit_types = ['watermelon', 'apple', 'banana']
-        self.speed_increase_interval = 5000
-        self.last_speed_increase_time = pygame.time.get_ticks()
-        self.fruit_speed = -1
-        self.score = 0
-        self.lives = 3
+        self.pacer = FramePacer(self.clock)
+        self.renderer = RENDERERS[render_backend](self.screen, dirty_rects, size=self.current_resolution)
+        self.startup.mark('window')
+        self.max_fps = 60
+        # Longest wait for input in milliseconds while nothing is simulated, 0 to poll at full rate
+        self.idle_timeout = 250
+        self.world = World(self.current_resolution, start_time=pygame.time.get_ticks())
         self.game_over = False
         self.end_time = None
         self.game_started = False
         self.start_ticks = None
-        self.pause_start_ticks = 0
-        self.total_pause_duration = 0
         self.state = "menu"
 
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
-        font_path = os.path.join(self.base_dir, 'fonts', 'comic.ttf')
-        slash_sound_path = os.path.join(self.base_dir, 'sounds', 'slash.mp3')
-        losing_life_sound_path = os.path.join(self.base_dir, 'sounds', 'losing_life.mp3')
-
-        self.font = self.load_font(font_path, 30)
-        self.load_images(self.base_dir)
+        self.font = None
+        self.text_cache = TextCache()
+        self.screens = ScreenCache()
         self.calculate_button_positions()
+        self.data_dir = data_dir or default_data_dir()
+        self.best_scores_path = os.path.join(self.data_dir, 'best_scores.json')
+        self.score_writer = ScoreWriter(self.best_scores_path)
+        self.file_writer = FileWriter()
+        self.leaderboard_path = os.path.join(self.data_dir, 'leaderboard.sqlite3')
+        self.audio = AudioManager(os.path.join(self.data_dir, 'audio'))
+        self.leaderboard = None
+        self.player_name = 'player'
         self.best_scores = {}
-        self.load_best_scores()
         self.blink_active = False
         self.blink_start_time = 0
         self.blink_duration = 200
-        self.slash_sound = self.load_sound(slash_sound_path)
-        if self.slash_sound:
-            self.slash_sound.set_volume(0.25)
-        self.losing_life_sound = self.load_sound(losing_life_sound_path)
-        if self.losing_life_sound:
-            self.losing_life_sound.set_volume(0.4)
+        self.particles = ParticlePool()
+        self.overlays = OverlayCache()
+        self.slash_sound = None
+        self.losing_life_sound = None
         self.end_scr_txt = "YOU LOST"
         self.record_scr_id = 1
+        self.last_pointer = None
+        self.recorder = None
+        # Fixed timestep: the time not yet simulated, and the inputs waiting for the next tick
+        self.last_frame_ticks = None
+        self.max_frame_time = 250
+        self.accumulator = 0.0
+        self.interpolation = 1.0
+        self.pending_pointer = []
+        self.pending_keys = []
+        self.print_asset_timings = False
+        self.print_startup_profile = False
+        self.startup_done = False
+        self.audio_started = False
+        self.time_to_menu = None
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.profiler_lines = []
+
+        self.loader = AssetLoader(background_loading)
+        self.start_loading_assets()
+        self.apply_loaded_assets()
+        self.apply_quality()
+        self.startup.mark('game setup')
+
+    def start_loading_assets(self):
+        """
+        Start loading the font, images and the leaderboard.
+
+        The assets needed by the menu are submitted first, so the menu becomes interactive as soon as
+        possible when loading in the background. Sounds are loaded by :meth:`start_audio`.
+        """
+        font_path = os.path.join(self.base_dir, 'fonts', 'comic.ttf')
+        background_path = os.path.join(self.base_dir, 'background', 'background.jpg')
+        welcome_screen_path = os.path.join(self.base_dir, 'background', 'WelcomeScreen.jpg')
+
+        self.loader.submit('font', self.load_font, font_path, 30)
+        self.loader.submit('welcome_screen', self.load_background, 'WelcomeScreen', welcome_screen_path)
+        self.loader.submit('background', self.load_background, 'background', background_path)
+        self.loader.submit('leaderboard', self.open_leaderboard)
+
+    def start_audio(self):
+        """
+        Start the mixer and the loading of the sound effects, the first time a game starts.
+
+        The menu plays no sound, so the mixer is not started before the first game needs it.
+        """
+        if self.audio_started:
+            return
+        self.audio_started = True
+        pygame.mixer.init()
+        slash_sound_path = os.path.join(self.base_dir, 'sounds', 'slash.mp3')
+        losing_life_sound_path = os.path.join(self.base_dir, 'sounds', 'losing_life.mp3')
+        self.loader.submit('slash_sound', self.load_sound, slash_sound_path)
+        self.loader.submit('losing_life_sound', self.load_sound, losing_life_sound_path)
+
+    def apply_loaded_assets(self):
+        """
+        Put the assets that finished loading since the last call into use.
+        """
+        for name, asset in self.loader.finished():
+            if name == 'font':
+                self.font = asset
+                self.text_cache.clear()
+            elif name == 'welcome_screen':
+                self.start_bg_img = asset
+                if self.background_img is None:
+                    self.background_img = asset
+            elif name == 'background':
+                self.ig_background_image = asset
+            elif name == 'slash_sound':
+                self.slash_sound = asset
+                if self.slash_sound:
+                    self.slash_sound.set_volume(0.25)
+            elif name == 'losing_life_sound':
+                self.losing_life_sound = asset
+                if self.losing_life_sound:
+                    self.losing_life_sound.set_volume(0.4)
+            elif name == 'leaderboard':
+                self.leaderboard = asset
+                self.best_scores = self.leaderboard_scores()
+
+    def wait_for_assets(self, *names):
+        """
+        Block until the given assets are loaded and put them into use.
+
+        :param names: The names of the assets.
+        """
+        self.loader.wait(*names)
+        self.apply_loaded_assets()
+
+    @property
+    def renderer(self):
+        """
+               Get the render backend the game draws with.
+
+               :return: The renderer.
+               :rtype: kpo.render.Renderer
+               """
+        return self._renderer
+
+    @renderer.setter
+    def renderer(self, renderer):
+        """
+               Set the render backend the game draws with, scaling with the filter of the current quality level.
+
+               :param renderer: The renderer.
+               :type renderer: kpo.render.Renderer
+               """
+        self._renderer = renderer
+        renderer.smooth = self.pacer.quality['smooth_scale']
+
+    @property
+    def best_scores(self):
+        """
+               Get the best scores, keyed by rank.
+
+               :return: The best scores as {rank: [score, time]}.
+               :rtype: dict
+               """
+        return self._best_scores
+
+    @best_scores.setter
+    def best_scores(self, scores):
+        """
+               Set the best scores and drop the game-over screen composed from the previous ones.
+
+               :param scores: The best scores as {rank: [score, time]}.
+               :type scores: dict
+               """
+        self._best_scores = scores
+        self.screens.discard("game_over")
 
     def load_font(self, font_path, size):
         """
@@ -87,33 +285,31 @@ class Game:
 
     def load_sound(self, sound_path):
         """
-        Load a sound effect from the specified path.
+        Load a sound effect from the specified path, through the audio manager's cache of decoded samples.
 
         :param sound_path: The path to the sound file.
         :type sound_path: str
         :return: A Pygame Sound object if the file is found; otherwise, None.
         :rtype: pygame.mixer.Sound or None
         """
-        try:
-            return pygame.mixer.Sound(sound_path)
-        except FileNotFoundError:
-            return None
+        return self.audio.load(sound_path)
 
-    def load_images(self, base_dir):
+    def load_background(self, name, filepath):
         """
-        Load background images and scale them to fit the game window.
+        Load a background image at the current screen resolution.
 
-        This method loads the images for the game background and the welcome screen,
-        and scales them to the current screen resolution.
+        The image comes from the prebaked asset pack when it has the resolution; otherwise the image
+        file is decoded and scaled.
 
-        :param base_dir: The base directory where the images are located.
-        :type base_dir: str
+        :param name: The name of the background in the asset pack.
+        :type name: str
+        :param filepath: The path to the image file.
+        :type filepath: str
+        :return: The background image.
+        :rtype: pygame.Surface
         """
-        background_path = os.path.join(base_dir, 'background', 'background.jpg')
-        welcome_screen_path = os.path.join(base_dir, 'background', 'WelcomeScreen.jpg')
-        self.ig_background_image = self.load_and_scale_image(background_path, self.current_resolution)
-        self.start_bg_img = self.load_and_scale_image(welcome_screen_path, self.current_resolution)
-        self.background_img = self.start_bg_img
+        return (load_prebaked(name, self.current_resolution)
+                or self.load_and_scale_image(filepath, self.current_resolution))
 
     def load_and_scale_image(self, filepath, size):
         """
@@ -159,16 +355,16 @@ class Game:
 
                 This method resets scores, lives, speed, and game state, effectively restarting the game.
                 """
-        self.last_speed_increase_time = pygame.time.get_ticks()
-        self.fruit_speed = -1
-        self.score = 0
-        self.lives = 3
+        self.world.reset(pygame.time.get_ticks())
+        self.recorder = None
+        self.accumulator = 0.0
+        self.pending_pointer = []
+        self.pending_keys = []
+        self.particles.clear()
         self.game_over = False
         self.end_time = None
         self.game_started = False
-        self.fruits = []
         self.background_img = self.start_bg_img
-        self.total_pause_duration = 0
 
     def display_pause(self):
         """
@@ -176,17 +372,15 @@ class Game:
 
                 This method renders and displays a text message indicating the game is paused.
                 """
-        pause_text = self.font.render(f'P - pause', True, (255, 255, 255))
-        self.screen.blit(pause_text, (self.current_resolution[0] - 150, 10))
+        self.display_text('P - pause', (self.current_resolution[0] - 150, 10))
 
-    def display_timer(self, current_time, start_time, dest_x=10, dest_y=10, color=(255, 255, 255)):
+    def display_timer(self, dest_x=10, dest_y=10, color=(255, 255, 255)):
         """
                 Display the elapsed game time on the screen.
 
-                :param current_time: The current time in milliseconds.
-                :type current_time: int
-                :param start_time: The game start time in milliseconds.
-                :type start_time: int
+                The time is the time the world simulated, so pauses and stalls the world did not catch up
+                on are not counted, and a replay of the session ends at the same time.
+
                 :param dest_x: The x-coordinate on the screen to display the timer. Default is 10.
                 :type dest_x: int
                 :param dest_y: The y-coordinate on the screen to display the timer. Default is 10.
@@ -194,73 +388,158 @@ class Game:
                 :param color: The color of the timer text. Default is white (255, 255, 255).
                 :type color: tuple
                 """
-        elapsed_time = (current_time - start_time - self.total_pause_duration) / 1000
-        timer_text = self.font.render(f'Time: {elapsed_time:.2f}s', True, color)
-        self.screen.blit(timer_text, (dest_x, dest_y))
+        elapsed_time = self.world.elapsed / 1000
+        self.display_number('Time: ', f'{elapsed_time:.2f}', 's', (dest_x, dest_y), color)
 
     def display_score(self):
         """
                Display the current score on the screen.
                """
-        score_text = self.font.render(f'Score: {self.score}', True, (255, 255, 255))
-        self.screen.blit(score_text, (10, 50))
+        self.display_number('Score: ', str(self.score), '', (10, 50))
 
     def display_lives(self):
         """
                 Display the number of remaining lives on the screen.
                 """
-        lives_text = self.font.render(f'Lives: {self.lives}', True, (255, 255, 255))
-        self.screen.blit(lives_text, (10, 90))
+        self.display_number('Lives: ', str(self.lives), '', (10, 90))
 
     def display_fps(self):
         """
                 Display the current frames per second (FPS) on the screen.
                 """
-        fps_text = self.font.render(f'FPS: {self.clock.get_fps():.0f}', True, (255, 255, 255))
-        self.screen.blit(fps_text, (10, 130))
+        self.display_number('FPS: ', f'{self.clock.get_fps():.0f}', '', (10, 130))
 
-    def display_game_over(self, mouse_x, mouse_y):
+    def display_text(self, text, pos, color=(255, 255, 255)):
         """
-                Display the game over screen and options for restarting or quitting.
+                Display a text on the screen, rendering it only if it is not in the text cache.
 
-                :param mouse_x: The x-coordinate of the mouse position.
-                :type mouse_x: int
-                :param mouse_y: The y-coordinate of the mouse position.
-                :type mouse_y: int
+                :param text: The text to display.
+                :type text: str
+                :param pos: The top left corner of the text (x, y).
+                :type pos: tuple
+                :param color: The color of the text. Default is white (255, 255, 255).
+                :type color: tuple
+                :return: The area of the screen that was drawn on.
+                :rtype: pygame.Rect
+                """
+        return self.renderer.blit(self.text_cache.render(self.font, text, color), pos)
+
+    def display_number(self, label, number, suffix, pos, color=(255, 255, 255)):
+        """
+                Display a labelled number on the screen.
+
+                The label and suffix come from the text cache and the number is drawn from the
+                pre-rendered digit strip, so a value changing every frame renders no new text.
+
+                :param label: The text displayed before the number.
+                :type label: str
+                :param number: The formatted number.
+                :type number: str
+                :param suffix: The text displayed after the number.
+                :type suffix: str
+                :param pos: The top left corner of the label (x, y).
+                :type pos: tuple
+                :param color: The color of the text. Default is white (255, 255, 255).
+                :type color: tuple
+                :return: The area of the screen that was drawn on.
+                :rtype: pygame.Rect
+                """
+        rect = self.display_text(label, pos, color)
+        digits = self.text_cache.digits(self.font, color)
+        rect = rect.union(digits.draw(self.renderer, number, (rect.right, pos[1])))
+        if suffix:
+            rect = rect.union(self.display_text(suffix, (rect.right, pos[1]), color))
+        return rect
+
+    def end_game(self):
+        """
+                End the game after the last life was lost and record the run with the time the world simulated.
                 """
-        self.screen.blit(self.background_img, (0, 0))
+        self.game_over = True
+        self.end_time = self.world.elapsed / 1000
+        self.save_recording()
+        self.wait_for_assets('leaderboard')
+        if self.update_best_scores():
+            self.save_new_best_scores()
+            self.end_scr_txt = f"{self.record_scr_id}. NEW RECORD SCORE: "
+        else:
+            self.end_scr_txt = "YOU LOST"
+        self.screens.discard("game_over")
+
+    def static_screen(self):
+        """
+                Get the composed screen of the current state.
 
-        self.display_best_scores()
+                The menu, settings, pause and game-over screens only change when a button is hovered,
+                so they are composed once and cached until the background, the font or the resolution
+                changes, or a game ends with a new score.
 
-        u_lost_text = self.font.render(self.end_scr_txt, True, (255, 0, 0))
-        self.screen.blit(u_lost_text, (self.current_resolution[0] // 2 - 100, self.current_resolution[1] // 2 - 100))
-        total_score = self.font.render(f'Total score: {self.score}', True, (255, 0, 0))
-        self.screen.blit(total_score, (self.current_resolution[0] // 2 - 100, self.current_resolution[1] // 2 - 50))
-        timer_text = self.font.render(f'Time: {self.end_time:.2f}s', True, (255, 0, 0))
-        self.screen.blit(timer_text, (self.current_resolution[0] // 2 - 100, self.current_resolution[1] // 2))
+                :return: The screen, or None while a game is played.
+                :rtype: kpo.screens.StaticScreen
+                """
+        if self.state == "game" and not self.game_over:
+            return None
+        name = "game_over" if self.state == "game" else self.state
+        return self.screens.get(name, (self.background_img, self.font), lambda: self.compose_screen(name))
 
-        self.display_button(mouse_x, mouse_y, self.buttons_rects['restart_button_rect'], "MENU")
-        self.display_button(mouse_x, mouse_y, self.buttons_rects['quit_button_rect'], "QUIT")
+    def compose_screen(self, name):
+        """
+                Compose a static screen.
 
-    def display_button(self, mouse_x, mouse_y, btn_rect, text):
+                :param name: The name of the screen: 'menu', 'settings', 'pause' or 'game_over'.
+                :type name: str
+                :return: The screen.
+                :rtype: kpo.screens.StaticScreen
+                """
+        screen = StaticScreen(self.background_img)
+
+        def text(line, pos, color=(255, 255, 255)):
+            screen.blit(self.text_cache.render(self.font, line, color), pos)
+
+        def button(rect, label):
+            screen.add_button(rect, self.text_cache.render(self.font, label, (255, 255, 255)))
+
+        mid_x = self.current_resolution[0] // 2
+        mid_y = self.current_resolution[1] // 2
+        if name == "menu":
+            button(self.buttons_rects['start_button_rect'], "START")
+            button(self.buttons_rects['settings_button_rect'], "SETTINGS")
+            button(self.buttons_rects['quit_button_rect'], "QUIT")
+        elif name == "settings":
+            for res_name, rect in self.setting_buttons_rects.items():
+                button(rect, res_name.replace('_', ': '))
+            button(self.buttons_rects['back_button_rect'], "BACK")
+        elif name == "pause":
+            text("Game paused, press 'P' to unpause", (mid_x - self.current_resolution[0] // 5, mid_y - 100))
+            button(self.buttons_rects['restart_button_rect'], "MENU")
+            button(self.buttons_rects['quit_button_rect'], "QUIT")
+        elif name == "game_over":
+            start_y = mid_y - 300
+            text('Best Scores:', (mid_x - 100, start_y), (255, 255, 0))
+            for i, (rank, (score, seconds)) in enumerate(sorted(self.best_scores.items(), key=lambda x: int(x[0]))):
+                text(f'{rank}: Score: {score}, Time: {seconds:.2f}s', (mid_x - 100, start_y + 30 + i * 30))
+            text(self.end_scr_txt, (mid_x - 100, mid_y - 100), (255, 0, 0))
+            text(f'Total score: {self.score}', (mid_x - 100, mid_y - 50), (255, 0, 0))
+            text(f'Time: {self.end_time:.2f}s', (mid_x - 100, mid_y), (255, 0, 0))
+            button(self.buttons_rects['restart_button_rect'], "MENU")
+            button(self.buttons_rects['quit_button_rect'], "QUIT")
+        return screen
+
+    def display_static_screen(self, screen, mouse_x, mouse_y):
         """
-                Display a button with hover effects and text.
+                Draw the buttons of a static screen whose hover state changed.
 
+                The rest of the screen is already on the display, since the frame was cleared with it.
+
+                :param screen: The screen.
+                :type screen: kpo.screens.StaticScreen
                 :param mouse_x: The x-coordinate of the mouse position.
                 :type mouse_x: int
                 :param mouse_y: The y-coordinate of the mouse position.
                 :type mouse_y: int
-                :param btn_rect: The rectangle defining the button's position and size.
-                :type btn_rect: pygame.Rect
-                :param text: The text to display on the button.
-                :type text: str
                 """
-        hover = btn_rect.collidepoint(mouse_x, mouse_y)
-        button_color = (0, 200, 0) if hover else (255, 0, 0)
-        pygame.draw.rect(self.screen, button_color, btn_rect)
-        button_text = self.font.render(text, True, (255, 255, 255))
-        text_rect = button_text.get_rect(center=btn_rect.center)
-        self.screen.blit(button_text, text_rect)
+        for rect in screen.update(mouse_x, mouse_y):
+            self.renderer.blit(screen.surface, rect, rect)
 
     def speed_increaser(self, current_time):
         """
@@ -271,121 +550,338 @@ class Game:
                 :param current_time: The current time in milliseconds.
                 :type current_time: int
                 """
-        if current_time - self.last_speed_increase_time > self.speed_increase_interval:
-            self.fruit_speed -= 1.05
-            self.last_speed_increase_time = current_time
+        self.world.speed_increaser(current_time)
 
     def fruits_movement(self, mouse_x, mouse_y):
         """
                Handle the movement of fruits and detect interactions with the mouse.
 
                This method moves fruits downward, checks for collisions with the mouse cursor (slicing),
-               and removes fruits that fall off the screen.
+               removes fruits that fall off the screen and draws the remaining ones.
 
                :param mouse_x: The x-coordinate of the mouse position.
                :type mouse_x: int
                :param mouse_y: The y-coordinate of the mouse position.
                :type mouse_y: int
                """
-        for fruit in self.fruits[:]:
-            fruit.y_pos += self.fruit_speed
-            fruit.img_pos = [fruit.x_pos, fruit.y_pos]
+        self.world.release_events()
+        self.world.fruits_movement([(mouse_x, mouse_y)])
+        self.handle_world_events()
+        self.display_fruits()
 
-            fruit_rect = pygame.Rect(fruit.x_pos, fruit.y_pos, 100, 100)
+    def handle_world_events(self):
+        """
+                Play the feedback for the fruits sliced and missed during the last world step.
 
-            if fruit_rect.collidepoint(mouse_x, mouse_y):
-                self.fruits.remove(fruit)
-                self.score += 1
-                if self.slash_sound:
-                    self.slash_sound.play()
-                continue
+                A slice plays the slash sound and splashes juice; a miss plays the losing life sound and
+                starts the blink effect. The audio manager starts each sound at most once per frame.
+                """
+        amount = max(1, round(12 * self.pacer.quality['particles']))
+        for fruit in self.world.sliced:
+            self.particles.emit(fruit.x_pos + FRUIT_SIZE / 2, fruit.y_pos + FRUIT_SIZE / 2,
+                                JUICE_COLORS.get(fruit.name, DEFAULT_JUICE_COLOR), amount, self.world.time)
+        if self.world.sliced:
+            self.audio.play(self.slash_sound)
+        if self.world.missed:
+            self.audio.play(self.losing_life_sound)
+            # Activate the blink effect when a life is lost
+            self.blink_active = True
+            self.blink_start_time = pygame.time.get_ticks()
+
+    def display_fruits(self, interpolation=1.0):
+        """
+                Draw all fruits of the world on the screen.
 
-            self.screen.blit(fruit.img, fruit.img_pos)
-            if fruit.y_pos < -100:
-                self.fruits.remove(fruit)
-                self.lives -= 1
-                if self.losing_life_sound:
-                    self.losing_life_sound.play()
-                # Activate the blink effect when a life is lost
-                self.blink_active = True
-                self.blink_start_time = pygame.time.get_ticks()
+                :param interpolation: How far the frame is between the previous and the last world tick, from
+                    0 to 1. The fruits are drawn between their positions at the two ticks, so their motion stays
+                    smooth when frames and ticks do not line up. Default is 1, the positions of the last tick.
+                :type interpolation: float
+                """
+        fruits = self.fruits
+        count = len(fruits)
+        if not count:
+            return
+        images = [Fruit.load_image(name) for name in fruits.names]
+        # Draw in one batch, grouped by fruit type so draws of the same image follow each other
+        kinds = fruits.kind[:count]
+        order = np.argsort(kinds, kind='stable')
+        # All fruits moved by the fruit speed in the last tick
+        offset = self.fruit_speed * (interpolation - 1)
+        self.renderer.blits([(images[kind], (x_pos, y_pos)) for kind, x_pos, y_pos in
+                             zip(kinds[order].tolist(), fruits.x[order].tolist(), (fruits.y[order] + offset).tolist())])
+
+    def display_particles(self, dt):
+        """
+                Move the juice particles and draw them on the screen.
+
+                :param dt: The time since the last frame in milliseconds.
+                :type dt: int or float
+                """
+        self.particles.update(dt, self.world.time)
+        self.particles.draw(self.renderer)
+
+    def advance_world(self, elapsed, pointer_path, events):
+        """
+                Run as many fixed world ticks as fit into the time since the last frame.
+
+                The elapsed time is collected in an accumulator and spent in ticks of :data:`TICK_MS`, so
+                the game plays at the same speed at any frame rate; the rest is carried over to the next
+                frame and sets :attr:`interpolation`. The pointer path and key presses of frames without a
+                tick wait for the next tick. A long stall is cut to :attr:`max_frame_time`, so the world
+                does not race to catch up after it.
+
+                :param elapsed: The time since the last frame in milliseconds.
+                :type elapsed: int or float
+                :param pointer_path: The pointer positions sampled during the frame.
+                :type pointer_path: list
+                :param events: The events of the frame.
+                :type events: list
+                :return: The number of ticks run.
+                :rtype: int
+                """
+        self.pending_pointer.extend(pointer_path)
+        self.pending_keys.extend(event.key for event in events if event.type == pygame.KEYDOWN)
+        self.accumulator += min(elapsed, self.max_frame_time)
+        ticks = 0
+        while self.accumulator >= TICK_MS and not self.world.over:
+            self.accumulator -= TICK_MS
+            self.record_inputs(self.pending_pointer, self.pending_keys)
+            self.world.step(TICK_MS, self.pending_pointer)
+            self.handle_world_events()
+            # The pointer rests at its last position during the remaining ticks of the frame
+            self.pending_pointer = self.pending_pointer[-1:]
+            self.pending_keys = []
+            ticks += 1
+        self.interpolation = min(self.accumulator / TICK_MS, 1.0)
+        return ticks
 
     def spawn_random_fruits(self):
         """
-                Spawn random fruits at random positions.
+                Add the fruits that are due to the game.
+
+                The spawn times, fruit types and positions come from the world's seeded spawn scheduler
+                timeline, so this only takes the spawns planned up to the world's current time.
+                """
+        self.world.spawn_random_fruits()
+
+    def pointer_path(self, events, mouse_pos):
+        """
+                Collect the pointer positions seen since the previous frame.
+
+                The path starts at the pointer position of the previous frame, continues through the
+                positions of all mouse motion events of this frame and ends at the current position,
+                so slicing can test the whole swipe instead of a single sample per frame.
+
+                :param events: The events of the current frame.
+                :type events: list
+                :param mouse_pos: The current mouse position on the logical screen (x, y).
+                :type mouse_pos: tuple
+                :return: The pointer positions, oldest first.
+                :rtype: list
+                """
+        path = [] if self.last_pointer is None else [self.last_pointer]
+        path.extend(self.renderer.map_pointer(event.pos) for event in events if event.type == pygame.MOUSEMOTION)
+        path.append(mouse_pos)
+        self.last_pointer = mouse_pos
+        return path
+
+    def record_inputs(self, pointer_path, keys):
+        """
+                Record the inputs of the tick the world is about to run.
+
+                The recording starts with the first tick of a session, so it captures the world's seed
+                and resolution as the session sees them.
+
+                :param pointer_path: The pointer positions passed to the world.
+                :type pointer_path: list
+                :param keys: The keys pressed since the previous tick.
+                :type keys: list
+                """
+        if self.recorder is None:
+            from kpo.replay import InputRecorder  # only needed once a session is played
+
+            self.recorder = InputRecorder(self.world.seed, self.current_resolution, self.fruit_types,
+                                          self.world.time)
+        self.recorder.record(pointer_path, keys, self.world.max_fruits)
+
+    def save_recording(self):
+        """
+                Save the recording of the session that just ended into the 'replays' directory of the
+                data directory, named after the end time, the score and the seed of the session.
 
-                This method randomly decides when to spawn a fruit and adds it to the game.
+                The recording is written by the file writer's background thread, so the game-over frame
+                does not wait for the disk.
+
+                :return: The path of the recording, or None if nothing was recorded.
+                :rtype: str
                 """
-        if random.randint(0, 40) == 0:
-            fruit_type = random.choice(self.fruit_types)
-            self.fruits.append(Fruit(fruit_type, self.fruit_speed, self.current_resolution))
+        if self.recorder is None:
+            return None
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.score}-{self.recorder.seed:08x}.kpor"
+        path = os.path.join(self.data_dir, 'replays', name)
+        self.file_writer.save(path, self.recorder.to_bytes())
+        return path
 
     def close_game(self):
         """
-                Close the game and exit the program.
+                Close the game and exit the program, after the best scores and recordings are written to disk.
                 """
+        self.score_writer.close(timeout=5)
+        self.file_writer.close(timeout=5)
+        self.export_quality_report()
+        if self.leaderboard:
+            self.leaderboard.close()
         pygame.quit()
         sys.exit()
 
-    def run_game(self):
+    def display_profiler(self):
+        """
+                Display the p50/p95/p99 duration of every frame phase in milliseconds.
+
+                The figures are refreshed twice a second so the overlay stays readable and its text
+                stays in the text cache in between.
+                """
+        if not self.profiler_lines or self.profiler.frames % 30 == 0:
+            self.profiler_lines = [f'{phase:<10} {p50:6.2f} {p95:6.2f} {p99:6.2f}'
+                                   for phase, (p50, p95, p99) in self.profiler.percentiles().items()]
+            if self.pacer.idle_cpu is not None:
+                self.profiler_lines.append(f'idle cpu   {self.pacer.idle_cpu:6.1%}')
+        x_pos = self.current_resolution[0] - 400
+        for i, line in enumerate(['phase        p50    p95    p99'] + self.profiler_lines):
+            self.display_text(line, (x_pos, 50 + i * 30), (255, 255, 0))
+
+    def dump_profile(self, path='frame_profile'):
+        """
+                Write the recorded frame phases to a CSV file and a Chrome trace JSON file.
+
+                :param path: The path of the files without extension. Default is 'frame_profile'.
+                :type path: str
+                """
+        self.profiler.export_csv(path + '.csv')
+        self.profiler.export_chrome_trace(path + '.json')
+
+    def apply_quality(self):
+        """
+                Put the quality level chosen by the frame pacer into effect.
+
+                The blink overlay and the amount of juice are read from the level every frame; the fruit
+                cap is handed to the world and the scaling filter to the renderer.
+                """
+        self.world.max_fruits = self.pacer.quality['max_fruits']
+        self.renderer.smooth = self.pacer.quality['smooth_scale']
+
+    def export_quality_report(self):
+        """
+                Write the quality decisions of the frame pacer to 'quality.json' in the data directory.
+
+                :return: The path of the report, or None if it could not be written.
+                :rtype: str
+                """
+        path = os.path.join(self.data_dir, 'quality.json')
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            self.pacer.export(path)
+        except OSError as error:
+            print(f"Error: could not save the quality report to '{path}': {error}")
+            return None
+        return path
+
+    def display_loading(self):
+        """
+                Display the loading screen with a progress bar while the menu assets are loading.
+                """
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.close_game()
+        width, height = self.current_resolution
+        self.renderer.fill((0, 0, 0))
+        bar = pygame.Rect(width // 4, height // 2 - 10, width // 2, 20)
+        self.renderer.draw_rect((80, 80, 80), bar)
+        self.renderer.draw_rect((0, 200, 0), (bar.x, bar.y, int(bar.width * self.loader.progress), bar.height))
+        self.renderer.present()
+        self.clock.tick(60)
+
+    def print_startup_report(self):
+        """
+                Print how long each asset took to load and how long it took until the menu was usable.
+                """
+        print(self.loader.report())
+        print(f"{'time to menu':<20} {self.time_to_menu * 1000:8.1f} ms")
+
+    def run_game(self, max_frames=None):
         """
                 Run the main game loop.
 
                 This method contains the main game loop that handles game states, user input,
                 and updates the game screen.
+
+                :param max_frames: The number of frames after which the loop returns. Default is None,
+                    which runs until the game is closed.
+                :type max_frames: int
                 """
         pygame.mouse.set_visible(0)
 
-        while True:
-            self.screen.blit(self.background_img, (0, 0))
+        frames = 0
+        while max_frames is None or frames < max_frames:
+            frames += 1
+            self.apply_loaded_assets()
+            if not self.loader.ready(*MENU_ASSETS):
+                self.display_loading()
+                continue
+            if self.time_to_menu is None:
+                self.time_to_menu = time.perf_counter() - self.loader.started
+                self.startup.mark('menu assets')
+            if self.print_asset_timings and self.loader.progress == 1:
+                self.print_asset_timings = False
+                self.print_startup_report()
+
+            profiler = self.profiler
+            profiler.begin_frame()
             current_ticks = pygame.time.get_ticks()
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-
-            if self.state == "menu":
-                self.display_button(mouse_x, mouse_y, self.buttons_rects['start_button_rect'], "START")
-                self.display_button(mouse_x, mouse_y, self.buttons_rects['settings_button_rect'], "SETTINGS")
-                self.display_button(mouse_x, mouse_y, self.buttons_rects['quit_button_rect'], "QUIT")
-            elif self.state == "game":
-                if self.lives <= 0 and not self.game_over:
-                    self.game_over = True
-                    self.end_time = (current_ticks - self.start_ticks - self.total_pause_duration) / 1000
-                    if self.update_best_scores():
-                        self.save_new_best_scores()
-                        self.end_scr_txt = f"{self.record_scr_id}. NEW RECORD SCORE: "
-                    else:
-                        self.end_scr_txt = "YOU LOST"
-
-                if not self.game_over:
-                    self.speed_increaser(current_ticks)
-                    self.display_timer(current_ticks, self.start_ticks)
-                    self.display_score()
-                    self.display_lives()
-                    self.display_fps()
-                    self.display_pause()
-                    self.fruits_movement(mouse_x, mouse_y)
-                    self.spawn_random_fruits()
-                    self.activate_blink_if_lost_life(current_ticks)
-                else:
-                    self.display_game_over(mouse_x, mouse_y)
-            elif self.state == "settings":
-                for name, rect in self.setting_buttons_rects.items():
-                    text = name.replace('_', ': ')
-                    self.display_button(mouse_x, mouse_y, rect, text)
-                self.display_button(mouse_x, mouse_y, self.buttons_rects['back_button_rect'], "BACK")
-            elif self.state == "pause":
-                pause_text = self.font.render("Game paused, press 'P' to unpause", True, (255, 255, 255))
-                self.screen.blit(pause_text, (
-                    self.current_resolution[0] // 2 - self.current_resolution[0] // 5,
-                    self.current_resolution[1] // 2 - 100))
-                self.display_button(mouse_x, mouse_y, self.buttons_rects['restart_button_rect'], "MENU")
-                self.display_button(mouse_x, mouse_y, self.buttons_rects['quit_button_rect'], "QUIT")
-
-            for event in pygame.event.get():
+            if self.state == "game" and self.lives <= 0 and not self.game_over:
+                self.end_game()
+            screen = self.static_screen()
+            self.renderer.clear(self.background_img if screen is None else screen.surface)
+            profiler.mark('background')
+            frame_time = 0 if self.last_frame_ticks is None else current_ticks - self.last_frame_ticks
+            # Nothing is simulated on static screens, so the time spent on them is not carried into the game
+            self.last_frame_ticks = current_ticks if screen is None else None
+            if screen is not None and self.idle_timeout and self.startup_done:
+                events = self.pacer.wait_events(self.idle_timeout)
+            else:
+                events = pygame.event.get()
+            mouse_x, mouse_y = self.renderer.map_pointer(pygame.mouse.get_pos())
+            pointer_path = self.pointer_path(events, (mouse_x, mouse_y))
+            profiler.mark('events')
+
+            if screen is not None:
+                self.display_static_screen(screen, mouse_x, mouse_y)
+            else:
+                self.advance_world(frame_time, pointer_path, events)
+                profiler.mark('simulation')
+                self.display_timer()
+                self.display_score()
+                self.display_lives()
+                self.display_fps()
+                self.display_pause()
+                profiler.mark('hud')
+                self.display_fruits(self.interpolation)
+                self.display_particles(frame_time)
+                profiler.mark('fruits')
+                self.activate_blink_if_lost_life(current_ticks)
+                profiler.mark('blink')
+            if self.show_profiler:
+                self.display_profiler()
+            profiler.mark('screens')
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.close_game()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if self.state == "menu":
                         if self.buttons_rects['start_button_rect'].collidepoint(mouse_x, mouse_y):
+                            self.start_audio()
+                            self.wait_for_assets('background')
                             self.game_started = True
                             self.start_ticks = pygame.time.get_ticks()
                             self.background_img = self.ig_background_image
@@ -416,117 +912,134 @@ class Game:
                             self.close_game()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_p and self.state == "game":
-                        self.pause_start_ticks = pygame.time.get_ticks()
                         self.state = "pause"
                     elif event.key == pygame.K_p and self.state == "pause":
-                        self.total_pause_duration += pygame.time.get_ticks() - self.pause_start_ticks
                         self.state = "game"
-
-            pygame.draw.circle(self.screen, (255, 0, 0), (mouse_x, mouse_y), 5)
-            pygame.display.flip()
-            self.clock.tick(60)
+                    elif event.key == pygame.K_F3:
+                        self.show_profiler = not self.show_profiler
+                    elif event.key == pygame.K_F4:
+                        self.dump_profile()
+                elif event.type == pygame.WINDOWEXPOSED:
+                    self.renderer.invalidate()
+            profiler.mark('input')
+
+            self.renderer.draw_circle((255, 0, 0), (mouse_x, mouse_y), 5)
+            self.renderer.present()
+            self.audio.end_frame()
+            if not self.startup_done:
+                self.startup_done = True
+                self.startup.mark('first frame')
+                if self.print_startup_profile:
+                    print(self.startup.report())
+            profiler.mark('present')
+            if self.pacer.tick(self.max_fps):
+                self.apply_quality()
+            profiler.mark('tick')
 
     def update_resolution(self, res):
         """
-               Update the game resolution and adjust related elements.
+               Resize the game window.
+
+               The game keeps its logical resolution, so layout, assets and gameplay stay as they are;
+               only the scaling of the finished frames changes.
 
-               :param res: A tuple containing the new resolution (width, height).
+               :param res: A tuple containing the new window resolution (width, height).
                :type res: tuple
                """
-        self.current_resolution = (int(res[0]), int(res[1]))
-        self.screen = pygame.display.set_mode(self.current_resolution)
-        self.calculate_button_positions()
-        self.load_images(self.base_dir)
+        self.window_resolution = (int(res[0]), int(res[1]))
+        self.screen = pygame.display.set_mode(self.window_resolution)
+        self.renderer.screen = self.screen
 
-    def load_best_scores(self):
+    def read_best_scores(self):
         """
-                Load the best scores from a JSON file.
+                Read the best scores from the data directory, creating the file if it is not found.
+
+                A new file starts with the scores of the 'best_scores.json' file earlier versions kept in the
+                working directory (see :func:`kpo.scores.read_legacy_scores`), or with default values.
 
-                If the file is not found, it initializes the best scores with default values.
+                :return: The best scores as {rank: [score, time]}.
+                :rtype: dict
                 """
         try:
-            with open('best_scores.json', 'r') as file:
-                self.best_scores = json.load(file)
-
-
+            with open(self.best_scores_path, 'r') as file:
+                return json.load(file)
         except FileNotFoundError:
-            scores = {
+            scores = read_legacy_scores(self.best_scores_path) or {
                 "1": [0, 0],
                 "2": [0, 0],
                 "3": [0, 0],
                 "4": [0, 0],
                 "5": [0, 0]
             }
-            with open('best_scores.json', 'w') as file:
-                json.dump(scores, file, indent=4)
-                self.best_scores = scores
+            write_json_atomic(self.best_scores_path, scores)
+            return scores
 
-    def update_best_scores(self):
+    def open_leaderboard(self):
         """
-        Updates the list of best scores by inserting the current score into the appropriate position, if applicable.
+                Open the leaderboard in the data directory.
 
-        This method checks if the current game score (`self.score`) and time (`self.end_time`) qualify to be included
-        in the list of best scores. If the current score is higher than any of the existing best scores, or if it matches
-        an existing score but was achieved in a shorter time, it will be inserted into the best scores list. The lower
-        scores will be shifted down one rank, and the lowest score will be removed if necessary to maintain only the top 5 scores.
+                A new leaderboard is seeded with the runs of the 'best_scores.json' file, so the records of
+                earlier versions are kept.
 
-        The `best_scores` attribute is updated, where each entry represents a rank and contains a list with two elements:
-        the score and the time taken to achieve that score.
+                :return: The leaderboard.
+                :rtype: kpo.leaderboard.Leaderboard
+                """
+        from kpo.leaderboard import Leaderboard  # sqlite3 is only needed once the loader gets here
 
-        Example:
-            If the current score is 300 and this score is higher than the 3rd best score (or is the same but achieved in less time),
-            then this method will insert the current score into the 3rd position and shift the existing 3rd to 5th scores down one rank.
+        leaderboard = Leaderboard(self.leaderboard_path, cache_size=BEST_SCORES_COUNT)
+        if not len(leaderboard):
+            leaderboard.extend((self.player_name, int(score), float(time))
+                               for score, time in self.read_best_scores().values() if score or time)
+        return leaderboard
 
-        :return: True if the best scores were updated, False otherwise.
-        :rtype: bool
+    def leaderboard_scores(self):
         """
-        update_happened = False
-        current_score = self.score
-        current_time = self.end_time
+                Get the best runs of the leaderboard in the format of the 'best_scores.json' file.
 
-        # Convert the best_scores dictionary to a list of tuples for easier manipulation
-        best_scores_list = [(key, int(value[0]), float(value[1])) for key, value in self.best_scores.items()]
+                Runs without points are stored but not shown, and missing ranks are filled with zero scores,
+                like in a new 'best_scores.json' file.
 
-        # Sort the list based on the scores, highest score first. If scores are the same, sort by time (ascending).
-        best_scores_list.sort(key=lambda x: (-x[1], x[2]))
+                :return: The best scores as {rank: [score, time]}.
+                :rtype: dict
+                """
+        # Runs without points rank below all others, so they only ever fill otherwise empty ranks
+        runs = [run for run in self.leaderboard.top(BEST_SCORES_COUNT) if run[1] > 0]
+        runs += [(None, 0, 0)] * (BEST_SCORES_COUNT - len(runs))
+        return {str(rank): [score, time] for rank, (_, score, time) in enumerate(runs, 1)}
 
-        for i, (key, best_score, best_time) in enumerate(best_scores_list):
-            if current_score > best_score or (current_score == best_score and current_time < best_time):
-                self.record_scr_id = key
-                # Shift lower scores down
-                for j in range(len(best_scores_list) - 1, i, -1):
-                    best_scores_list[j] = best_scores_list[j - 1]
+    def update_best_scores(self):
+        """
+        Adds the current run to the leaderboard and updates the best scores if the run made it into them.
 
-                # Insert the new score
-                best_scores_list[i] = (key, current_score, current_time)
-                update_happened = True
-                break
+        The current game score (`self.score`) and time (`self.end_time`) are stored in the leaderboard, which ranks
+        runs by score, highest first, and runs with the same score by time, shortest first. If the run ranks among the
+        best scores, `self.record_scr_id` is set to its rank and the `best_scores` attribute is rebuilt from the
+        leaderboard, where each entry represents a rank and contains a list with two elements: the score and the time
+        taken to achieve that score.
 
-        if update_happened:
-            # Convert back to the original dictionary format
-            for i, (key, score, time) in enumerate(best_scores_list):
-                self.best_scores[str(i + 1)] = [score, time]
+        Example:
+            If the current score is 300 and this score is higher than the 3rd best score (or is the same but achieved in less time),
+            then the run becomes the 3rd best score and the existing 3rd to 5th scores move down one rank.
 
-        return update_happened
+        :return: True if the best scores were updated, False otherwise.
+        :rtype: bool
+        """
+        rank = self.leaderboard.add(self.score, self.end_time, self.player_name)
+        # An empty rank shows a zero score, so a run without points is never a record
+        if rank is None or self.score <= 0:
+            return False
+        self.record_scr_id = str(rank)
+        self.best_scores = self.leaderboard_scores()
+        return True
 
     def save_new_best_scores(self):
         """
-        The method saves the current best scores into the 'best_scores.json' file.
-        """
-        with open('best_scores.json', 'w') as file:
-            json.dump(self.best_scores, file, indent=4)
+        The method saves the current best scores into the 'best_scores.json' file of the data directory, which keeps
+        the top of the leaderboard readable for earlier versions and other tools.
 
-    def display_best_scores(self):
+        The file is written by the score writer thread, so the game-over frame does not wait for the disk.
         """
-                Display the list of best scores on the screen.
-                """
-        title_text = self.font.render('Best Scores:', True, (255, 255, 0))
-        start_y = self.current_resolution[1] // 2 - 300
-        self.screen.blit(title_text, (self.current_resolution[0] // 2 - 100, start_y))
-
-        for i, (rank, (score, time)) in enumerate(sorted(self.best_scores.items(), key=lambda x: int(x[0]))):
-            score_text = self.font.render(f'{rank}: Score: {score}, Time: {time:.2f}s', True, (255, 255, 255))
-            self.screen.blit(score_text, (self.current_resolution[0] // 2 - 100, start_y + 30 + i * 30))
+        self.score_writer.save(self.best_scores)
 
     def activate_blink_if_lost_life(self, current_ticks):
         """
@@ -537,16 +1050,44 @@ class Game:
                 """
         if self.blink_active:
             if current_ticks - self.blink_start_time <= self.blink_duration:
-                red_overlay = pygame.Surface(self.current_resolution)
-                red_overlay.set_alpha(128)
-                red_overlay.fill((255, 0, 0))
-                self.screen.blit(red_overlay, (0, 0))
+                if not self.pacer.quality['blink']:
+                    return
+                red_overlay = self.overlays.get(self.current_resolution, (255, 0, 0), 128)
+                self.renderer.blit(red_overlay, (0, 0))
             else:
                 self.blink_active = False
 
 
 def main():
-    game = Game()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fruit Ninja")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="redraw and present only the changed areas of the screen")
+    parser.add_argument('--asset-timings', action='store_true',
+                        help="print how long each asset took to load")
+    parser.add_argument('--data-dir', help="directory the best scores are kept in (default: $KPO_DATA_DIR or ~/.kpo)")
+    parser.add_argument('--max-fps', type=int, default=60,
+                        help="frame rate cap, 0 for none; the game plays at the same speed at any rate (default: 60)")
+    parser.add_argument('--busy-loop', action='store_true',
+                        help="pace frames precisely with a busy loop instead of sleeping")
+    parser.add_argument('--fixed-quality', action='store_true',
+                        help="keep full quality even when frames miss their budget")
+    parser.add_argument('--idle-timeout', type=int, default=250,
+                        help="longest wait for input in ms outside gameplay, 0 to poll at full rate (default: 250)")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print the time of every startup phase, from process start to the first frame")
+    parser.add_argument('--render-backend', choices=sorted(RENDERERS), default='pygame',
+                        help="draw to the window, draw nothing, or draw nothing and count draw calls (default: pygame)")
+    args = parser.parse_args()
+    game = Game(dirty_rects=args.dirty_rects, background_loading=True, data_dir=args.data_dir,
+                render_backend=args.render_backend)
+    game.print_asset_timings = args.asset_timings
+    game.print_startup_profile = args.startup_profile
+    game.max_fps = args.max_fps
+    game.idle_timeout = args.idle_timeout
+    game.pacer.busy_loop = args.busy_loop
+    game.pacer.adaptive = not args.fixed_quality
     game.run_game()
 
 
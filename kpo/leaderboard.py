@@ -0,0 +1,142 @@
+import bisect
+import math
+import os
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    time REAL NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_rank ON runs (score DESC, time ASC);
+"""
+
+
+class Leaderboard:
+    """
+    Stores every finished run in SQLite and ranks runs by score, then by time.
+
+    The ``runs_by_rank`` index keeps the runs in rank order, so the top runs are read from the start of
+    the index and the rank of a run is counted with range scans of the index that only read the runs
+    ahead of it. The best ``cache_size`` runs are also kept in memory as a sorted list; ranks and top lists
+    that fall into it are answered with :mod:`bisect` without touching the database, so adding a run
+    at the game over costs only the insert into the table and the index.
+    """
+
+    def __init__(self, path=':memory:', cache_size=5):
+        """
+        Open the leaderboard, creating the database and its directory if they do not exist.
+
+        :param path: The path of the SQLite database. Default is an in-memory database.
+        :type path: str
+        :param cache_size: The number of best runs kept in memory. Default is 5.
+        :type cache_size: int
+        """
+        self.path = path
+        self.cache_size = cache_size
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # The leaderboard is opened by an asset loader thread and then used by the main loop
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self._top = []
+        self._load_top()
+
+    def _load_top(self):
+        # Sort keys are (-score, time, id, player): a smaller key is a better run
+        rows = self.connection.execute('SELECT id, player, score, time FROM runs '
+                                       'ORDER BY score DESC, time ASC, id ASC LIMIT ?', (self.cache_size,))
+        self._top = [(-score, run_time, run_id, player) for run_id, player, score, run_time in rows]
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+
+    def _cached_rank(self, score, run_time):
+        # The rank from the cache, or None if the run ranks below all cached runs
+        position = bisect.bisect_right(self._top, (-score, run_time, math.inf))
+        if position < len(self._top) or len(self._top) < self.cache_size:
+            return position + 1
+        return None
+
+    def rank(self, score, run_time):
+        """
+        Get the rank a run would get if it was added now. Earlier runs with the same score and time rank first.
+
+        :param score: The score of the run.
+        :type score: int
+        :param run_time: The time of the run in seconds.
+        :type run_time: float
+        :return: The rank, starting at 1.
+        :rtype: int
+        """
+        position = self._cached_rank(score, run_time)
+        if position is not None:
+            return position
+        better = self.connection.execute('SELECT COUNT(*) FROM runs WHERE score > ?', (score,)).fetchone()[0]
+        tied = self.connection.execute('SELECT COUNT(*) FROM runs WHERE score = ? AND time <= ?',
+                                       (score, run_time)).fetchone()[0]
+        return better + tied + 1
+
+    def add(self, score, run_time, player='player'):
+        """
+        Store a finished run.
+
+        :param score: The score of the run.
+        :type score: int
+        :param run_time: The time of the run in seconds.
+        :type run_time: float
+        :param player: The name of the player. Default is 'player'.
+        :type player: str
+        :return: The rank of the run if it is among the ``cache_size`` best runs, otherwise None;
+            :meth:`rank` gives the exact rank of any run.
+        :rtype: int or None
+        """
+        rank = self._cached_rank(score, run_time)
+        with self.connection:
+            cursor = self.connection.execute('INSERT INTO runs (player, score, time, played_at) VALUES (?, ?, ?, ?)',
+                                             (player, score, run_time, time.time()))
+        if rank is not None:
+            bisect.insort(self._top, (-score, run_time, cursor.lastrowid, player))
+            del self._top[self.cache_size:]
+        return rank
+
+    def extend(self, runs):
+        """
+        Store many finished runs in one transaction.
+
+        :param runs: (player, score, time) for every run.
+        :type runs: iterable
+        """
+        now = time.time()
+        with self.connection:
+            self.connection.executemany('INSERT INTO runs (player, score, time, played_at) VALUES (?, ?, ?, ?)',
+                                        ((player, score, run_time, now) for player, score, run_time in runs))
+        self._load_top()
+
+    def top(self, count):
+        """
+        Get the best runs.
+
+        :param count: The number of runs.
+        :type count: int
+        :return: (player, score, time) of the best runs, best first.
+        :rtype: list
+        """
+        if count <= len(self._top) or len(self._top) < self.cache_size:
+            return [(player, -score, run_time) for score, run_time, _, player in self._top[:count]]
+        rows = self.connection.execute('SELECT player, score, time FROM runs '
+                                       'ORDER BY score DESC, time ASC, id ASC LIMIT ?', (count,))
+        return rows.fetchall()
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self.connection.close()
@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class AssetLoader:
+    """
+    Loads assets on a pool of worker threads and records how long each one took.
+
+    Every asset is loaded by a job registered under a name with :meth:`submit`. The main loop polls
+    :meth:`ready` and :meth:`finished` to use assets as soon as they are available instead of
+    waiting for all of them. Without background loading, jobs run right away in the calling thread.
+    """
+
+    def __init__(self, background=True, workers=4):
+        """
+        Initialize the loader.
+
+        :param background: Whether jobs run on worker threads. Default is True.
+        :type background: bool
+        :param workers: The number of worker threads. Default is 4.
+        :type workers: int
+        """
+        self.background = background
+        self.started = time.perf_counter()
+        self.timings = {}
+        self._futures = {}
+        self._applied = set()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='kpo-assets') if background else None
+
+    def _timed(self, name, func, args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def submit(self, name, func, *args):
+        """
+        Register a job loading an asset.
+
+        :param name: The name of the asset.
+        :type name: str
+        :param func: The function loading the asset; its return value is the asset.
+        :type func: callable
+        :param args: The arguments of the function.
+        :return: The future of the asset.
+        :rtype: concurrent.futures.Future
+        """
+        if self._executor is not None:
+            future = self._executor.submit(self._timed, name, func, args)
+        else:
+            future = Future()
+            try:
+                future.set_result(self._timed(name, func, args))
+            except Exception as error:
+                future.set_exception(error)
+        self._futures[name] = future
+        return future
+
+    def ready(self, *names):
+        """
+        Tell whether the given assets are loaded.
+
+        :param names: The names of the assets.
+        :return: True if all the assets are loaded, False otherwise.
+        :rtype: bool
+        """
+        return all(self._futures[name].done() for name in names)
+
+    def wait(self, *names):
+        """
+        Block until the given assets, or all assets if none are given, are loaded.
+
+        :param names: The names of the assets.
+        """
+        for name in names or list(self._futures):
+            self._futures[name].exception()
+
+    def finished(self):
+        """
+        Get the assets that finished loading since the last call.
+
+        :return: The (name, asset) pairs, in the order the jobs were submitted.
+        :rtype: list
+        """
+        finished = []
+        for name, future in self._futures.items():
+            if name not in self._applied and future.done():
+                self._applied.add(name)
+                finished.append((name, future.result()))
+        return finished
+
+    @property
+    def progress(self):
+        """
+        Get the share of assets that are loaded.
+
+        :return: A number between 0 and 1.
+        :rtype: float
+        """
+        if not self._futures:
+            return 1.0
+        return sum(future.done() for future in self._futures.values()) / len(self._futures)
+
+    def report(self):
+        """
+        Format the load time of every asset, slowest first.
+
+        :return: One line per asset.
+        :rtype: str
+        """
+        lines = [f'{name:<20} {seconds * 1000:8.1f} ms'
+                 for name, seconds in sorted(self.timings.items(), key=lambda item: -item[1])]
+        return '\n'.join(lines)
+
+    def shutdown(self):
+        """
+        Stop the worker threads once the running jobs are done.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
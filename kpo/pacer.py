@@ -0,0 +1,192 @@
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+# Quality levels from the best to the cheapest. Every level keeps the savings of the previous one.
+# smooth_scale only matters when the window size differs from the logical resolution.
+QUALITY_LEVELS = (
+    {'name': 'full', 'blink': True, 'particles': 1.0, 'max_fruits': None, 'smooth_scale': True},
+    {'name': 'no-blink', 'blink': False, 'particles': 1.0, 'max_fruits': None, 'smooth_scale': False},
+    {'name': 'few-particles', 'blink': False, 'particles': 0.25, 'max_fruits': None, 'smooth_scale': False},
+    {'name': 'capped-fruits', 'blink': False, 'particles': 0.25, 'max_fruits': 12, 'smooth_scale': False},
+)
+
+
+class FramePacer:
+    """
+    Paces the frames of the main loop and scales the quality to the frame budget.
+
+    :meth:`tick` measures how long the frame worked before it waits for the frame cap, and keeps the
+    last ``window`` frames. When the 90th percentile of the window misses the budget, the quality steps
+    down one level; when it stays well inside the budget, the quality steps back up. After a change the
+    window starts over and the level is held for at least ``hold`` frames, so the quality does not flicker.
+    Every change is logged in :attr:`decisions` and can be written out with :meth:`export`.
+
+    While nothing is simulated, the main loop blocks in :meth:`wait_events` instead of polling. Such idle
+    frames take no part in the quality decisions; their wall and CPU time are summed up instead, so the
+    CPU use of an idle game can be reported.
+    """
+
+    def __init__(self, clock, busy_loop=False, adaptive=True, window=30, hold=120, target_fps=60,
+                 headroom=0.6, levels=QUALITY_LEVELS):
+        """
+        Initialize the pacer.
+
+        :param clock: The clock of the main loop.
+        :type clock: pygame.time.Clock
+        :param busy_loop: Whether to wait with ``tick_busy_loop``, which is precise but keeps a CPU busy.
+            Default is False.
+        :type busy_loop: bool
+        :param adaptive: Whether the quality follows the frame times. Default is True.
+        :type adaptive: bool
+        :param window: The number of frames the decisions are based on. Default is 30.
+        :type window: int
+        :param hold: The minimum number of frames between two changes. Default is 120.
+        :type hold: int
+        :param target_fps: The frame rate the budget is computed from when the frame rate is not capped.
+            Default is 60.
+        :type target_fps: int
+        :param headroom: The fraction of the budget the frames must stay under to step the quality up.
+            Default is 0.6.
+        :type headroom: float
+        :param levels: The quality levels, best first. Default is :data:`QUALITY_LEVELS`.
+        :type levels: tuple
+        """
+        self.clock = clock
+        self.busy_loop = busy_loop
+        self.adaptive = adaptive
+        self.hold = hold
+        self.target_fps = target_fps
+        self.headroom = headroom
+        self.levels = levels
+        self.level = 0
+        self.frames = 0
+        self.frames_per_level = [0] * len(levels)
+        self.decisions = []
+        self.work_times = deque(maxlen=window)
+        self._last_change = 0
+        self.idle_frames = 0
+        self.idle_time = 0.0
+        self.idle_cpu_time = 0.0
+        self._idle = False
+        self._frame_start = time.perf_counter()
+        self._frame_cpu = time.process_time()
+
+    @property
+    def quality(self):
+        """
+        Get the current quality level.
+
+        :return: The settings of the level.
+        :rtype: dict
+        """
+        return self.levels[self.level]
+
+    def tick(self, max_fps):
+        """
+        End a frame: record how long it worked, adapt the quality and wait for the frame cap.
+
+        :param max_fps: The frame rate cap, 0 for none.
+        :type max_fps: int
+        :return: True if the quality level changed, False otherwise.
+        :rtype: bool
+        """
+        idle = self._idle
+        self.frames += 1
+        self.frames_per_level[self.level] += 1
+        changed = False
+        if not idle:
+            self.work_times.append((time.perf_counter() - self._frame_start) * 1000)
+            changed = self.adaptive and self.adapt(1000 / (max_fps or self.target_fps))
+        if self.busy_loop and not idle:
+            self.clock.tick_busy_loop(max_fps)
+        else:
+            self.clock.tick(max_fps)
+
+        now = time.perf_counter()
+        cpu = time.process_time()
+        if idle:
+            self.idle_frames += 1
+            self.idle_time += now - self._frame_start
+            self.idle_cpu_time += cpu - self._frame_cpu
+            self._idle = False
+        self._frame_start = now
+        self._frame_cpu = cpu
+        return changed
+
+    def wait_events(self, timeout):
+        """
+        Block until an event arrives or the timeout passes, and make the current frame an idle frame.
+
+        :param timeout: The longest time to wait in milliseconds.
+        :type timeout: int
+        :return: The events that arrived, oldest first.
+        :rtype: list
+        """
+        self._idle = True
+        event = pygame.event.wait(timeout)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events
+
+    @property
+    def idle_cpu(self):
+        """
+        Get the share of a CPU the idle frames used.
+
+        :return: The CPU time divided by the wall time of all idle frames, or None without idle frames.
+        :rtype: float
+        """
+        return self.idle_cpu_time / self.idle_time if self.idle_time else None
+
+    def adapt(self, budget):
+        """
+        Step the quality down or up if the frame times of a full window call for it.
+
+        :param budget: The time a frame may work in milliseconds.
+        :type budget: float
+        :return: True if the quality level changed, False otherwise.
+        :rtype: bool
+        """
+        if len(self.work_times) < self.work_times.maxlen or self.frames - self._last_change < self.hold:
+            return False
+        p90 = float(np.percentile(self.work_times, 90))
+        if p90 > budget and self.level < len(self.levels) - 1:
+            self._change(self.level + 1, 'over budget', p90, budget)
+            return True
+        if p90 < budget * self.headroom and self.level > 0:
+            self._change(self.level - 1, 'headroom', p90, budget)
+            return True
+        return False
+
+    def _change(self, level, reason, p90, budget):
+        self.level = level
+        self._last_change = self.frames
+        self.work_times.clear()
+        self.decisions.append({'frame': self.frames, 'time': time.time(), 'level': self.quality['name'],
+                               'reason': reason, 'p90_ms': round(p90, 3), 'budget_ms': round(budget, 3)})
+
+    def export(self, path):
+        """
+        Write the machine, the frames spent at every quality level, the decisions and the idle CPU use
+        to a JSON file.
+
+        :param path: The path of the file.
+        :type path: str
+        """
+        import platform  # only needed for the report, not while playing
+
+        report = {
+            'machine': {'platform': platform.platform(), 'processor': platform.processor(),
+                        'python': platform.python_version(), 'pygame': pygame.version.ver},
+            'frames': self.frames,
+            'frames_per_level': {level['name']: frames for level, frames in zip(self.levels, self.frames_per_level)},
+            'decisions': self.decisions,
+            'idle': {'frames': self.idle_frames, 'seconds': round(self.idle_time, 3),
+                     'cpu_seconds': round(self.idle_cpu_time, 3), 'cpu_share': self.idle_cpu},
+        }
+        with open(path, 'w') as file:
+            json.dump(report, file, indent=4)
@@ -0,0 +1,126 @@
+import json
+import time
+
+import numpy as np
+
+# Phases of a frame of Game.run_game, in the order they run.
+PHASES = ('background', 'events', 'simulation', 'hud', 'fruits', 'blink', 'screens', 'input', 'present', 'tick')
+
+
+class FrameProfiler:
+    """
+    Records how long each phase of a frame takes into a fixed-size ring buffer.
+
+    The main loop calls :meth:`begin_frame` at the start of a frame and :meth:`mark` at the end of every
+    phase; the time since the previous mark is added to that phase. Only the last ``capacity`` frames are
+    kept, so the profiler can stay on for a whole session. :meth:`percentiles` summarizes the recorded
+    frames, and :meth:`export_csv` and :meth:`export_chrome_trace` dump them for offline analysis.
+    """
+
+    def __init__(self, phases=PHASES, capacity=600, enabled=True):
+        """
+        Initialize the profiler.
+
+        :param phases: The names of the phases. Default is :data:`PHASES`.
+        :type phases: tuple
+        :param capacity: The number of frames kept. Default is 600 (10 seconds at 60 FPS).
+        :type capacity: int
+        :param enabled: Whether frames are recorded. Default is True.
+        :type enabled: bool
+        """
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self.enabled = enabled
+        self.durations = np.zeros((capacity, len(phases)))
+        self.starts = np.zeros(capacity)
+        self.frames = 0
+        self._columns = {phase: column for column, phase in enumerate(self.phases)}
+        self._row = 0
+        self._last = 0.0
+
+    def __len__(self):
+        return min(self.frames, self.capacity)
+
+    def begin_frame(self):
+        """
+        Start recording a new frame, overwriting the oldest one when the buffer is full.
+        """
+        if not self.enabled:
+            return
+        self._row = self.frames % self.capacity
+        self.durations[self._row] = 0
+        self._last = time.perf_counter()
+        self.starts[self._row] = self._last
+        self.frames += 1
+
+    def mark(self, phase):
+        """
+        End a phase of the current frame.
+
+        :param phase: The name of the phase.
+        :type phase: str
+        """
+        if not self.enabled or not self.frames:
+            return
+        now = time.perf_counter()
+        self.durations[self._row, self._columns[phase]] += now - self._last
+        self._last = now
+
+    def _ordered(self):
+        # Recorded rows from the oldest to the newest frame
+        if self.frames <= self.capacity:
+            return np.arange(self.frames)
+        return (np.arange(self.capacity) + self.frames) % self.capacity
+
+    def percentiles(self, quantiles=(50, 95, 99)):
+        """
+        Get percentiles of the duration of every phase over the recorded frames.
+
+        :param quantiles: The percentiles to compute. Default is p50, p95 and p99.
+        :type quantiles: tuple
+        :return: {phase: [milliseconds per percentile]}, plus the whole frame under 'frame'.
+        :rtype: dict
+        """
+        if not len(self):
+            return {}
+        durations = self.durations[:len(self)] * 1000
+        result = {phase: np.percentile(durations[:, column], quantiles).tolist()
+                  for phase, column in self._columns.items()}
+        result['frame'] = np.percentile(durations.sum(axis=1), quantiles).tolist()
+        return result
+
+    def export_csv(self, path):
+        """
+        Write the recorded frames to a CSV file, one row per frame and one column per phase in milliseconds.
+
+        :param path: The path of the file.
+        :type path: str
+        """
+        with open(path, 'w') as file:
+            file.write(','.join(('frame',) + self.phases) + '\n')
+            first_frame = self.frames - len(self)
+            for number, row in enumerate(self._ordered()):
+                values = ','.join(f'{duration * 1000:.4f}' for duration in self.durations[row])
+                file.write(f'{first_frame + number},{values}\n')
+
+    def export_chrome_trace(self, path):
+        """
+        Write the recorded frames as a Chrome trace (chrome://tracing, Perfetto), one event per phase.
+
+        :param path: The path of the file.
+        :type path: str
+        """
+        events = []
+        if len(self):
+            origin = self.starts[self._ordered()[0]]
+            for row in self._ordered():
+                start = (self.starts[row] - origin) * 1e6
+                events.append({'name': 'frame', 'ph': 'X', 'pid': 0, 'tid': 0,
+                               'ts': start, 'dur': self.durations[row].sum() * 1e6})
+                for phase, duration in zip(self.phases, self.durations[row].tolist()):
+                    if duration:
+                        events.append({'name': phase, 'ph': 'X', 'pid': 0, 'tid': 1,
+                                       'ts': start, 'dur': duration * 1e6})
+                        start += duration * 1e6
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
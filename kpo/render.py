@@ -0,0 +1,365 @@
+from collections import Counter, deque
+
+import pygame
+
+
+class Renderer:
+    """
+    Draws onto the game screen and presents finished frames.
+
+    By default every frame starts by blitting the whole background and ends with
+    ``pygame.display.flip()``. In dirty-rectangle mode the renderer remembers the area of every draw
+    call instead: a frame only restores the areas drawn in the previous frame from the background and
+    pushes the old and new areas with ``pygame.display.update(rects)``. When the dirty areas cover a
+    large part of the screen, e.g. during a full-screen overlay, it falls back to a full flip.
+
+    Everything is drawn at a fixed logical size. When the window has another size, frames are drawn
+    onto an offscreen :attr:`canvas` that is scaled once per frame into the largest area of the window
+    with the same aspect ratio (:attr:`viewport`), so the window can be resized without the game noticing.
+    """
+
+    def __init__(self, screen, dirty_rects=False, full_threshold=0.5, size=None):
+        """
+        Initialize the renderer.
+
+        :param screen: The display surface.
+        :type screen: pygame.Surface
+        :param dirty_rects: Whether to present only the changed areas. Default is False.
+        :type dirty_rects: bool
+        :param full_threshold: The share of the screen above which dirty-rectangle mode flips the
+            whole screen instead. Default is 0.5.
+        :type full_threshold: float
+        :param size: The logical size everything is drawn at (width, height). Default is the size of
+            the display surface.
+        :type size: tuple
+        """
+        self.dirty_rects = dirty_rects
+        self.full_threshold = full_threshold
+        self.size = tuple(size or screen.get_size())
+        self.smooth = False
+        self.previous_rects = []
+        self.current_rects = []
+        self.full_redraw = True
+        self.background = None
+        self.viewport = None
+        self._offscreen = None
+        self.screen = screen
+
+    @property
+    def screen(self):
+        """
+        Get the display surface frames are presented on.
+
+        :return: The display surface.
+        :rtype: pygame.Surface
+        """
+        return self._screen
+
+    @screen.setter
+    def screen(self, screen):
+        """
+        Set the display surface frames are presented on, e.g. after the display mode changed.
+
+        :param screen: The display surface.
+        :type screen: pygame.Surface
+        """
+        self._screen = screen
+        width, height = screen.get_size()
+        if (width, height) == self.size:
+            self.viewport = None
+            self.canvas = screen
+        else:
+            scale = min(width / self.size[0], height / self.size[1])
+            self.viewport = pygame.Rect(0, 0, round(self.size[0] * scale), round(self.size[1] * scale))
+            self.viewport.center = (width // 2, height // 2)
+            if self._offscreen is None:
+                self._offscreen = pygame.Surface(self.size, 0, screen)
+            self.canvas = self._offscreen
+        self.invalidate()
+
+    def map_pointer(self, pos):
+        """
+        Map a position in the window, e.g. of the mouse, to the logical screen.
+
+        :param pos: The position in the window (x, y).
+        :type pos: tuple
+        :return: The position on the logical screen (x, y).
+        :rtype: tuple
+        """
+        if self.viewport is None:
+            return pos
+        return ((pos[0] - self.viewport.x) * self.size[0] // self.viewport.width,
+                (pos[1] - self.viewport.y) * self.size[1] // self.viewport.height)
+
+    def invalidate(self):
+        """
+        Redraw and present the whole screen in the next frame.
+        """
+        self.full_redraw = True
+
+    def add(self, rect):
+        """
+        Mark an area of the screen as changed in the current frame.
+
+        :param rect: The changed area.
+        :type rect: pygame.Rect
+        :return: The same area.
+        :rtype: pygame.Rect
+        """
+        if self.dirty_rects:
+            self.current_rects.append(rect)
+        return rect
+
+    def clear(self, background):
+        """
+        Start a new frame by drawing the background.
+
+        In dirty-rectangle mode only the areas drawn in the previous frame are restored, unless the
+        background changed since then.
+
+        :param background: The background image covering the whole screen.
+        :type background: pygame.Surface
+        """
+        if background is not self.background:
+            self.background = background
+            self.full_redraw = True
+        if not self.dirty_rects or self.full_redraw:
+            self.canvas.blit(background, (0, 0))
+        else:
+            for rect in self.previous_rects:
+                self.canvas.blit(background, rect, rect)
+
+    def fill(self, color):
+        """
+        Fill the whole screen with a color.
+
+        :param color: The fill color.
+        :type color: tuple
+        :return: The area of the screen that was drawn on.
+        :rtype: pygame.Rect
+        """
+        return self.add(self.canvas.fill(color))
+
+    def blit(self, surface, pos, area=None):
+        """
+        Draw a surface onto the screen.
+
+        :param surface: The surface to draw.
+        :type surface: pygame.Surface
+        :param pos: The position of the top left corner (x, y).
+        :type pos: tuple
+        :param area: The part of the surface to draw. Default is the whole surface.
+        :type area: pygame.Rect
+        :return: The area of the screen that was drawn on.
+        :rtype: pygame.Rect
+        """
+        return self.add(self.canvas.blit(surface, pos, area))
+
+    def blits(self, sequence):
+        """
+        Draw many surfaces onto the screen with a single ``Surface.blits`` call.
+
+        :param sequence: (surface, (x, y)) or (surface, (x, y), area) for every draw, in drawing order.
+        :type sequence: list
+        :return: The areas of the screen that were drawn on, in dirty-rectangle mode; otherwise None.
+        :rtype: list
+        """
+        if not self.dirty_rects:
+            self.canvas.blits(sequence, doreturn=False)
+            return None
+        rects = self.canvas.blits(sequence)
+        self.current_rects.extend(rects)
+        return rects
+
+    def draw_rect(self, color, rect):
+        """
+        Draw a filled rectangle onto the screen.
+
+        :param color: The fill color.
+        :type color: tuple
+        :param rect: The rectangle to fill.
+        :type rect: pygame.Rect
+        :return: The area of the screen that was drawn on.
+        :rtype: pygame.Rect
+        """
+        return self.add(pygame.draw.rect(self.canvas, color, rect))
+
+    def draw_circle(self, color, center, radius):
+        """
+        Draw a filled circle onto the screen.
+
+        :param color: The fill color.
+        :type color: tuple
+        :param center: The center of the circle (x, y).
+        :type center: tuple
+        :param radius: The radius of the circle.
+        :type radius: int
+        :return: The area of the screen that was drawn on.
+        :rtype: pygame.Rect
+        """
+        return self.add(pygame.draw.circle(self.canvas, color, center, radius))
+
+    def scale(self):
+        """
+        Scale the canvas into the viewport of the window, filling the rest of the window with black
+        after the window changed.
+        """
+        if self.full_redraw:
+            self._screen.fill((0, 0, 0))
+        target = self._screen.subsurface(self.viewport)
+        if self.smooth:
+            pygame.transform.smoothscale(self.canvas, self.viewport.size, target)
+        else:
+            pygame.transform.scale(self.canvas, self.viewport.size, target)
+
+    def present(self):
+        """
+        Finish the frame, scale it to the window if needed, and show it on the display.
+
+        A scaled frame is always flipped whole; dirty-rectangle mode then only saves restoring the canvas.
+        """
+        if self.viewport is not None:
+            self.scale()
+        if not self.dirty_rects:
+            pygame.display.flip()
+            return
+
+        rects = self.previous_rects + self.current_rects
+        width, height = self.size
+        dirty_area = sum(rect.width * rect.height for rect in rects)
+        if self.viewport is not None or self.full_redraw or dirty_area > self.full_threshold * width * height:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.previous_rects = self.current_rects
+        self.current_rects = []
+        self.full_redraw = False
+
+
+class NullRenderer(Renderer):
+    """
+    Renderer with the interface of :class:`Renderer` that draws and presents nothing.
+
+    Every draw call only computes the area of the screen it would have drawn on and passes it to
+    :meth:`draw`, so the game can run, and be profiled, without paying for pixels or a display.
+    """
+
+    def __init__(self, screen, dirty_rects=False, full_threshold=0.5, size=None):
+        """
+        Initialize the renderer. Only the size of the screen is used.
+
+        :param screen: The display surface.
+        :type screen: pygame.Surface
+        :param dirty_rects: Ignored; accepted so the backends can be swapped.
+        :type dirty_rects: bool
+        :param full_threshold: Ignored; accepted so the backends can be swapped.
+        :type full_threshold: float
+        :param size: The logical size everything is drawn at. Default is the size of the display surface.
+        :type size: tuple
+        """
+        super().__init__(screen, size=size)
+
+    def clear(self, background):
+        self.draw(self.canvas.get_rect(), 'clear')
+
+    def fill(self, color):
+        return self.draw(self.canvas.get_rect(), 'fill')
+
+    def blit(self, surface, pos, area=None):
+        size = pygame.Rect(area).size if area is not None else surface.get_size()
+        return self.draw(pygame.Rect(pos[0], pos[1], *size), 'blit')
+
+    def blits(self, sequence):
+        for item in sequence:
+            self.blit(*item)
+        return None
+
+    def draw_rect(self, color, rect):
+        return self.draw(pygame.Rect(rect), 'rect')
+
+    def draw_circle(self, color, center, radius):
+        return self.draw(pygame.Rect(center[0] - radius, center[1] - radius, 2 * radius, 2 * radius), 'circle')
+
+    def draw(self, rect, kind):
+        """
+        Handle a draw call. The null renderer drops it.
+
+        :param rect: The area of the draw call.
+        :type rect: pygame.Rect
+        :param kind: The kind of the call: 'clear', 'fill', 'blit', 'rect' or 'circle'.
+        :type kind: str
+        :return: The area of the screen the call would have drawn on.
+        :rtype: pygame.Rect
+        """
+        return rect.clip(self.canvas.get_rect())
+
+    def present(self):
+        pass
+
+
+class RecordingRenderer(NullRenderer):
+    """
+    Renderer that draws nothing but counts the draw calls and drawn pixels of every frame.
+
+    The counts of the last ``capacity`` frames are kept in :attr:`history`, one dict per presented frame
+    with the number of calls, the number of pixels drawn (overdraw counted every time) and the calls per
+    kind. They are a cheap, deterministic performance signal that tests can assert on.
+    """
+
+    def __init__(self, screen, dirty_rects=False, full_threshold=0.5, size=None, capacity=600):
+        """
+        Initialize the renderer.
+
+        :param screen: The display surface; only its size is used.
+        :type screen: pygame.Surface
+        :param dirty_rects: Ignored; accepted so the backends can be swapped.
+        :type dirty_rects: bool
+        :param full_threshold: Ignored; accepted so the backends can be swapped.
+        :type full_threshold: float
+        :param size: The logical size everything is drawn at. Default is the size of the display surface.
+        :type size: tuple
+        :param capacity: The number of frames kept in :attr:`history`. Default is 600.
+        :type capacity: int
+        """
+        super().__init__(screen, size=size)
+        self.history = deque(maxlen=capacity)
+        self.frames = 0
+        self._start_frame()
+
+    def _start_frame(self):
+        self.calls = 0
+        self.pixels = 0
+        self.kinds = Counter()
+
+    def draw(self, rect, kind):
+        rect = super().draw(rect, kind)
+        self.calls += 1
+        self.pixels += rect.width * rect.height
+        self.kinds[kind] += 1
+        return rect
+
+    def present(self):
+        """
+        Finish the frame and store its counts.
+        """
+        self.history.append({'calls': self.calls, 'pixels': self.pixels, 'kinds': dict(self.kinds)})
+        self.frames += 1
+        self._start_frame()
+
+    @property
+    def last_frame(self):
+        """
+        Get the counts of the last presented frame.
+
+        :return: {'calls', 'pixels', 'kinds'}, or None before the first frame.
+        :rtype: dict
+        """
+        return self.history[-1] if self.history else None
+
+
+# Render backends by name, for Game(render_backend=...) and the --render-backend option
+RENDERERS = {
+    'pygame': Renderer,
+    'null': NullRenderer,
+    'recording': RecordingRenderer,
+}
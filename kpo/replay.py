@@ -0,0 +1,249 @@
+"""
+Recording of play sessions and headless replay.
+
+A session is fully determined by the seed of its :class:`kpo.sim.World` and by the pointer positions,
+key presses and fruit cap of every tick, so a recording stores only those. The file starts with a fixed
+header and the fruit types, followed by one record per tick::
+
+    <number of pointer positions> (<dx> <dy>)... <number of keys> <key>... <fruit cap + 1, or 0>
+
+All numbers are variable-length integers, and the pointer positions are stored as the difference to the
+previous position, so a tick in which the pointer barely moves takes a few bytes.
+
+Replaying feeds the ticks back through :meth:`kpo.sim.World.step` without a display and without a frame
+cap, so recorded high scores can be verified and bug reports reproduced much faster than real time::
+
+    python -m kpo.replay session.kpor --score 42
+"""
+import struct
+import sys
+import time
+
+from kpo.scores import write_atomic
+from kpo.sim import TICK_MS, World
+
+MAGIC = b'KPOR'
+VERSION = 3
+# magic, version, seed, width, height, start time, number of ticks, length of the fruit types
+HEADER = struct.Struct('<4sBQHHdIH')
+
+
+def write_varint(out, value):
+    """
+    Append a signed integer to a buffer as a zigzag-encoded variable-length integer.
+
+    :param out: The buffer.
+    :type out: bytearray
+    :param value: The integer.
+    :type value: int
+    """
+    value = (value << 1) ^ (value >> 63)
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    """
+    Read a signed integer written by :func:`write_varint`.
+
+    :param data: The buffer.
+    :type data: bytes
+    :param offset: The position of the integer in the buffer.
+    :type offset: int
+    :return: The integer and the position after it.
+    :rtype: tuple
+    """
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return (value >> 1) ^ -(value & 1), offset
+        shift += 7
+
+
+class InputRecorder:
+    """
+    Records the inputs of a session tick by tick into a compact binary stream.
+    """
+
+    def __init__(self, seed, resolution, fruit_types, start_time=0):
+        """
+        Start a recording.
+
+        :param seed: The seed of the session's world.
+        :type seed: int
+        :param resolution: The size of the playing field (width, height).
+        :type resolution: tuple
+        :param fruit_types: The names of the fruits that can be spawned.
+        :type fruit_types: list
+        :param start_time: The clock value in milliseconds the session starts at. Default is 0.
+        :type start_time: int or float
+        """
+        self.seed = seed
+        self.resolution = tuple(int(size) for size in resolution)
+        self.fruit_types = list(fruit_types)
+        self.start_time = start_time
+        self.ticks = 0
+        self.stream = bytearray()
+        self._last = (0, 0)
+
+    def record(self, pointer_path, keys=(), max_fruits=None):
+        """
+        Record the inputs of one tick.
+
+        :param pointer_path: The pointer positions (x, y) passed to :meth:`kpo.sim.World.step`.
+        :type pointer_path: list
+        :param keys: The keys pressed during the tick.
+        :type keys: list
+        :param max_fruits: The fruit cap of the world during the tick. Default is None, no cap.
+        :type max_fruits: int
+        """
+        stream = self.stream
+        write_varint(stream, len(pointer_path))
+        last_x, last_y = self._last
+        for x, y in pointer_path:
+            x, y = int(x), int(y)
+            write_varint(stream, x - last_x)
+            write_varint(stream, y - last_y)
+            last_x, last_y = x, y
+        self._last = (last_x, last_y)
+        write_varint(stream, len(keys))
+        for key in keys:
+            write_varint(stream, key)
+        write_varint(stream, 0 if max_fruits is None else max_fruits + 1)
+        self.ticks += 1
+
+    def to_bytes(self):
+        """
+        Get the recording as a file.
+
+        :return: The header and the input stream.
+        :rtype: bytes
+        """
+        fruit_types = ','.join(self.fruit_types).encode()
+        header = HEADER.pack(MAGIC, VERSION, self.seed, *self.resolution, self.start_time, self.ticks,
+                             len(fruit_types))
+        return header + fruit_types + self.stream
+
+    def save(self, path):
+        """
+        Write the recording to a file with :func:`kpo.scores.write_atomic`, so a crash in the middle of
+        the write cannot leave a truncated recording.
+
+        :param path: The path of the file.
+        :type path: str
+        """
+        write_atomic(path, self.to_bytes())
+
+
+class Recording:
+    """
+    A recorded session read back from a file.
+    """
+
+    def __init__(self, data):
+        """
+        Parse a recording.
+
+        :param data: The contents of a file written by :meth:`InputRecorder.save`.
+        :type data: bytes
+        :raises ValueError: If the data is not a recording.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Not a recording: the file is too short")
+        magic, version, self.seed, width, height, self.start_time, self.ticks, names_length = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a recording of this version of the game")
+        self.resolution = (width, height)
+        names = data[HEADER.size:HEADER.size + names_length].decode()
+        self.fruit_types = names.split(',') if names else []
+        self.data = data
+        self.offset = HEADER.size + names_length
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a recording from a file.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: The recording.
+        :rtype: Recording
+        """
+        with open(path, 'rb') as file:
+            return cls(file.read())
+
+    def __iter__(self):
+        """
+        Decode the ticks.
+
+        :return: An iterator of (pointer positions, keys, fruit cap) per tick.
+        :rtype: iterator
+        """
+        data = self.data
+        offset = self.offset
+        x = y = 0
+        for _ in range(self.ticks):
+            count, offset = read_varint(data, offset)
+            path = []
+            for _ in range(count):
+                dx, offset = read_varint(data, offset)
+                dy, offset = read_varint(data, offset)
+                x += dx
+                y += dy
+                path.append((x, y))
+            count, offset = read_varint(data, offset)
+            keys = []
+            for _ in range(count):
+                key, offset = read_varint(data, offset)
+                keys.append(key)
+            max_fruits, offset = read_varint(data, offset)
+            yield path, keys, (max_fruits - 1 if max_fruits else None)
+
+
+def replay(recording):
+    """
+    Run a recorded session through the simulation, as fast as possible.
+
+    :param recording: The recording.
+    :type recording: Recording
+    :return: The world at the end of the session.
+    :rtype: kpo.sim.World
+    """
+    world = World(recording.resolution, recording.fruit_types, recording.start_time, recording.seed)
+    for pointer_path, _, max_fruits in recording:
+        if world.over:
+            break
+        world.max_fruits = max_fruits
+        world.step(TICK_MS, pointer_path)
+    return world
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a recorded Fruit Ninja session without a display")
+    parser.add_argument('recording', help="path of the recording")
+    parser.add_argument('--score', type=int, help="claimed score; exit with status 1 if the replay differs")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording)
+    start = time.perf_counter()
+    world = replay(recording)
+    elapsed = time.perf_counter() - start
+    played = recording.ticks * TICK_MS / 1000
+    print(f"{recording.ticks} ticks ({played:.1f} s of play) replayed in {elapsed:.2f} s "
+          f"({played / max(elapsed, 1e-9):.0f}x real time)")
+    print(f"Score: {world.score}, lives: {world.lives}")
+    if args.score is not None and args.score != world.score:
+        print(f"The claimed score {args.score} does not match the replay")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
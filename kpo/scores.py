@@ -0,0 +1,249 @@
+import collections
+import copy
+import json
+import os
+import tempfile
+import threading
+
+
+def default_data_dir():
+    """
+    Get the directory the game keeps its data in.
+
+    :return: The value of the KPO_DATA_DIR environment variable, or ``~/.kpo`` if it is not set.
+    :rtype: str
+    """
+    return os.environ.get('KPO_DATA_DIR') or os.path.join(os.path.expanduser('~'), '.kpo')
+
+
+# Where versions without a data directory kept the best scores: the working directory.
+LEGACY_BEST_SCORES_PATH = 'best_scores.json'
+
+
+def read_legacy_scores(path, legacy_path=None):
+    """
+    Read the best scores an earlier version kept in the working directory, to carry them over to a new
+    data directory.
+
+    :param path: The path of the scores file in the data directory.
+    :type path: str
+    :param legacy_path: The path of the legacy scores file. Default is :data:`LEGACY_BEST_SCORES_PATH`.
+    :type legacy_path: str
+    :return: The best scores as {rank: [score, time]}, or None if there is no readable legacy file or
+        it is the scores file itself.
+    :rtype: dict or None
+    """
+    legacy_path = legacy_path or LEGACY_BEST_SCORES_PATH
+    if not os.path.isfile(legacy_path) or os.path.abspath(legacy_path) == os.path.abspath(path):
+        return None
+    try:
+        with open(legacy_path, 'r') as file:
+            scores = json.load(file)
+    except (OSError, ValueError) as error:
+        print(f"Error: could not import the best scores of '{legacy_path}': {error}")
+        return None
+    if not isinstance(scores, dict):
+        print(f"Error: could not import the best scores of '{legacy_path}': not a scores file")
+        return None
+    print(f"Imported the best scores of an earlier version from '{os.path.abspath(legacy_path)}'")
+    return scores
+
+
+def write_atomic(path, data):
+    """
+    Write bytes to a file so that the file always holds either the old or the new data.
+
+    The data is written to a temporary file in the same directory, synced to disk and then moved over
+    the target with ``os.replace``, so a crash in the middle of a write cannot corrupt the file.
+
+    :param path: The path of the file.
+    :type path: str
+    :param data: The data to write.
+    :type data: bytes
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_json_atomic(path, data):
+    """
+    Write JSON data to a file with :func:`write_atomic`.
+
+    :param path: The path of the file.
+    :type path: str
+    :param data: The data to write.
+    """
+    write_atomic(path, json.dumps(data, indent=4).encode())
+
+
+class ScoreWriter:
+    """
+    Writes the best scores to disk on a background thread.
+
+    :meth:`save` only takes a snapshot of the scores and returns, so the game loop never waits for the
+    disk. When several snapshots are saved before the writer gets to them, only the latest one is
+    written.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the writer. The thread starts with the first save.
+
+        :param path: The path of the scores file.
+        :type path: str
+        """
+        self.path = path
+        self.writes = 0
+        self._pending = None
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def save(self, scores):
+        """
+        Schedule the scores to be written.
+
+        :param scores: The scores; a copy is written, so they can be changed right after the call.
+        :type scores: dict
+        """
+        with self._condition:
+            self._pending = copy.deepcopy(scores)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='kpo-score-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                scores, self._pending = self._pending, None
+                self._busy = True
+            try:
+                write_json_atomic(self.path, scores)
+                self.writes += 1
+            except OSError as error:
+                print(f"Error: could not save the best scores to '{self.path}': {error}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Wait until all saved scores are written.
+
+        :param timeout: The maximum time to wait in seconds. Default is no limit.
+        :type timeout: float
+        :return: True if everything was written, False if the timeout expired.
+        :rtype: bool
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        """
+        Write the pending scores and stop the thread.
+
+        :param timeout: The maximum time to wait in seconds. Default is no limit.
+        :type timeout: float
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+class FileWriter:
+    """
+    Writes files to disk with :func:`write_atomic` on a background thread.
+
+    :meth:`save` only queues the data and returns, so the game loop never waits for the disk. Unlike
+    :class:`ScoreWriter`, every saved file is written, in the order they were saved.
+    """
+
+    def __init__(self):
+        """
+        Initialize the writer. The thread starts with the first save.
+        """
+        self.writes = 0
+        self._queue = collections.deque()
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def save(self, path, data):
+        """
+        Schedule a file to be written.
+
+        :param path: The path of the file.
+        :type path: str
+        :param data: The contents of the file.
+        :type data: bytes
+        """
+        with self._condition:
+            self._queue.append((path, data))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='kpo-file-writer', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                path, data = self._queue.popleft()
+                self._busy = True
+            try:
+                write_atomic(path, data)
+                self.writes += 1
+            except OSError as error:
+                print(f"Error: could not save '{path}': {error}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Wait until all saved files are written.
+
+        :param timeout: The maximum time to wait in seconds. Default is no limit.
+        :type timeout: float
+        :return: True if everything was written, False if the timeout expired.
+        :rtype: bool
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        """
+        Write the pending files and stop the thread.
+
+        :param timeout: The maximum time to wait in seconds. Default is no limit.
+        :type timeout: float
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
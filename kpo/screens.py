@@ -0,0 +1,114 @@
+import pygame
+
+# Colors of a button, by whether the pointer hovers over it.
+BUTTON_COLOR = (255, 0, 0)
+BUTTON_HOVER_COLOR = (0, 200, 0)
+
+
+class StaticScreen:
+    """
+    A screen that only changes when the pointer moves onto or off one of its buttons.
+
+    The background and the static text are composed into :attr:`surface` once. Buttons are drawn onto
+    the same surface, and :meth:`update` redraws only the buttons whose hover state flipped, so the
+    surface always shows the whole screen and can serve as the renderer's background.
+    """
+
+    def __init__(self, background):
+        """
+        Start composing a screen.
+
+        :param background: The background image covering the whole screen.
+        :type background: pygame.Surface
+        """
+        self.surface = background.copy()
+        self.buttons = []
+        self.key = None
+
+    def blit(self, surface, pos):
+        """
+        Draw static content, e.g. a rendered text, onto the screen.
+
+        :param surface: The content to draw.
+        :type surface: pygame.Surface
+        :param pos: The top-left corner of the content.
+        :type pos: tuple
+        :return: The area of the screen that was drawn on.
+        :rtype: pygame.Rect
+        """
+        return self.surface.blit(surface, pos)
+
+    def add_button(self, rect, label):
+        """
+        Add a button. It is drawn by the next :meth:`update`.
+
+        :param rect: The area of the button.
+        :type rect: pygame.Rect
+        :param label: The rendered text of the button, centered on it.
+        :type label: pygame.Surface
+        """
+        self.buttons.append([rect, label, None])
+
+    def update(self, mouse_x, mouse_y):
+        """
+        Redraw the buttons whose hover state changed since the last update.
+
+        :param mouse_x: The x-coordinate of the mouse position.
+        :type mouse_x: int
+        :param mouse_y: The y-coordinate of the mouse position.
+        :type mouse_y: int
+        :return: The areas of the buttons that were redrawn.
+        :rtype: list
+        """
+        changed = []
+        for button in self.buttons:
+            rect, label, drawn_hover = button
+            hover = bool(rect.collidepoint(mouse_x, mouse_y))
+            if hover is drawn_hover:
+                continue
+            button[2] = hover
+            pygame.draw.rect(self.surface, BUTTON_HOVER_COLOR if hover else BUTTON_COLOR, rect)
+            self.surface.blit(label, label.get_rect(center=rect.center))
+            changed.append(rect)
+        return changed
+
+
+class ScreenCache:
+    """
+    Composed static screens by name, recomposed when their key changes.
+    """
+
+    def __init__(self):
+        self._screens = {}
+
+    def __len__(self):
+        return len(self._screens)
+
+    def get(self, name, key, compose):
+        """
+        Get a screen, composing it if it is not cached or was composed for another key.
+
+        :param name: The name of the screen.
+        :type name: str
+        :param key: What the screen was composed from, e.g. the background and the font.
+        :type key: tuple
+        :param compose: The function composing the screen.
+        :type compose: callable
+        :return: The screen.
+        :rtype: StaticScreen
+        """
+        screen = self._screens.get(name)
+        if screen is None or screen.key != key:
+            screen = compose()
+            screen.key = key
+            self._screens[name] = screen
+        return screen
+
+    def discard(self, name):
+        """
+        Drop a screen, e.g. after its content changed.
+
+        :param name: The name of the screen.
+        :type name: str
+        """
+        self._screens.pop(name, None)
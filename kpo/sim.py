@@ -0,0 +1,183 @@
+import random
+
+import numpy as np
+
+from kpo.fruit import FRUIT_SIZE, FruitStore
+from kpo.spawn import SpawnScheduler
+
+# Length of one simulation tick in milliseconds; the game was tuned at 60 frames per second.
+TICK_MS = 1000 / 60
+
+
+class World:
+    """
+    Headless simulation core of the game.
+
+    The World owns everything that makes up a play session - the fruits, score, lives, fruit speed
+    and spawning - and advances it in fixed ticks through :meth:`step`. It never draws and never
+    touches the display, so sessions can be simulated without a window and far faster than real time.
+    """
+
+    def __init__(self, resolution, fruit_types=None, start_time=0, seed=None):
+        """
+        Initialize a new world.
+
+        :param resolution: The size of the playing field (width, height).
+        :type resolution: tuple
+        :param fruit_types: The names of the fruits that can be spawned.
+        :type fruit_types: list
+        :param start_time: The clock value in milliseconds the world starts at. Default is 0.
+        :type start_time: int or float
+        :param seed: The seed of the session's spawn timeline. Default is a new random seed.
+        :type seed: int
+        """
+        self.resolution = resolution
+        self.spawner = SpawnScheduler()
+        self.fruits = FruitStore(fruit_types if fruit_types is not None else ['watermelon', 'apple', 'banana'])
+        # Difficulty: the fruits get faster by speed_step every speed_increase_interval milliseconds, and
+        # a fruit spawns on average once every spawn_interval ticks
+        self.speed_increase_interval = 5000
+        self.speed_step = 1.05
+        self.spawn_interval = 41
+        # The most fruits on screen at once, or None for no limit; spawns beyond it are skipped
+        self.max_fruits = None
+        self.sliced = []
+        self.missed = []
+        self.reset(start_time, seed)
+
+    def reset(self, start_time=0, seed=None):
+        """
+        Reset the world to the beginning of a new session.
+
+        All randomness of a session comes from :attr:`spawner`, seeded with the session's seed, so a
+        session is fully determined by its seed and its inputs.
+
+        :param start_time: The clock value in milliseconds the session starts at. Default is 0.
+        :type start_time: int or float
+        :param seed: The seed of the session's spawn timeline. Default is a new random seed.
+        :type seed: int
+        """
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.spawner.reset(self.seed, start_time)
+        self.start_time = start_time
+        self.time = start_time
+        self.last_speed_increase_time = start_time
+        self.fruit_speed = -1
+        self.score = 0
+        self.lives = 3
+        self.fruits.clear()
+        self.release_events()
+
+    @property
+    def fruit_types(self):
+        """
+        Get the names of the fruits that can be spawned.
+
+        :return: The fruit type names.
+        :rtype: list
+        """
+        return self.fruits.names
+
+    @fruit_types.setter
+    def fruit_types(self, names):
+        """
+        Set the names of the fruits that can be spawned.
+
+        :param names: The fruit type names.
+        :type names: list
+        """
+        self.fruits.names = names
+
+    @property
+    def elapsed(self):
+        """
+        Get the time simulated since the session started.
+
+        :return: The time in milliseconds, a whole number of ticks.
+        :rtype: float
+        """
+        return self.time - self.start_time
+
+    @property
+    def over(self):
+        """
+        Tell whether the session has ended.
+
+        :return: True if no lives are left, False otherwise.
+        :rtype: bool
+        """
+        return self.lives <= 0
+
+    def step(self, dt, inputs):
+        """
+        Advance the world by one tick.
+
+        The fruits sliced and missed during the tick are available afterwards in
+        :attr:`sliced` and :attr:`missed` until the next tick returns them to the fruit pool.
+
+        :param dt: The length of the tick in milliseconds, normally :data:`TICK_MS`.
+        :type dt: int or float
+        :param inputs: The pointer positions (x, y) sampled during the tick, oldest first. Every
+            segment between consecutive positions slices the fruits it crosses.
+        :type inputs: list
+        """
+        self.time += dt
+        self.release_events()
+        self.speed_increaser(self.time)
+        self.fruits_movement(inputs)
+        self.spawn_random_fruits()
+
+    def release_events(self):
+        """
+        Return the fruits sliced and missed in the last tick to the fruit pool.
+        """
+        self.fruits.pool.release(self.sliced)
+        self.fruits.pool.release(self.missed)
+        self.sliced.clear()
+        self.missed.clear()
+
+    def speed_increaser(self, current_time):
+        """
+        Increase the speed of falling fruits by the speed step once every speed increase interval.
+
+        :param current_time: The current time in milliseconds.
+        :type current_time: int or float
+        """
+        if current_time - self.last_speed_increase_time > self.speed_increase_interval:
+            self.fruit_speed -= self.speed_step
+            self.last_speed_increase_time = current_time
+
+    def fruits_movement(self, inputs):
+        """
+        Move the fruits, slice the ones the pointer passed over and drop the ones that left the screen.
+
+        :param inputs: The pointer positions (x, y) sampled during the tick, oldest first.
+        :type inputs: list
+        """
+        fruits = self.fruits
+        fruits.move(self.fruit_speed)
+
+        if inputs:
+            sliced = fruits.hit_path(inputs)
+        else:
+            sliced = np.zeros(len(fruits), dtype=bool)
+        missed = fruits.below(-FRUIT_SIZE) & ~sliced
+
+        self.score += int(sliced.sum())
+        self.lives -= int(missed.sum())
+        if sliced.any():
+            fruits.take(sliced, self.sliced)
+        if missed.any():
+            fruits.take(missed, self.missed)
+            sliced |= missed
+        fruits.remove(sliced)
+
+    def spawn_random_fruits(self):
+        """
+        Add the fruits the spawn scheduler planned up to the current time to the world.
+        """
+        spawns = self.spawner.due(self.time, self.spawn_interval * TICK_MS, len(self.fruit_types), self.resolution[0])
+        for _, kind, x_pos in spawns:
+            if self.max_fruits is not None and len(self.fruits) >= self.max_fruits:
+                continue
+            self.fruits.add(kind, x_pos, self.resolution[1], self.fruit_speed)
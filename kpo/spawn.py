@@ -0,0 +1,93 @@
+import heapq
+
+import numpy as np
+
+
+class SpawnScheduler:
+    """
+    Plans the spawns of a session ahead of time.
+
+    Spawn times, fruit kinds and positions are drawn from a seeded generator in batches and kept in a
+    time-ordered heap, so a tick only pops the spawns that are due instead of rolling a die. The times
+    between spawns are exponentially distributed, which gives the same spawn density as rolling a
+    one-in-N die every tick, but measured in milliseconds rather than ticks.
+    """
+
+    def __init__(self, seed=None, start_time=0, batch_size=64):
+        """
+        Initialize the scheduler.
+
+        :param seed: The seed of the generator. Default is a random seed.
+        :type seed: int
+        :param start_time: The time in milliseconds the first spawn is planned from. Default is 0.
+        :type start_time: int or float
+        :param batch_size: The number of spawns drawn at a time. Default is 64.
+        :type batch_size: int
+        """
+        self.batch_size = batch_size
+        self.reset(seed, start_time)
+
+    def __len__(self):
+        return len(self.queue)
+
+    def reset(self, seed=None, start_time=0):
+        """
+        Drop all planned spawns and restart the generator.
+
+        :param seed: The seed of the generator. Default is a random seed.
+        :type seed: int
+        :param start_time: The time in milliseconds the first spawn is planned from. Default is 0.
+        :type start_time: int or float
+        """
+        self.rng = np.random.default_rng(seed)
+        self.queue = []
+        self.horizon = start_time
+        self._sequence = 0
+
+    def schedule(self, time, kind, x_pos):
+        """
+        Plan a spawn.
+
+        :param time: The time of the spawn in milliseconds.
+        :type time: int or float
+        :param kind: The index of the fruit type.
+        :type kind: int
+        :param x_pos: The x-coordinate of the fruit.
+        :type x_pos: int or float
+        """
+        # The sequence number keeps spawns at the same time in the order they were planned
+        heapq.heappush(self.queue, (time, self._sequence, kind, x_pos))
+        self._sequence += 1
+
+    def _draw(self, mean_interval, kinds, width):
+        count = self.batch_size
+        times = self.horizon + np.cumsum(self.rng.exponential(mean_interval, count))
+        fruit_kinds = self.rng.integers(0, kinds, count)
+        positions = self.rng.integers(100, width - 100, count, endpoint=True)
+        for time, kind, x_pos in zip(times.tolist(), fruit_kinds.tolist(), positions.tolist()):
+            self.schedule(time, kind, x_pos)
+        self.horizon = times[-1]
+
+    def due(self, now, mean_interval, kinds, width):
+        """
+        Take the spawns due by the given time, drawing new batches as the plan runs out.
+
+        :param now: The current time in milliseconds.
+        :type now: int or float
+        :param mean_interval: The average time between spawns in milliseconds, for new batches.
+        :type mean_interval: float
+        :param kinds: The number of fruit types, for new batches.
+        :type kinds: int
+        :param width: The width of the playing field; fruits spawn at least 100 pixels from the edges.
+        :type width: int
+        :return: (time, kind, x) of the due spawns, oldest first.
+        :rtype: list
+        """
+        while self.horizon <= now:
+            self._draw(mean_interval, kinds, width)
+        spawns = []
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            time, _, kind, x_pos = heapq.heappop(queue)
+            spawns.append((time, kind, x_pos))
+        return spawns
@@ -0,0 +1,71 @@
+import os
+import time
+
+# When the kpo package started importing; the package imports this module first.
+IMPORT_STARTED = time.perf_counter()
+
+
+def process_age():
+    """
+    Get how long ago the process started.
+
+    :return: The age of the process in seconds, or None where it is not known (outside Linux).
+    :rtype: float or None
+    """
+    try:
+        with open('/proc/self/stat') as file:
+            # The start time is the 22nd field; the 2nd one, the command name, may contain spaces
+            start_ticks = int(file.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as file:
+            uptime = float(file.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProfile:
+    """
+    Times the phases of the startup, from the start of the process to the first frame.
+
+    The first phase, 'interpreter', runs from the start of the process to the import of the kpo
+    package and is only known where :func:`process_age` is. Every :meth:`mark` ends the current phase.
+    """
+
+    def __init__(self):
+        self.phases = []
+        age = process_age()
+        if age is not None:
+            self.phases.append(('interpreter', max(0.0, age - (time.perf_counter() - IMPORT_STARTED))))
+        self._last = IMPORT_STARTED
+
+    def mark(self, phase):
+        """
+        End a phase.
+
+        :param phase: The name of the phase that just ended.
+        :type phase: str
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total(self):
+        """
+        Get the time of all phases so far.
+
+        :return: The time in seconds.
+        :rtype: float
+        """
+        return sum(seconds for _, seconds in self.phases)
+
+    def report(self):
+        """
+        Format the time of every phase in the order they ran, and the total.
+
+        :return: One line per phase.
+        :rtype: str
+        """
+        lines = [f'{phase:<20} {seconds * 1000:8.1f} ms' for phase, seconds in self.phases]
+        lines.append(f"{'startup total':<20} {self.total * 1000:8.1f} ms")
+        return '\n'.join(lines)
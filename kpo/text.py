@@ -0,0 +1,141 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class DigitStrip:
+    """
+    Pre-rendered glyphs of the characters used in numbers, packed side by side into one surface.
+
+    Numbers that change every frame (timer, FPS) are drawn by blitting the glyphs out of the strip
+    instead of rendering a new text surface for every value.
+    """
+    characters = '0123456789.-'
+
+    def __init__(self, font, color, antialias=True):
+        """
+        Render the glyphs of all number characters into a strip.
+
+        :param font: The font to render the glyphs with.
+        :type font: pygame.font.Font
+        :param color: The color of the glyphs.
+        :type color: tuple
+        :param antialias: Whether the glyphs are antialiased. Default is True.
+        :type antialias: bool
+        """
+        glyphs = [font.render(char, antialias, color) for char in self.characters]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        height = max(glyph.get_height() for glyph in glyphs)
+        self.strip = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.areas = {}
+        x_pos = 0
+        for char, glyph in zip(self.characters, glyphs):
+            self.strip.blit(glyph, (x_pos, 0))
+            self.areas[char] = pygame.Rect(x_pos, 0, glyph.get_width(), height)
+            x_pos += glyph.get_width()
+
+    def draw(self, target, text, pos):
+        """
+        Draw a number onto a surface, with a single ``blits`` call.
+
+        :param target: The surface or renderer to draw on.
+        :type target: pygame.Surface or kpo.render.Renderer
+        :param text: The formatted number, made only of the characters of the strip.
+        :type text: str
+        :param pos: The top left corner of the number (x, y).
+        :type pos: tuple
+        :return: The area of the target that was drawn on.
+        :rtype: pygame.Rect
+        """
+        x_pos, y_pos = pos
+        sequence = []
+        for char in text:
+            area = self.areas[char]
+            sequence.append((self.strip, (x_pos, y_pos), area))
+            x_pos += area.width
+        target.blits(sequence)
+        return pygame.Rect(pos[0], y_pos, x_pos - pos[0], self.strip.get_height())
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces.
+
+    Surfaces are keyed on (font, text, color, antialias), so text that did not change since the last
+    frame is blitted from the cache instead of being rendered again. The :attr:`hits` and :attr:`misses`
+    counters tell how well the cache works.
+    """
+
+    def __init__(self, max_size=256):
+        """
+        Initialize an empty cache.
+
+        :param max_size: The maximum number of cached surfaces. Default is 256.
+        :type max_size: int
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+        self._strips = {}
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Get the rendered surface of a text, rendering it only if it is not cached.
+
+        :param font: The font to render the text with.
+        :type font: pygame.font.Font
+        :param text: The text to render.
+        :type text: str
+        :param color: The color of the text.
+        :type color: tuple
+        :param antialias: Whether the text is antialiased. Default is True.
+        :type antialias: bool
+        :return: The rendered text.
+        :rtype: pygame.Surface
+        """
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def digits(self, font, color, antialias=True):
+        """
+        Get the digit strip of a font and color, building it on first use.
+
+        :param font: The font of the digits.
+        :type font: pygame.font.Font
+        :param color: The color of the digits.
+        :type color: tuple
+        :param antialias: Whether the digits are antialiased. Default is True.
+        :type antialias: bool
+        :return: The digit strip.
+        :rtype: DigitStrip
+        """
+        key = (font, color, antialias)
+        strip = self._strips.get(key)
+        if strip is None:
+            self.misses += 1
+            strip = self._strips[key] = DigitStrip(font, color, antialias)
+        else:
+            self.hits += 1
+        return strip
+
+    def clear(self):
+        """
+        Drop all cached surfaces and digit strips, e.g. after the font changed.
+        """
+        self._surfaces.clear()
+        self._strips.clear()
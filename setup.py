@@ -1,4 +1,24 @@
+import os
+
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithAssetPack(build_py):
+    """
+    Build the package and bake the pre-scaled asset pack (kpo/prebaked) into it.
+    """
+
+    def run(self):
+        super().run()
+        try:
+            from kpo.assets import bake
+        except ImportError as error:
+            print(f"Warning: asset pack not baked ({error}); images will be decoded at runtime.")
+            return
+        for path in bake(prebaked_dir=os.path.join(self.build_lib, 'kpo', 'prebaked')):
+            print(f"baked {path}")
+
 
 setup(
     name='kpo',
@@ -12,14 +32,20 @@ setup(
             'fruits/*.png',
             'sounds/*.mp3',
             'best_scores.json',
+            'prebaked/*',
         ],
     },
     install_requires=[
         'pygame',
+        'numpy',
     ],
+    cmdclass={
+        'build_py': BuildPyWithAssetPack,
+    },
     entry_points={
         'console_scripts': [
             'kpo=kpo.game:main',
+            'kpo-sim=kpo.batch:main',
         ],
     },
     author='Nagy Lóránt',
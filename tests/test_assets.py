@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from kpo.assets import RESOLUTIONS, bake, load_prebaked, prebaked_path
+
+
+class TestAssetPack(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.prebaked_dir = cls.tmp_dir.name
+        cls.written = bake(prebaked_dir=cls.prebaked_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_bake_writes_every_resolution(self):
+        for size in RESOLUTIONS:
+            for name in ('background', 'WelcomeScreen'):
+                path = prebaked_path(name, size, 'RGB', self.prebaked_dir)
+                self.assertIn(path, self.written)
+                self.assertEqual(os.path.getsize(path), size[0] * size[1] * 3)
+
+    def test_load_prebaked(self):
+        surface = load_prebaked('background', (1400, 800), prebaked_dir=self.prebaked_dir)
+        self.assertEqual(surface.get_size(), (1400, 800))
+
+        source_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'kpo', 'background', 'background.jpg')
+        source = pygame.transform.scale(pygame.image.load(source_path), (1400, 800))
+        self.assertEqual(surface.get_at((700, 400))[:3], source.get_at((700, 400))[:3])
+
+        fruit = load_prebaked('fruit_apple', (100, 100), 'RGBA', prebaked_dir=self.prebaked_dir)
+        self.assertEqual(fruit.get_size(), (100, 100))
+
+    def test_missing_asset(self):
+        # Backgrounds are only baked at the logical resolution
+        self.assertIsNone(load_prebaked('background', (1280, 720), prebaked_dir=self.prebaked_dir))
+        self.assertIsNone(load_prebaked('fruit_watermelon', (100, 100), 'RGBA', prebaked_dir=self.prebaked_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+from kpo.audio import AudioManager
+
+SOUNDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'kpo', 'sounds')
+
+
+@patch('pygame.mixer.get_init', return_value=(44100, -16, 2))
+class TestAudioManager(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.audio = AudioManager(self.cache_dir.name, voices=2)
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    @patch('pygame.mixer.Sound')
+    def test_load_caches_decoded_samples(self, mock_sound, mock_get_init):
+        mock_sound.return_value.get_raw.return_value = b'\x01\x02\x03\x04'
+        path = os.path.join(SOUNDS_DIR, 'slash.mp3')
+
+        self.audio.load(path)
+        mock_sound.assert_called_with(path)
+        cache_path = self.audio.cache_path(path)
+        self.assertTrue(cache_path.endswith('-44100--16-2.pcm'))
+        with open(cache_path, 'rb') as file:
+            self.assertEqual(file.read(), b'\x01\x02\x03\x04')
+
+        self.assertIs(self.audio.load(path), mock_sound.return_value)
+        mock_sound.assert_called_with(buffer=b'\x01\x02\x03\x04')
+        self.assertEqual((self.audio.cache_misses, self.audio.cache_hits), (1, 1))
+
+        # Another mixer format needs other samples
+        mock_get_init.return_value = (22050, -16, 1)
+        self.audio.load(path)
+        mock_sound.assert_called_with(path)
+
+    def test_missing_file(self, mock_get_init):
+        self.assertIsNone(self.audio.load(os.path.join(SOUNDS_DIR, 'missing.mp3')))
+
+    @patch('pygame.mixer.get_num_channels', return_value=8)
+    @patch('pygame.mixer.set_reserved')
+    @patch('pygame.mixer.Channel')
+    def test_play_steals_oldest_voice_and_limits_per_frame(self, mock_channel, mock_set_reserved, mock_num_channels,
+                                                           mock_get_init):
+        channels = [MagicMock(), MagicMock()]
+        for channel in channels:
+            channel.get_busy.return_value = True
+        channels[1].get_busy.return_value = False
+        mock_channel.side_effect = channels
+        slash, miss, other = MagicMock(), MagicMock(), MagicMock()
+
+        self.assertTrue(self.audio.play(slash))
+        channels[1].play.assert_called_with(slash)
+        mock_set_reserved.assert_called_with(2)
+
+        # Started again in the same frame: dropped
+        self.assertFalse(self.audio.play(slash))
+        self.assertEqual(self.audio.limited, 1)
+
+        # No voice is free: the oldest one is stopped and reused
+        channels[1].get_busy.return_value = True
+        self.assertTrue(self.audio.play(miss))
+        channels[0].stop.assert_called_once()
+        channels[0].play.assert_called_with(miss)
+        self.audio.end_frame()
+        self.assertTrue(self.audio.play(other))
+        channels[1].play.assert_has_calls([call(slash), call(other)])
+        self.assertEqual((self.audio.played, self.audio.stolen), (3, 2))
+
+        self.assertFalse(self.audio.play(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from kpo.batch import GreedyBot, IdleBot, SweepBot, parse_grid, play, run_batch, summarize
+from kpo.sim import World
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_play_is_deterministic(self):
+        self.assertEqual(play(3, 'greedy'), play(3, 'greedy'))
+
+    def test_policies(self):
+        idle = play(1, 'idle')
+        greedy = play(1, 'greedy')
+        self.assertEqual(idle['score'], 0)
+        self.assertFalse(idle['capped'])
+        self.assertGreater(greedy['score'], 0)
+        self.assertGreater(greedy['survival'], idle['survival'])
+
+    def test_parameters_change_difficulty(self):
+        easy = play(5, 'idle', {'spawn_interval': 200})
+        hard = play(5, 'idle', {'spawn_interval': 10})
+        self.assertGreater(easy['survival'], hard['survival'])
+
+    def test_max_ticks(self):
+        result = play(1, 'greedy', max_ticks=60)
+        self.assertTrue(result['capped'])
+        self.assertAlmostEqual(result['survival'], 1)
+
+    def test_bots_return_pointer_paths(self):
+        world = World((1400, 800), seed=0)
+        self.assertEqual(IdleBot()(world), [])
+        self.assertEqual(GreedyBot()(world), [])
+        world.fruits.add(0, 100, 300, -1)
+        path = GreedyBot(speed=10)(world)
+        self.assertEqual(path[0], (700, 400))
+        self.assertLess(path[1][0], 700)
+        sweep = SweepBot(speed=50)
+        self.assertEqual(sweep(world), [(0, 240), (50, 240)])
+
+    def test_run_batch_in_pool_matches_serial(self):
+        serial = list(run_batch(6, workers=1, policy='sweep', parameters={'spawn_interval': 20}, seed=10))
+        pooled = list(run_batch(6, workers=2, policy='sweep', parameters={'spawn_interval': 20}, seed=10))
+        self.assertEqual(sorted(serial, key=lambda result: result['seed']),
+                         sorted(pooled, key=lambda result: result['seed']))
+        self.assertEqual(serial[0]['spawn_interval'], 20)
+        self.assertEqual([result['seed'] for result in serial], list(range(10, 16)))
+
+    def test_summarize(self):
+        results = [{'score': score, 'survival': score / 10, 'capped': False} for score in range(11)]
+        summary = summarize(results)
+        self.assertEqual(summary['games'], 11)
+        self.assertEqual(summary['score']['p50'], 5)
+        self.assertEqual(summary['score']['max'], 10)
+        self.assertAlmostEqual(summary['survival']['mean'], 0.5)
+
+    def test_parse_grid(self):
+        self.assertEqual(parse_grid([]), [{}])
+        grid = parse_grid(['spawn_interval=31,41', 'speed_step=1.05'])
+        self.assertEqual(grid, [{'spawn_interval': 31, 'speed_step': 1.05},
+                                {'spawn_interval': 41, 'speed_step': 1.05}])
+        with self.assertRaises(ValueError):
+            parse_grid(['lives=5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
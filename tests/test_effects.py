@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import MagicMock
+
+from kpo.effects import OverlayCache, ParticlePool
+
+
+class TestParticlePool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ParticlePool(capacity=16, lifetime=100, seed=0)
+
+    def test_emit_and_expire(self):
+        self.pool.emit(50, 50, (255, 0, 0), 10, now=0)
+        self.pool.emit(80, 80, (0, 255, 0), 4, now=50)
+        self.assertEqual(len(self.pool), 14)
+
+        self.pool.update(10, now=100)
+        self.assertEqual(len(self.pool), 4)
+        self.pool.update(10, now=150)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_full_pool_overwrites_oldest(self):
+        self.pool.emit(0, 0, (255, 0, 0), 12, now=0)
+        self.pool.emit(0, 0, (0, 255, 0), 8, now=10)
+
+        self.assertEqual(len(self.pool), 16)
+        self.assertEqual(self.pool.head, 4)
+        self.assertEqual(self.pool.born[self.pool.head], 0)
+
+    def test_update_does_not_reallocate(self):
+        self.pool.emit(50, 50, (255, 0, 0), 10, now=0)
+        arrays = [self.pool.x, self.pool.y, self.pool.vx, self.pool.vy]
+        x_before = self.pool.x[:10].copy()
+        self.pool.update(10, now=10)
+
+        self.assertEqual([self.pool.x, self.pool.y, self.pool.vx, self.pool.vy], arrays)
+        self.assertFalse((self.pool.x[:10] == x_before).all())
+
+    def test_draw_wrapped_window(self):
+        self.pool.emit(0, 0, (255, 0, 0), 12, now=0)
+        self.pool.update(10, now=100)
+        self.pool.emit(0, 0, (0, 255, 0), 6, now=100)
+        renderer = MagicMock()
+        self.pool.draw(renderer)
+
+        self.assertEqual(renderer.draw_rect.call_count, 6)
+        renderer.draw_rect.assert_called_with((0, 255, 0), unittest.mock.ANY)
+
+
+class TestOverlayCache(unittest.TestCase):
+
+    def test_overlay_is_created_once_per_resolution(self):
+        overlays = OverlayCache()
+        first = overlays.get((200, 100), (255, 0, 0), 128)
+
+        self.assertIs(overlays.get((200, 100), (255, 0, 0), 128), first)
+        self.assertIsNot(overlays.get((300, 100), (255, 0, 0), 128), first)
+        self.assertEqual(first.get_size(), (200, 100))
+        self.assertEqual(first.get_alpha(), 128)
+
+
+if __name__ == '__main__':
+    unittest.main()
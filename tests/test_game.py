@@ -1,17 +1,27 @@
 import unittest
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, MagicMock
 import pygame
+import json
 import os
+import tempfile
 from kpo.game import Game
+from kpo.render import RecordingRenderer
+from kpo.sim import TICK_MS
 
 class TestGame(unittest.TestCase):
 
     def setUp(self):
         # Set up patchers for Pygame methods
         self.patcher_init = patch('pygame.init')
+        self.patcher_display_init = patch('pygame.display.init')
+        self.patcher_font_init = patch('pygame.font.init')
         self.patcher_mixer_init = patch('pygame.mixer.init')
         self.patcher_set_caption = patch('pygame.display.set_caption')
-        self.patcher_set_mode = patch('pygame.display.set_mode', return_value=MagicMock())
+        self.patcher_set_mode = patch('pygame.display.set_mode', return_value=pygame.Surface((1400, 800)))
+        self.patcher_set_blocked = patch('pygame.event.set_blocked')
+        self.patcher_set_allowed = patch('pygame.event.set_allowed')
+        # Idle frames wait for input; no input arrives
+        self.patcher_event_wait = patch('pygame.event.wait', return_value=pygame.event.Event(pygame.NOEVENT))
 
         # Use specific mocks for each sound
         self.mock_slash_sound = MagicMock()
@@ -27,6 +37,8 @@ class TestGame(unittest.TestCase):
 
         self.patcher_image_load = patch('pygame.image.load', return_value=self.mock_surface)
         self.patcher_transform_scale = patch('pygame.transform.scale', return_value=self.mock_surface)
+        # Always decode the source images, even if the prebaked asset pack was built in the source tree
+        self.patcher_prebaked = patch('kpo.game.load_prebaked', return_value=None)
 
         # Mock get_ticks to return a consistent value
         self.patcher_get_ticks = patch('pygame.time.get_ticks', return_value=1000)
@@ -37,16 +49,27 @@ class TestGame(unittest.TestCase):
 
         # Start patchers
         self.mock_init = self.patcher_init.start()
+        self.mock_display_init = self.patcher_display_init.start()
+        self.mock_font_init = self.patcher_font_init.start()
         self.mock_mixer_init = self.patcher_mixer_init.start()
         self.mock_set_caption = self.patcher_set_caption.start()
         self.mock_set_mode = self.patcher_set_mode.start()
+        self.mock_set_blocked = self.patcher_set_blocked.start()
+        self.mock_set_allowed = self.patcher_set_allowed.start()
+        self.mock_event_wait = self.patcher_event_wait.start()
         self.mock_font = self.patcher_font.start()
         self.mock_sound = self.patcher_sound.start()
         self.mock_image_load = self.patcher_image_load.start()
         self.mock_transform_scale = self.patcher_transform_scale.start()
+        self.patcher_prebaked.start()
         self.mock_get_ticks = self.patcher_get_ticks.start()
 
-        self.game = Game()
+        self.data_dir = tempfile.TemporaryDirectory()
+        # Do not import the best scores file of the working directory into the data directory
+        self.legacy_path = os.path.join(self.data_dir.name, 'legacy', 'best_scores.json')
+        self.patcher_legacy = patch('kpo.scores.LEGACY_BEST_SCORES_PATH', self.legacy_path)
+        self.patcher_legacy.start()
+        self.game = Game(data_dir=self.data_dir.name)
         self.game.current_resolution = (1400, 800)
         self.game.fruit_speed = -1
         self.game.fruit_types = ['watermelon', 'apple', 'banana']
@@ -66,10 +89,17 @@ class TestGame(unittest.TestCase):
 
     def tearDown(self):
         patch.stopall()
+        self.game.score_writer.close()
+        self.game.file_writer.close()
+        self.game.leaderboard.close()
+        self.data_dir.cleanup()
 
     def test_init(self):
-        self.mock_init.assert_called_once()
-        self.mock_mixer_init.assert_called_once()
+        # Only the subsystems the menu needs are started
+        self.mock_init.assert_not_called()
+        self.mock_display_init.assert_called_once()
+        self.mock_font_init.assert_called_once()
+        self.mock_mixer_init.assert_not_called()
         self.mock_set_caption.assert_called_with("Fruit Ninja")
         self.mock_set_mode.assert_called_with((1400, 800))
 
@@ -83,8 +113,6 @@ class TestGame(unittest.TestCase):
         self.assertIsNone(self.game.end_time)
         self.assertFalse(self.game.game_started)
         self.assertIsNone(self.game.start_ticks)
-        self.assertEqual(self.game.pause_start_ticks, 0)
-        self.assertEqual(self.game.total_pause_duration, 0)
         self.assertEqual(self.game.state, "menu")
 
         game_base_dir = os.path.dirname(os.path.abspath(self.game.__module__.replace('.', os.sep) + '.py'))
@@ -94,6 +122,14 @@ class TestGame(unittest.TestCase):
         self.mock_font.assert_called_with(font_path, 30)
         self.assertEqual(self.game.font, self.mock_font_instance)  # Use the specific mock instance
 
+        # The mixer and the sounds are started with the first game
+        self.mock_sound.assert_not_called()
+        self.assertIsNone(self.game.slash_sound)
+        self.game.start_audio()
+        self.game.start_audio()
+        self.mock_mixer_init.assert_called_once()
+        self.game.apply_loaded_assets()
+
         slash_sound_path = os.path.join(game_base_dir, 'sounds', 'slash.mp3')
         losing_life_sound_path = os.path.join(game_base_dir, 'sounds', 'losing_life.mp3')
         self.mock_sound.assert_any_call(slash_sound_path)
@@ -110,7 +146,7 @@ class TestGame(unittest.TestCase):
         self.assertEqual(self.game.fruit_types, ['watermelon', 'apple', 'banana'])
         self.assertEqual(self.game.fruit_speed, -1)
         self.assertEqual(self.game.speed_increase_interval, 5000)
-        self.assertEqual(self.game.fruits, [])
+        self.assertEqual(len(self.game.fruits), 0)
 
         expected_best_scores = {
             '1': [0, 0],
@@ -159,17 +195,12 @@ class TestGame(unittest.TestCase):
             sound = self.game.load_sound('invalid_path')
             self.assertIsNone(sound)  # Should return None if the sound file is not found
 
-    def test_load_images(self):
-        # Testing load_images method to check if images are loaded and scaled correctly
-        self.game.load_images(self.game.base_dir)
+    def test_load_background(self):
+        # Without the prebaked asset pack, the background is decoded and scaled to the logical resolution
         background_path = os.path.join(self.game.base_dir, 'background', 'background.jpg')
-        welcome_screen_path = os.path.join(self.game.base_dir, 'background', 'WelcomeScreen.jpg')
+        self.assertEqual(self.game.load_background('background', background_path), self.mock_surface)
         self.mock_image_load.assert_any_call(background_path)
-        self.mock_image_load.assert_any_call(welcome_screen_path)
         self.mock_transform_scale.assert_any_call(self.mock_surface, self.game.current_resolution)
-        self.assertEqual(self.game.ig_background_image, self.mock_surface)
-        self.assertEqual(self.game.start_bg_img, self.mock_surface)
-        self.assertEqual(self.game.background_img, self.game.start_bg_img)
 
     def test_load_and_scale_image(self):
         # Testing load_and_scale_image method with a valid path
@@ -217,10 +248,10 @@ class TestGame(unittest.TestCase):
         self.assertEqual(self.game.fruit_speed, -6.05)
         self.assertEqual(self.game.last_speed_increase_time, 6000)
 
-    @patch('random.randint', return_value=0)  # Mock random.randint to always return 0 to spawn a fruit
-    @patch('random.choice', return_value='apple')  # Mock random.choice to always choose 'apple'
-    def test_spawn_random_fruits(self, mock_randint, mock_choice):
-        self.game.fruits = []  # Ensure fruits list is empty before test
+    def test_spawn_random_fruits(self):
+        self.game.fruits.clear()  # Ensure the fruit store is empty before test
+        # Plan an apple for now; the randomly planned spawns all lie in the future
+        self.game.world.spawner.schedule(self.game.world.time, 1, 500)
         self.game.spawn_random_fruits()
 
         self.assertEqual(len(self.game.fruits), 1)
@@ -230,49 +261,126 @@ class TestGame(unittest.TestCase):
         self.assertEqual(fruit.speed, self.game.fruit_speed)
         self.assertEqual(fruit.img_pos, [fruit.x_pos, fruit.y_pos])
 
-    @patch('pygame.display.set_mode', return_value=MagicMock())
+    @patch('pygame.display.set_mode', return_value=pygame.Surface((1920, 1080)))
     def test_update_resolution(self, mock_set_mode):
         # Test update_resolution method
         new_resolution = (1920, 1080)
+        buttons_rects = dict(self.game.buttons_rects)
+        background = self.game.background_img
         self.game.update_resolution(new_resolution)
 
-        self.assertEqual(self.game.current_resolution, new_resolution)
         mock_set_mode.assert_called_with(new_resolution)
         self.assertEqual(self.game.screen, mock_set_mode.return_value)
+        self.assertEqual(self.game.window_resolution, new_resolution)
 
-        mid_x = new_resolution[0] // 2
-        mid_y = new_resolution[1] // 2
-        expected_buttons_rects = {
-            'restart_button_rect': pygame.Rect(mid_x - 100, mid_y + 100, 200, 50),
-            'start_button_rect': pygame.Rect(mid_x - 100, mid_y, 200, 50),
-            'settings_button_rect': pygame.Rect(mid_x - 100, mid_y + 100, 200, 50),
-            'quit_button_rect': pygame.Rect(mid_x - 100, mid_y + 200, 200, 50),
-            'back_button_rect': pygame.Rect(mid_x - 100, new_resolution[1] - 100, 300, 50)
-        }
-        self.assertEqual(self.game.buttons_rects, expected_buttons_rects)
+        # The game keeps its logical resolution: nothing is laid out or loaded again
+        self.assertEqual(self.game.current_resolution, (1400, 800))
+        self.assertEqual(self.game.buttons_rects, buttons_rects)
+        self.assertIs(self.game.background_img, background)
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('json.dump')
-    def test_save_new_best_scores(self, mock_json_dump, mock_open):
+        # Frames are scaled into the largest 7:4 area of the window, and the pointer is mapped back
+        self.assertEqual(self.game.renderer.viewport, pygame.Rect(15, 0, 1890, 1080))
+        self.assertEqual(self.game.renderer.canvas.get_size(), (1400, 800))
+        self.assertEqual(self.game.renderer.map_pointer((15 + 945, 540)), (700, 400))
+
+    def test_save_new_best_scores(self):
         # Test save_new_best_scores method
+        self.assertEqual(self.game.best_scores_path, os.path.join(self.data_dir.name, 'best_scores.json'))
         self.game.save_new_best_scores()
-        mock_open.assert_called_with('best_scores.json', 'w')
-        mock_json_dump.assert_called_with(self.game.best_scores, mock_open(), indent=4)
+        self.assertTrue(self.game.score_writer.flush(timeout=5))
+        with open(self.game.best_scores_path) as file:
+            self.assertEqual(json.load(file), self.game.best_scores)
+
+    def test_advance_world_uses_elapsed_time(self):
+        self.game.world.speed_increase_interval = 10 ** 9
+        self.assertEqual(self.game.advance_world(TICK_MS / 2, [(10, 10)], []), 0)
+        self.assertAlmostEqual(self.game.interpolation, 0.5)
+        self.assertEqual(self.game.pending_pointer, [(10, 10)])
+
+        # Half a tick is left over from the previous frame
+        self.assertEqual(self.game.advance_world(2.5 * TICK_MS, [(10, 10), (20, 20)], []), 3)
+        self.assertAlmostEqual(self.game.world.time, 1000 + 3 * TICK_MS)
+        self.assertEqual(self.game.pending_pointer, [(20, 20)])
+        self.assertEqual(self.game.recorder.ticks, 3)
+
+        # A stall is not caught up on: 250 ms plus the half tick left over make 15 ticks
+        self.assertEqual(self.game.advance_world(5000, [], []), 15)
+
+    def test_initial_quality_is_applied(self):
+        # The renderer scales with the filter of the level the pacer starts at, without a level change
+        self.assertEqual(self.game.pacer.level, 0)
+        self.assertTrue(self.game.pacer.quality['smooth_scale'])
+        self.assertIs(self.game.renderer.smooth, self.game.pacer.quality['smooth_scale'])
+        self.assertEqual(self.game.world.max_fruits, self.game.pacer.quality['max_fruits'])
+
+        # A replaced renderer takes over the filter of the current level
+        self.game.pacer.level = 3
+        self.game.apply_quality()
+        self.game.renderer = RecordingRenderer(pygame.Surface(self.game.current_resolution))
+        self.assertIs(self.game.renderer.smooth, self.game.pacer.quality['smooth_scale'])
+        self.assertFalse(self.game.renderer.smooth)
+
+    def test_run_time_is_simulated_time(self):
+        self.game.world.speed_increase_interval = 10 ** 9
+        self.game.world.lives = 10 ** 6
+        # A stall of five seconds only simulates the 250 ms the world catches up on
+        with patch('kpo.spawn.SpawnScheduler.due', return_value=[]):
+            ticks = self.game.advance_world(5000, [], [])
+        self.assertEqual(ticks, 15)
+
+        with patch.object(self.game, 'display_number') as mock_display_number:
+            self.game.display_timer()
+        self.assertEqual(mock_display_number.call_args[0][1], f'{15 * TICK_MS / 1000:.2f}')
+
+        self.game.wait_for_assets('leaderboard')
+        self.game.end_game()
+        self.assertAlmostEqual(self.game.end_time, 15 * TICK_MS / 1000)
+
+    def test_quality_levels(self):
+        self.game.pacer.level = 3
+        self.game.apply_quality()
+        self.assertEqual(self.game.world.max_fruits, 12)
+
+        # The blink keeps its timing but is not drawn
+        self.game.blink_active = True
+        self.game.blink_start_time = 1000
+        with patch.object(self.game.renderer, 'blit') as mock_blit:
+            self.game.activate_blink_if_lost_life(1100)
+        mock_blit.assert_not_called()
+        self.assertTrue(self.game.blink_active)
+
+        path = self.game.export_quality_report()
+        self.assertEqual(path, os.path.join(self.data_dir.name, 'quality.json'))
+
+    def test_display_fruits_interpolates(self):
+        self.game.fruits.clear()
+        self.game.fruits.add(0, 100, 400, -1)
+        self.game.fruit_speed = -4
+        with patch.object(self.game.renderer, 'blits') as mock_blits:
+            self.game.display_fruits(0.25)
+        self.assertEqual(mock_blits.call_args[0][0][0][1], (100, 403))
+
+    def test_display_fruits_batches_by_type(self):
+        self.game.fruits.clear()
+        for kind, x_pos in ((2, 10), (0, 20), (2, 30), (1, 40), (0, 50)):
+            self.game.fruits.add(kind, x_pos, 300, -1)
+        with patch.object(self.game.renderer, 'blits') as mock_blits:
+            self.game.display_fruits()
+
+        mock_blits.assert_called_once()
+        positions = [pos for _, pos in mock_blits.call_args[0][0]]
+        self.assertEqual(positions, [(20, 300), (50, 300), (40, 300), (10, 300), (30, 300)])
 
     def test_update_best_scores(self):
-        # Set up a realistic starting best_scores for testing
-        self.game.best_scores = {
-            '1': [300, 50.0],
-            '2': [250, 55.0],
-            '3': [200, 60.0],
-            '4': [150, 65.0],
-            '5': [100, 70.0]
-        }
+        # Set up a realistic starting leaderboard for testing
+        self.game.leaderboard.extend([('player', 300, 50.0), ('player', 250, 55.0), ('player', 200, 60.0),
+                                      ('player', 150, 65.0), ('player', 100, 70.0), ('player', 50, 75.0)])
         # Set score and time to test best scores update
         self.game.score = 350
         self.game.end_time = 45.0
         # Test update_best_scores method
-        self.game.update_best_scores()
+        self.assertTrue(self.game.update_best_scores())
+        self.assertEqual(self.game.record_scr_id, '1')
 
         expected_best_scores = {
             '1': [350, 45.0],  # New high score
@@ -283,6 +391,173 @@ class TestGame(unittest.TestCase):
         }
         self.assertEqual(self.game.best_scores, expected_best_scores)
 
+        # A run below the best scores is still stored in the leaderboard
+        self.game.score = 60
+        self.assertFalse(self.game.update_best_scores())
+        self.assertEqual(self.game.best_scores, expected_best_scores)
+        self.assertEqual(len(self.game.leaderboard), 8)
+        self.assertEqual(self.game.leaderboard.rank(60, 45.0), 8)
+
+    def test_leaderboard_imports_best_scores_file(self):
+        with open(self.game.best_scores_path, 'w') as file:
+            json.dump({'1': [120, 30.0], '2': [80, 20.0], '3': [0, 0], '4': [0, 0], '5': [0, 0]}, file)
+        self.game.leaderboard.close()
+        os.remove(self.game.leaderboard_path)
+
+        self.game.leaderboard = self.game.open_leaderboard()
+        self.assertEqual(len(self.game.leaderboard), 2)
+        self.assertEqual(self.game.leaderboard_scores(), {
+            '1': [120, 30.0], '2': [80, 20.0], '3': [0, 0], '4': [0, 0], '5': [0, 0]})
+
+    def test_runs_without_points_are_not_best_scores(self):
+        self.game.wait_for_assets('leaderboard')
+        self.game.score = 0
+        self.game.end_time = 11.4
+        self.assertFalse(self.game.update_best_scores())
+        self.game.score = 7
+        self.game.end_time = 20.0
+        self.assertTrue(self.game.update_best_scores())
+
+        # After a restart, the run without points is still not shown
+        self.game.leaderboard.close()
+        self.game.leaderboard = self.game.open_leaderboard()
+        self.assertEqual(len(self.game.leaderboard), 2)
+        self.assertEqual(self.game.leaderboard_scores(), {
+            '1': [7, 20.0], '2': [0, 0], '3': [0, 0], '4': [0, 0], '5': [0, 0]})
+
+    def test_first_launch_creates_data_dir(self):
+        for background_loading in (False, True):
+            with self.subTest(background_loading=background_loading):
+                data_dir = os.path.join(self.data_dir.name, 'first-launch', str(background_loading), 'kpo')
+                game = Game(background_loading=background_loading, data_dir=data_dir)
+                game.wait_for_assets('leaderboard')
+                self.assertTrue(os.path.isfile(game.leaderboard_path))
+                self.assertEqual(game.leaderboard_scores(), self.game.leaderboard_scores())
+                game.score_writer.close()
+                game.file_writer.close()
+                game.leaderboard.close()
+                game.loader.shutdown()
+
+    def test_first_run_imports_legacy_best_scores(self):
+        legacy_scores = {'1': [120, 30.0], '2': [80, 20.0], '3': [0, 0], '4': [0, 0], '5': [0, 0]}
+        os.makedirs(os.path.dirname(self.legacy_path))
+        with open(self.legacy_path, 'w') as file:
+            json.dump(legacy_scores, file)
+        self.game.leaderboard.close()
+        os.remove(self.game.best_scores_path)
+        os.remove(self.game.leaderboard_path)
+
+        # The data directory is empty, so the scores of the working directory are carried over
+        self.assertEqual(self.game.read_best_scores(), legacy_scores)
+        with open(self.game.best_scores_path) as file:
+            self.assertEqual(json.load(file), legacy_scores)
+        self.game.leaderboard = self.game.open_leaderboard()
+        self.assertEqual(self.game.leaderboard_scores(), legacy_scores)
+
+        # Once the data directory has its own scores, the legacy file is ignored
+        with open(self.legacy_path, 'w') as file:
+            json.dump({'1': [999, 1.0]}, file)
+        self.assertEqual(self.game.read_best_scores(), legacy_scores)
+
+    @patch('pygame.display.flip')
+    @patch('pygame.draw.circle')
+    @patch('pygame.draw.rect')
+    @patch('pygame.event.get', return_value=[])
+    @patch('pygame.mouse.get_pos', return_value=(0, 0))
+    @patch('pygame.mouse.set_visible')
+    def test_run_game_frame_limit(self, mock_set_visible, mock_get_pos, mock_event_get, mock_draw_rect,
+                                  mock_draw_circle, mock_flip):
+        self.game.renderer.screen = pygame.Surface(self.game.current_resolution)
+        self.game.background_img = pygame.Surface(self.game.current_resolution)
+        self.mock_font_instance.render.return_value = pygame.Surface((10, 10))
+
+        # The menu is drawn for the given number of frames, then the loop returns. Its buttons are
+        # drawn once, onto the cached screen
+        self.game.run_game(max_frames=3)
+        self.assertEqual(mock_flip.call_count, 3)
+        self.assertEqual(mock_draw_rect.call_count, 3)
+        self.assertEqual(self.game.profiler.frames, 3)
+        # Nothing is simulated in the menu, so every frame after the first one waits for input
+        # instead of polling; the first frame is presented without waiting
+        self.assertEqual(self.mock_event_wait.call_count, 2)
+        self.mock_event_wait.assert_called_with(250)
+        self.assertEqual(self.game.pacer.idle_frames, 2)
+        phases = [phase for phase, _ in self.game.startup.phases if phase != 'interpreter']
+        self.assertEqual(phases, ['imports', 'pygame init', 'window', 'game setup', 'menu assets', 'first frame'])
+
+        # The clock stands still, so only the time already in the accumulator is simulated
+        self.game.state = "game"
+        self.game.start_ticks = 0
+        self.game.accumulator = 2.5 * TICK_MS
+        with patch('kpo.spawn.SpawnScheduler.due', return_value=[]):
+            self.game.run_game(max_frames=2)
+        self.assertEqual(mock_flip.call_count, 5)
+        self.assertEqual(self.mock_event_wait.call_count, 2)
+        self.assertEqual(self.game.pacer.idle_frames, 2)
+        self.assertAlmostEqual(self.game.world.time, 1000 + 2 * TICK_MS)
+        self.assertAlmostEqual(self.game.interpolation, 0.5)
+        self.assertEqual(self.game.recorder.ticks, 2)
+        self.assertEqual(self.game.recorder.seed, self.game.world.seed)
+
+        # The recording is written in the background
+        path = self.game.save_recording()
+        self.assertEqual(os.path.dirname(path), os.path.join(self.data_dir.name, 'replays'))
+        self.assertTrue(self.game.file_writer.flush(timeout=5))
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(), self.game.recorder.to_bytes())
+
+        # Another session ending in the same second with the same score gets its own file
+        with patch('time.strftime', return_value='20260101-120000'):
+            first_path = self.game.save_recording()
+            self.game.recorder.seed += 1
+            self.assertNotEqual(self.game.save_recording(), first_path)
+
+    @patch('pygame.event.get', return_value=[])
+    @patch('pygame.mouse.get_pos', return_value=(0, 0))
+    @patch('pygame.mouse.set_visible')
+    def test_run_game_recording_backend(self, mock_set_visible, mock_get_pos, mock_event_get):
+        self.game.renderer = RecordingRenderer(pygame.Surface(self.game.current_resolution))
+        self.game.background_img = pygame.Surface(self.game.current_resolution)
+        self.mock_font_instance.render.return_value = pygame.Surface((10, 10))
+
+        # The first menu frame draws the buttons, later ones only the cached screen and the cursor.
+        # A change in these counts is a rendering regression
+        self.game.run_game(max_frames=3)
+        history = list(self.game.renderer.history)
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history[0]['kinds'], {'clear': 1, 'blit': 3, 'circle': 1})
+        self.assertEqual(history[1], history[2])
+        self.assertEqual(history[2]['kinds'], {'clear': 1, 'circle': 1})
+
+        # Hovering a button redraws only that button
+        mock_get_pos.return_value = self.game.buttons_rects['start_button_rect'].center
+        self.game.run_game(max_frames=2)
+        self.assertEqual(self.game.renderer.history[-2]['kinds'], {'clear': 1, 'blit': 1, 'circle': 1})
+        self.assertEqual(self.game.renderer.history[-1]['kinds'], {'clear': 1, 'circle': 1})
+
+    def test_static_screens_are_cached(self):
+        self.game.background_img = pygame.Surface(self.game.current_resolution)
+        self.mock_font_instance.render.return_value = pygame.Surface((10, 10))
+        menu = self.game.static_screen()
+        self.assertIs(self.game.static_screen(), menu)
+
+        self.game.state = "game"
+        self.assertIsNone(self.game.static_screen())
+
+        # A finished game composes its screen again with the new score
+        self.game.game_over = True
+        self.game.end_time = 10.0
+        self.game.score = 5
+        game_over = self.game.static_screen()
+        self.assertIs(self.game.static_screen(), game_over)
+        self.game.end_game()
+        self.assertIsNot(self.game.static_screen(), game_over)
+
+        # New backgrounds, e.g. after a resolution change, compose new screens
+        self.game.state = "menu"
+        self.game.background_img = pygame.Surface(self.game.current_resolution)
+        self.assertIsNot(self.game.static_screen(), menu)
+
 def main():
     unittest.main()
 
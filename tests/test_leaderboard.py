@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from kpo.leaderboard import Leaderboard
+
+
+class TestLeaderboard(unittest.TestCase):
+
+    def setUp(self):
+        self.leaderboard = Leaderboard(cache_size=3)
+
+    def tearDown(self):
+        self.leaderboard.close()
+
+    def test_add_returns_rank(self):
+        self.assertEqual(self.leaderboard.add(100, 30.0), 1)
+        self.assertEqual(self.leaderboard.add(200, 40.0), 1)
+        self.assertEqual(self.leaderboard.add(100, 20.0), 2)
+        # A tie ranks after the earlier run
+        self.assertEqual(self.leaderboard.add(100, 20.0, 'other'), 3)
+
+        self.assertEqual(self.leaderboard.top(3), [('player', 200, 40.0), ('player', 100, 20.0),
+                                                   ('other', 100, 20.0)])
+        self.assertEqual(len(self.leaderboard), 4)
+
+    def test_rank_outside_cache_queries_index(self):
+        self.leaderboard.extend(('player', score, 10.0) for score in range(100))
+
+        with patch.object(self.leaderboard, 'connection', wraps=self.leaderboard.connection) as connection:
+            self.assertEqual(self.leaderboard.rank(98, 5.0), 2)
+            connection.execute.assert_not_called()
+            self.assertEqual(self.leaderboard.rank(50, 10.0), 51)
+            self.assertEqual(self.leaderboard.rank(50, 9.0), 50)
+            self.assertEqual(self.leaderboard.rank(-1, 0.0), 101)
+
+    def test_add_below_cache(self):
+        self.leaderboard.extend(('player', score, 10.0) for score in (30, 20, 10))
+
+        self.assertIsNone(self.leaderboard.add(5, 1.0))
+        self.assertEqual(self.leaderboard.rank(5, 1.0), 5)
+        self.assertEqual(self.leaderboard.add(15, 1.0), 3)
+        self.assertEqual(len(self.leaderboard), 5)
+
+    def test_top_beyond_cache(self):
+        self.leaderboard.extend(('player', score, float(score)) for score in (5, 1, 4, 2, 3))
+
+        self.assertEqual([score for _, score, _ in self.leaderboard.top(2)], [5, 4])
+        self.assertEqual([score for _, score, _ in self.leaderboard.top(10)], [5, 4, 3, 2, 1])
+
+    def test_runs_persist(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'leaderboard.sqlite3')
+            leaderboard = Leaderboard(path)
+            leaderboard.add(10, 1.0)
+            leaderboard.add(20, 2.0)
+            leaderboard.close()
+
+            leaderboard = Leaderboard(path)
+            self.assertEqual(leaderboard.top(5), [('player', 20, 2.0), ('player', 10, 1.0)])
+            leaderboard.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
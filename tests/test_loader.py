@@ -0,0 +1,39 @@
+import threading
+import unittest
+
+from kpo.loader import AssetLoader
+
+
+class TestAssetLoader(unittest.TestCase):
+
+    def test_synchronous_loading(self):
+        loader = AssetLoader(background=False)
+        loader.submit('answer', lambda: 42)
+
+        self.assertTrue(loader.ready('answer'))
+        self.assertEqual(loader.finished(), [('answer', 42)])
+        self.assertEqual(loader.finished(), [])
+        self.assertIn('answer', loader.timings)
+
+    def test_background_loading(self):
+        loader = AssetLoader(background=True, workers=2)
+        release = threading.Event()
+        loader.submit('fast', lambda: 'fast')
+        loader.submit('slow', lambda: release.wait(5) and 'slow')
+
+        loader.wait('fast')
+        self.assertTrue(loader.ready('fast'))
+        self.assertFalse(loader.ready('slow'))
+        self.assertEqual(loader.progress, 0.5)
+        self.assertEqual(loader.finished(), [('fast', 'fast')])
+
+        release.set()
+        loader.wait()
+        self.assertEqual(loader.finished(), [('slow', 'slow')])
+        self.assertEqual(loader.progress, 1)
+        self.assertEqual(sorted(loader.timings), ['fast', 'slow'])
+        loader.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
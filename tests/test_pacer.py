@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pygame
+
+from kpo.pacer import QUALITY_LEVELS, FramePacer
+
+
+class TestFramePacer(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = MagicMock()
+        self.pacer = FramePacer(self.clock, window=4, hold=6)
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def run_frames(self, count, work_ms, max_fps=60):
+        changes = []
+        with patch('time.perf_counter', side_effect=self.perf_counter):
+            self.pacer._frame_start = self.now
+            for _ in range(count):
+                self.now += work_ms / 1000
+                if self.pacer.tick(max_fps):
+                    changes.append(self.pacer.frames)
+        return changes
+
+    def test_steps_down_when_over_budget(self):
+        changes = self.run_frames(20, work_ms=25)
+        self.assertEqual(changes, [6, 12, 18])
+        self.assertEqual(self.pacer.quality, QUALITY_LEVELS[3])
+        self.assertEqual([decision['level'] for decision in self.pacer.decisions],
+                         ['no-blink', 'few-particles', 'capped-fruits'])
+        self.clock.tick.assert_called_with(60)
+
+    def test_steps_up_with_headroom(self):
+        self.run_frames(6, work_ms=25)
+        self.assertEqual(self.pacer.level, 1)
+
+        # Inside the budget but without enough headroom: hold the level
+        self.assertEqual(self.run_frames(10, work_ms=14), [])
+        # The window must fill with fast frames first
+        self.assertEqual(self.run_frames(10, work_ms=5), [20])
+        self.assertEqual(self.pacer.level, 0)
+        self.assertEqual(self.pacer.decisions[-1]['reason'], 'headroom')
+
+    def test_uncapped_frames_use_target_budget(self):
+        self.run_frames(6, work_ms=20, max_fps=0)
+        self.assertEqual(self.pacer.level, 1)
+        self.assertAlmostEqual(self.pacer.decisions[0]['budget_ms'], 16.667)
+
+    def test_fixed_quality_and_busy_loop(self):
+        self.pacer.adaptive = False
+        self.pacer.busy_loop = True
+        self.assertEqual(self.run_frames(20, work_ms=25), [])
+        self.assertEqual(self.pacer.level, 0)
+        self.clock.tick_busy_loop.assert_called_with(60)
+        self.clock.tick.assert_not_called()
+
+    @patch('pygame.event.get', return_value=[])
+    @patch('pygame.event.wait')
+    def test_idle_frames_are_not_adapted(self, mock_wait, mock_get):
+        mock_wait.return_value = MagicMock(type=pygame.MOUSEMOTION)
+        with patch('time.perf_counter', side_effect=self.perf_counter):
+            self.pacer._frame_start = self.now
+            for _ in range(10):
+                self.assertEqual(len(self.pacer.wait_events(250)), 1)
+                self.now += 0.25
+                self.assertFalse(self.pacer.tick(60))
+
+        mock_wait.assert_called_with(250)
+        self.assertEqual(self.pacer.idle_frames, 10)
+        self.assertAlmostEqual(self.pacer.idle_time, 2.5)
+        self.assertEqual(len(self.pacer.work_times), 0)
+        self.assertEqual(self.pacer.level, 0)
+        self.assertLess(self.pacer.idle_cpu, 1.0)
+
+        # The next polling frame is a busy frame again
+        self.run_frames(6, work_ms=25)
+        self.assertEqual(self.pacer.idle_frames, 10)
+        self.assertEqual(self.pacer.level, 1)
+
+    def test_export(self):
+        self.run_frames(8, work_ms=25)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'quality.json')
+            self.pacer.export(path)
+            with open(path) as file:
+                report = json.load(file)
+
+        self.assertEqual(report['frames'], 8)
+        self.assertEqual(report['frames_per_level'], {'full': 6, 'no-blink': 2, 'few-particles': 0,
+                                                      'capped-fruits': 0})
+        self.assertEqual(len(report['decisions']), 1)
+        self.assertIn('platform', report['machine'])
+        self.assertEqual(report['idle'], {'frames': 0, 'seconds': 0.0, 'cpu_seconds': 0.0, 'cpu_share': None})
+
+
+if __name__ == '__main__':
+    unittest.main()
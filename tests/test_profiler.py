@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from kpo.profiler import FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = FrameProfiler(phases=('update', 'draw'), capacity=4)
+        self.clock = 0.0
+
+    def perf_counter(self):
+        return self.clock
+
+    def record_frame(self, update_ms, draw_ms):
+        with patch('time.perf_counter', side_effect=self.perf_counter):
+            self.profiler.begin_frame()
+            self.clock += update_ms / 1000
+            self.profiler.mark('update')
+            self.clock += draw_ms / 1000
+            self.profiler.mark('draw')
+
+    def test_percentiles(self):
+        for update_ms in (1, 2, 3, 4):
+            self.record_frame(update_ms, 10)
+        stats = self.profiler.percentiles((50, 100))
+
+        self.assertAlmostEqual(stats['update'][0], 2.5)
+        self.assertAlmostEqual(stats['update'][1], 4)
+        self.assertAlmostEqual(stats['draw'][0], 10)
+        self.assertAlmostEqual(stats['frame'][1], 14)
+
+    def test_ring_buffer_keeps_last_frames(self):
+        for update_ms in range(1, 7):
+            self.record_frame(update_ms, 0)
+
+        self.assertEqual(self.profiler.frames, 6)
+        self.assertEqual(len(self.profiler), 4)
+        self.assertAlmostEqual(self.profiler.percentiles((0,))['update'][0], 3)
+
+    def test_disabled_profiler_records_nothing(self):
+        self.profiler.enabled = False
+        self.record_frame(1, 1)
+        self.assertEqual(len(self.profiler), 0)
+        self.assertEqual(self.profiler.percentiles(), {})
+
+    def test_exports(self):
+        for update_ms in range(1, 7):
+            self.record_frame(update_ms, 2)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'profile.csv')
+            trace_path = os.path.join(tmp_dir, 'profile.json')
+            self.profiler.export_csv(csv_path)
+            self.profiler.export_chrome_trace(trace_path)
+
+            with open(csv_path) as file:
+                lines = file.read().splitlines()
+            with open(trace_path) as file:
+                trace = json.load(file)
+
+        self.assertEqual(lines[0], 'frame,update,draw')
+        self.assertEqual(lines[1], '2,3.0000,2.0000')
+        self.assertEqual(len(lines), 5)
+        events = trace['traceEvents']
+        self.assertEqual(len(events), 12)
+        self.assertEqual(events[0]['name'], 'frame')
+        self.assertEqual(events[0]['ts'], 0)
+        self.assertAlmostEqual(events[2]['ts'], 3000)
+
+
+if __name__ == '__main__':
+    unittest.main()
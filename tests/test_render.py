@@ -0,0 +1,163 @@
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from kpo.render import RENDERERS, NullRenderer, RecordingRenderer, Renderer
+
+
+class TestRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = pygame.Surface((400, 300))
+        self.background = pygame.Surface((400, 300))
+        self.sprite = pygame.Surface((20, 20))
+        self.renderer = Renderer(self.screen, dirty_rects=True)
+
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_first_frame_is_full(self, mock_flip, mock_update):
+        self.renderer.clear(self.background)
+        self.renderer.blit(self.sprite, (10, 10))
+        self.renderer.present()
+
+        mock_flip.assert_called_once()
+        mock_update.assert_not_called()
+
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_only_dirty_rects_are_updated(self, mock_flip, mock_update):
+        self.renderer.clear(self.background)
+        self.renderer.present()
+
+        self.renderer.clear(self.background)
+        self.renderer.blit(self.sprite, (10, 10))
+        self.renderer.present()
+        mock_update.assert_called_with([pygame.Rect(10, 10, 20, 20)])
+
+        # The area of the previous frame is restored and updated too
+        self.renderer.clear(self.background)
+        self.renderer.draw_circle((255, 0, 0), (100, 100), 5)
+        self.renderer.present()
+        mock_update.assert_called_with([pygame.Rect(10, 10, 20, 20), pygame.Rect(95, 95, 10, 10)])
+        self.assertEqual(mock_flip.call_count, 1)
+
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_blits_records_dirty_rects(self, mock_flip, mock_update):
+        self.renderer.clear(self.background)
+        self.renderer.present()
+
+        self.renderer.clear(self.background)
+        rects = self.renderer.blits([(self.sprite, (10, 10)), (self.sprite, (50, 60))])
+        self.renderer.present()
+        self.assertEqual(rects, [pygame.Rect(10, 10, 20, 20), pygame.Rect(50, 60, 20, 20)])
+        mock_update.assert_called_with(rects)
+
+        full = Renderer(self.screen)
+        self.assertIsNone(full.blits([(self.sprite, (10, 10))]))
+        self.assertEqual(full.current_rects, [])
+
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_large_dirty_area_flips(self, mock_flip, mock_update):
+        self.renderer.clear(self.background)
+        self.renderer.present()
+
+        self.renderer.clear(self.background)
+        self.renderer.blit(pygame.Surface((400, 300)), (0, 0))
+        self.renderer.present()
+
+        self.assertEqual(mock_flip.call_count, 2)
+        mock_update.assert_not_called()
+
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_full_mode_always_flips(self, mock_flip, mock_update):
+        renderer = Renderer(self.screen)
+        for _ in range(3):
+            renderer.clear(self.background)
+            renderer.blit(self.sprite, (10, 10))
+            renderer.present()
+
+        self.assertEqual(mock_flip.call_count, 3)
+        mock_update.assert_not_called()
+        self.assertEqual(renderer.current_rects, [])
+
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_scales_logical_screen_to_window(self, mock_flip, mock_update):
+        window = pygame.Surface((800, 500))
+        renderer = Renderer(window, dirty_rects=True, size=(400, 200))
+        self.assertEqual(renderer.viewport, pygame.Rect(0, 50, 800, 400))
+        self.assertEqual(renderer.canvas.get_size(), (400, 200))
+        self.assertEqual(renderer.map_pointer((400, 250)), (200, 100))
+
+        for smooth in (False, True):
+            renderer.smooth = smooth
+            renderer.clear(pygame.Surface((400, 200)))
+            renderer.draw_rect((255, 0, 0), (0, 0, 10, 10))
+            renderer.present()
+            self.assertEqual(window.get_at((10, 60)), (255, 0, 0, 255))
+            self.assertEqual(window.get_at((19, 10)), (0, 0, 0, 255))
+
+        # A scaled frame is always flipped whole
+        self.assertEqual(mock_flip.call_count, 2)
+        mock_update.assert_not_called()
+
+        # The canvas is kept when the window changes
+        canvas = renderer.canvas
+        renderer.screen = pygame.Surface((400, 200))
+        self.assertIsNone(renderer.viewport)
+        self.assertIs(renderer.canvas, renderer.screen)
+        renderer.screen = window
+        self.assertIs(renderer.canvas, canvas)
+
+
+class TestRenderBackends(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = pygame.Surface((400, 300))
+        self.sprite = pygame.Surface((20, 20))
+
+    @patch('pygame.display.flip')
+    def test_null_renderer_draws_nothing(self, mock_flip):
+        renderer = NullRenderer(self.screen)
+        self.assertEqual(renderer.blit(self.sprite, (390, 10)), pygame.Rect(390, 10, 10, 20))
+        self.assertEqual(renderer.draw_rect((255, 0, 0), (0, 0, 50, 50)), pygame.Rect(0, 0, 50, 50))
+        renderer.fill((255, 255, 255))
+        renderer.present()
+
+        self.assertEqual(self.screen.get_at((0, 0)), (0, 0, 0, 255))
+        mock_flip.assert_not_called()
+
+    def test_recording_renderer_counts_frames(self):
+        renderer = RENDERERS['recording'](self.screen, capacity=2)
+        self.assertIsNone(renderer.last_frame)
+        for count in range(3):
+            renderer.clear(None)
+            renderer.blits([(self.sprite, (10, 10))] * count)
+            renderer.draw_circle((0, 0, 0), (0, 0), 5)
+            renderer.present()
+
+        self.assertEqual(renderer.frames, 3)
+        self.assertEqual(len(renderer.history), 2)
+        self.assertEqual(renderer.last_frame, {
+            'calls': 4, 'pixels': 400 * 300 + 2 * 400 + 25, 'kinds': {'clear': 1, 'blit': 2, 'circle': 1}})
+
+    def test_recording_renderer_counts_clipped_overdraw(self):
+        renderer = RecordingRenderer(self.screen)
+        self.assertIs(RENDERERS['recording'], RecordingRenderer)
+        # Overlapping draws are counted every time, draws past the edge only with their visible part
+        renderer.blit(self.sprite, (0, 0))
+        renderer.blit(self.sprite, (10, 10))
+        renderer.draw_rect((255, 0, 0), (390, 290, 20, 20))
+        renderer.present()
+
+        self.assertEqual(renderer.last_frame, {'calls': 3, 'pixels': 2 * 400 + 100, 'kinds': {'blit': 2, 'rect': 1}})
+        self.assertEqual(renderer.history.maxlen, 600)
+        self.assertEqual(self.screen.get_at((5, 5)), (0, 0, 0, 255))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from kpo.replay import InputRecorder, Recording, read_varint, replay, write_varint
+from kpo.sim import TICK_MS, World
+
+
+class TestReplay(unittest.TestCase):
+
+    def play_session(self, seed, max_ticks=20000):
+        # Sweep the pointer across the lower half of the screen so the session scores
+        world = World((1400, 800), seed=seed)
+        recorder = InputRecorder(world.seed, world.resolution, world.fruit_types, world.time)
+        tick = 0
+        while not world.over and tick < max_ticks:
+            x = (tick * 97) % 1400
+            pointer_path = [(x, 500), (x + 40, 700)] if tick % 3 else []
+            # Cap the fruits for a while, like a slow machine would
+            world.max_fruits = 2 if 600 <= tick < 1200 else None
+            recorder.record(pointer_path, [112] if tick == 10 else [], world.max_fruits)
+            world.step(TICK_MS, pointer_path)
+            tick += 1
+        return world, recorder
+
+    def test_varint_round_trip(self):
+        values = [0, 1, -1, 63, -64, 64, 300, -300, 2 ** 31, -2 ** 31]
+        buffer = bytearray()
+        for value in values:
+            write_varint(buffer, value)
+
+        offset = 0
+        decoded = []
+        for _ in values:
+            value, offset = read_varint(buffer, offset)
+            decoded.append(value)
+        self.assertEqual(decoded, values)
+        self.assertEqual(offset, len(buffer))
+
+    def test_recording_round_trip(self):
+        recorder = InputRecorder(7, (1280, 720), ['apple', 'banana'], 1000)
+        recorder.record([(10, 20), (12, 25)], [112])
+        recorder.record([], [])
+        recorder.record([(5, 5)], [], max_fruits=4)
+
+        recording = Recording(recorder.to_bytes())
+        self.assertEqual(recording.seed, 7)
+        self.assertEqual(recording.resolution, (1280, 720))
+        self.assertEqual(recording.fruit_types, ['apple', 'banana'])
+        self.assertEqual(recording.start_time, 1000)
+        self.assertEqual(list(recording), [([(10, 20), (12, 25)], [112], None), ([], [], None), ([(5, 5)], [], 4)])
+
+    def test_replay_reproduces_session(self):
+        world, recorder = self.play_session(seed=1234)
+        self.assertTrue(world.over)
+        self.assertGreater(world.score, 0)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'replays', 'session.kpor')
+            recorder.save(path)
+            recording = Recording.load(path)
+            # Three bytes per tick without input, a few more for every pointer segment
+            self.assertLess(os.path.getsize(path), recorder.ticks * 9)
+
+        replayed = replay(recording)
+        self.assertEqual(replayed.score, world.score)
+        self.assertEqual(replayed.lives, world.lives)
+        self.assertAlmostEqual(replayed.time, world.time)
+
+    def test_same_seed_same_session(self):
+        first, _ = self.play_session(seed=99, max_ticks=2000)
+        second, _ = self.play_session(seed=99, max_ticks=2000)
+        self.assertEqual((first.score, first.lives), (second.score, second.lives))
+        self.assertEqual(first.fruits.x[:len(first.fruits)].tolist(), second.fruits.x[:len(second.fruits)].tolist())
+
+    def test_invalid_recording(self):
+        with self.assertRaises(ValueError):
+            Recording(b'KPOR')
+        with self.assertRaises(ValueError):
+            Recording(b'JUNK' + bytes(64))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from kpo import scores
+from kpo.scores import FileWriter, ScoreWriter, default_data_dir, read_legacy_scores, write_json_atomic
+
+
+class TestScores(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'data', 'best_scores.json')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read(self):
+        with open(self.path) as file:
+            return json.load(file)
+
+    def test_default_data_dir(self):
+        with patch.dict(os.environ, {'KPO_DATA_DIR': '/tmp/kpo-data'}):
+            self.assertEqual(default_data_dir(), '/tmp/kpo-data')
+        with patch.dict(os.environ, {'KPO_DATA_DIR': ''}):
+            self.assertEqual(default_data_dir(), os.path.join(os.path.expanduser('~'), '.kpo'))
+
+    def test_read_legacy_scores(self):
+        legacy_path = os.path.join(self.tmp_dir.name, 'best_scores.json')
+        self.assertIsNone(read_legacy_scores(self.path, legacy_path))
+
+        write_json_atomic(legacy_path, {'1': [10, 1.0]})
+        self.assertEqual(read_legacy_scores(self.path, legacy_path), {'1': [10, 1.0]})
+        # The scores file of the data directory is not its own legacy file
+        self.assertIsNone(read_legacy_scores(legacy_path, legacy_path))
+
+        with open(legacy_path, 'w') as file:
+            file.write('{"1": [10,')
+        self.assertIsNone(read_legacy_scores(self.path, legacy_path))
+
+    def test_write_json_atomic(self):
+        write_json_atomic(self.path, {'1': [10, 1.0]})
+        write_json_atomic(self.path, {'1': [20, 2.0]})
+
+        self.assertEqual(self.read(), {'1': [20, 2.0]})
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['best_scores.json'])
+
+    def test_failed_write_keeps_old_file(self):
+        write_json_atomic(self.path, {'1': [10, 1.0]})
+        with patch('os.replace', side_effect=OSError):
+            with self.assertRaises(OSError):
+                write_json_atomic(self.path, {'1': [20, 2.0]})
+
+        self.assertEqual(self.read(), {'1': [10, 1.0]})
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['best_scores.json'])
+
+    def test_writer_coalesces_pending_saves(self):
+        writer = ScoreWriter(self.path)
+        release = threading.Event()
+        write = scores.write_json_atomic
+
+        def slow_write(path, data):
+            release.wait(5)
+            write(path, data)
+
+        with patch('kpo.scores.write_json_atomic', side_effect=slow_write):
+            best_scores = {'1': [10, 1.0]}
+            writer.save(best_scores)
+            for score in (20, 30, 40):
+                best_scores['1'] = [score, 1.0]
+                writer.save(best_scores)
+            release.set()
+            self.assertTrue(writer.flush(timeout=5))
+            writer.close()
+
+        self.assertEqual(self.read(), {'1': [40, 1.0]})
+        self.assertLessEqual(writer.writes, 2)
+
+    def test_file_writer_writes_every_file_in_order(self):
+        writer = FileWriter()
+        release = threading.Event()
+        write = scores.write_atomic
+        written = []
+
+        def slow_write(path, data):
+            release.wait(5)
+            written.append(os.path.basename(path))
+            write(path, data)
+
+        with patch('kpo.scores.write_atomic', side_effect=slow_write):
+            for name in ('a.kpor', 'b.kpor', 'c.kpor'):
+                writer.save(os.path.join(self.tmp_dir.name, 'replays', name), name.encode())
+            # Saving does not wait for the disk
+            self.assertEqual(written, [])
+            release.set()
+            self.assertTrue(writer.flush(timeout=5))
+            writer.close()
+
+        self.assertEqual(written, ['a.kpor', 'b.kpor', 'c.kpor'])
+        self.assertEqual(writer.writes, 3)
+        with open(os.path.join(self.tmp_dir.name, 'replays', 'b.kpor'), 'rb') as file:
+            self.assertEqual(file.read(), b'b.kpor')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+import pygame
+
+from kpo.screens import BUTTON_COLOR, BUTTON_HOVER_COLOR, ScreenCache, StaticScreen
+
+
+class TestStaticScreen(unittest.TestCase):
+
+    def setUp(self):
+        self.background = pygame.Surface((400, 300))
+        self.screen = StaticScreen(self.background)
+        self.left = pygame.Rect(10, 10, 100, 40)
+        self.right = pygame.Rect(200, 10, 100, 40)
+        self.screen.add_button(self.left, pygame.Surface((10, 10)))
+        self.screen.add_button(self.right, pygame.Surface((10, 10)))
+
+    def test_update_redraws_only_flipped_buttons(self):
+        self.assertEqual(self.screen.update(0, 0), [self.left, self.right])
+        self.assertEqual(self.screen.surface.get_at(self.left.topleft), BUTTON_COLOR)
+        self.assertEqual(self.screen.update(1, 1), [])
+
+        self.assertEqual(self.screen.update(*self.left.center), [self.left])
+        self.assertEqual(self.screen.surface.get_at(self.left.topleft), BUTTON_HOVER_COLOR)
+        self.assertEqual(self.screen.update(*self.right.center), [self.left, self.right])
+        self.assertEqual(self.screen.surface.get_at(self.left.topleft), BUTTON_COLOR)
+
+    def test_background_is_copied(self):
+        self.screen.update(0, 0)
+        self.assertEqual(self.background.get_at(self.left.topleft), (0, 0, 0, 255))
+
+
+class TestScreenCache(unittest.TestCase):
+
+    def test_get_composes_once_per_key(self):
+        cache = ScreenCache()
+        background = pygame.Surface((40, 30))
+        composed = []
+
+        def compose():
+            composed.append(StaticScreen(background))
+            return composed[-1]
+
+        first = cache.get('menu', (background,), compose)
+        self.assertIs(cache.get('menu', (background,), compose), first)
+        self.assertIsNot(cache.get('menu', (pygame.Surface((40, 30)),), compose), first)
+        self.assertEqual(len(composed), 2)
+
+        cache.discard('menu')
+        cache.discard('settings')
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from kpo.fruit import Fruit, FruitPool, FruitStore
+from kpo.sim import TICK_MS, World
+
+
+class TestFruitPool(unittest.TestCase):
+
+    def test_released_fruits_are_reused(self):
+        pool = FruitPool()
+        fruit = pool.acquire('apple', -1, 100, 200)
+        self.assertIsInstance(fruit, Fruit)
+        self.assertFalse(hasattr(fruit, '__dict__'))
+
+        pool.release([fruit])
+        reused = pool.acquire('banana', -2, 300, 400)
+        self.assertIs(reused, fruit)
+        self.assertEqual((reused.name, reused.speed, reused.img_pos), ('banana', -2, [300, 400]))
+        self.assertEqual(len(pool), 0)
+
+
+class TestFruitStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = FruitStore(['watermelon', 'apple', 'banana'], capacity=2)
+
+    def test_add_grows(self):
+        for i in range(5):
+            self.store.add(i % 3, 100 + i, 800, -1)
+
+        self.assertEqual(len(self.store), 5)
+        self.assertGreaterEqual(len(self.store.x), 5)
+        self.assertEqual(self.store.x[:5].tolist(), [100, 101, 102, 103, 104])
+        fruit = self.store[4]
+        self.assertEqual(fruit.name, 'apple')
+        self.assertEqual(fruit.img_pos, [104, 800])
+
+    def test_move_and_hit_point(self):
+        self.store.add(0, 100, 500, -1)
+        self.store.add(1, 300, 500, -1)
+        self.store.move(-10)
+
+        self.assertEqual(self.store.y[:2].tolist(), [490, 490])
+        self.assertEqual(self.store.hit_point(150, 490).tolist(), [True, False])
+        self.assertEqual(self.store.hit_point(200, 490).tolist(), [False, False])
+
+    def test_remove_swaps_tail_into_holes(self):
+        for i in range(5):
+            self.store.add(0, i, 0, -1)
+        self.store.remove(np.array([True, False, True, False, False]))
+
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(sorted(self.store.x[:3].tolist()), [1, 3, 4])
+
+    def test_hit_path_slices_between_samples(self):
+        self.store.add(0, 500, 400, -1)
+        self.store.add(1, 900, 400, -1)
+
+        # Neither sample lies inside a fruit, but the swipe crosses the first one
+        self.assertEqual(self.store.hit_path([(300, 450), (700, 450)]).tolist(), [True, False])
+        self.assertEqual(self.store.hit_path([(300, 300), (700, 300)]).tolist(), [False, False])
+        self.assertEqual(self.store.hit_path([(950, 450)]).tolist(), [False, True])
+
+    def test_broad_phase_follows_removal(self):
+        for i in range(6):
+            self.store.add(0, 100 * i, 0, -1)
+        self.store.remove(np.array([True, False, False, True, False, False]))
+
+        rows = sorted(row for cell in self.store.cells.values() for row in cell)
+        self.assertEqual(rows, [0, 1, 2, 3])
+        for cell, cell_rows in self.store.cells.items():
+            for row in cell_rows:
+                self.assertEqual(int(self.store.x[row] // 100), cell)
+        self.assertEqual(self.store.hit_path([(0, 50), (600, 50)]).tolist(), [True] * 4)
+
+
+class TestWorld(unittest.TestCase):
+
+    def setUp(self):
+        self.world = World((1400, 800), start_time=1000)
+
+    def add_fruit(self, x, y):
+        self.world.fruits.add(1, x, y, self.world.fruit_speed)
+
+    def test_init(self):
+        self.assertEqual(self.world.time, 1000)
+        self.assertEqual(self.world.last_speed_increase_time, 1000)
+        self.assertEqual(self.world.fruit_speed, -1)
+        self.assertEqual(self.world.score, 0)
+        self.assertEqual(self.world.lives, 3)
+        self.assertEqual(len(self.world.fruits), 0)
+        self.assertFalse(self.world.over)
+
+    @patch('kpo.spawn.SpawnScheduler.due', return_value=[])
+    def test_step_moves_fruits(self, mock_due):
+        self.add_fruit(500, 400)
+        self.world.step(TICK_MS, [])
+
+        fruit = self.world.fruits[0]
+        self.assertEqual(fruit.y_pos, 399)
+        self.assertEqual(fruit.img_pos, [500, 399])
+        self.assertAlmostEqual(self.world.time, 1000 + TICK_MS)
+        self.assertAlmostEqual(self.world.elapsed, TICK_MS)
+
+    @patch('kpo.spawn.SpawnScheduler.due', return_value=[])
+    def test_step_slices_fruit_under_pointer(self, mock_due):
+        self.add_fruit(500, 400)
+        self.world.step(TICK_MS, [(0, 0), (550, 450)])
+
+        self.assertEqual(len(self.world.fruits), 0)
+        self.assertEqual([fruit.name for fruit in self.world.sliced], ['apple'])
+        self.assertEqual(self.world.score, 1)
+
+    @patch('kpo.spawn.SpawnScheduler.due', return_value=[])
+    def test_step_misses_fruit_off_screen(self, mock_due):
+        self.add_fruit(500, -100)
+        self.world.step(TICK_MS, [])
+
+        self.assertEqual(len(self.world.fruits), 0)
+        self.assertEqual([fruit.img_pos for fruit in self.world.missed], [[500, -101]])
+        self.assertEqual(self.world.lives, 2)
+
+    @patch('kpo.spawn.SpawnScheduler.due', return_value=[])
+    def test_step_increases_speed(self, mock_due):
+        for _ in range(int(5000 / TICK_MS) + 1):
+            self.world.step(TICK_MS, [])
+        self.assertEqual(self.world.fruit_speed, -2.05)
+
+    def test_headless_session(self):
+        # A full session must run without a display
+        ticks = 0
+        while not self.world.over and ticks < 100000:
+            self.world.step(TICK_MS, [])
+            ticks += 1
+        self.assertTrue(self.world.over)
+        self.assertEqual(self.world.score, 0)
+
+    @patch('kpo.spawn.SpawnScheduler.due', return_value=[])
+    def test_steady_state_reuses_event_fruits(self, mock_due):
+        self.add_fruit(500, 400)
+        self.world.step(TICK_MS, [(550, 450)])
+        sliced = self.world.sliced[0]
+
+        self.add_fruit(700, 400)
+        self.world.step(TICK_MS, [(750, 450)])
+        self.assertIs(self.world.sliced[0], sliced)
+
+    def test_reset(self):
+        self.add_fruit(500, 400)
+        self.world.score = 5
+        self.world.lives = 1
+        self.world.reset(2000)
+
+        self.assertEqual(len(self.world.fruits), 0)
+        self.assertEqual(self.world.score, 0)
+        self.assertEqual(self.world.lives, 3)
+        self.assertEqual(self.world.time, 2000)
+        self.assertEqual(self.world.elapsed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from kpo.sim import TICK_MS, World
+from kpo.spawn import SpawnScheduler
+
+
+class TestSpawnScheduler(unittest.TestCase):
+
+    def test_due_pops_only_due_spawns(self):
+        scheduler = SpawnScheduler(seed=1, batch_size=8)
+        scheduler.schedule(50, 2, 300)
+        scheduler.schedule(10, 1, 200)
+
+        # The drawn spawns are an average of 10 seconds apart
+        self.assertEqual(scheduler.due(0, 10000, 3, 1400), [])
+        self.assertEqual(len(scheduler), 10)
+        self.assertEqual(scheduler.due(50, 10000, 3, 1400), [(10, 1, 200), (50, 2, 300)])
+        self.assertEqual(len(scheduler), 8)
+
+    def test_draws_are_seeded_and_in_range(self):
+        first = SpawnScheduler(seed=7).due(100000, 500, 3, 1400)
+        second = SpawnScheduler(seed=7).due(100000, 500, 3, 1400)
+        self.assertEqual(first, second)
+
+        times = [time for time, _, _ in first]
+        self.assertEqual(times, sorted(times))
+        self.assertTrue(all(0 <= kind < 3 and 100 <= x <= 1300 for _, kind, x in first))
+        # About 100000 / 500 spawns
+        self.assertTrue(150 < len(first) < 250)
+
+    def test_spawn_density_is_independent_of_tick_length(self):
+        counts = []
+        for tick in (TICK_MS / 2, TICK_MS, TICK_MS * 4):
+            scheduler = SpawnScheduler(seed=3)
+            count = 0
+            for now in np.arange(tick, 60000 + tick / 2, tick):
+                count += len(scheduler.due(now, 41 * TICK_MS, 3, 1400))
+            counts.append(count)
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(counts[1], counts[2])
+
+    def test_world_sessions_are_deterministic(self):
+        worlds = [World((1400, 800), seed=11) for _ in range(2)]
+        for world in worlds:
+            for _ in range(600):
+                world.step(TICK_MS, [])
+        self.assertEqual(worlds[0].fruits.x[:len(worlds[0].fruits)].tolist(),
+                         worlds[1].fruits.x[:len(worlds[1].fruits)].tolist())
+        self.assertGreater(len(worlds[0].fruits), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
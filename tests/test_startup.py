@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import patch
+
+from kpo import startup
+from kpo.startup import StartupProfile, process_age
+
+
+class TestStartupProfile(unittest.TestCase):
+
+    def test_phases_follow_each_other(self):
+        times = iter([startup.IMPORT_STARTED + 0.5, startup.IMPORT_STARTED + 0.75])
+        with patch('kpo.startup.process_age', return_value=None):
+            profile = StartupProfile()
+        with patch('time.perf_counter', side_effect=lambda: next(times)):
+            profile.mark('imports')
+            profile.mark('window')
+
+        self.assertEqual(profile.phases, [('imports', 0.5), ('window', 0.25)])
+        self.assertEqual(profile.report().splitlines(), [
+            'imports                 500.0 ms', 'window                  250.0 ms', 'startup total           750.0 ms'])
+
+    def test_interpreter_phase(self):
+        with patch('kpo.startup.process_age', return_value=100.0):
+            profile = StartupProfile()
+        self.assertEqual(profile.phases[0][0], 'interpreter')
+        self.assertLess(profile.phases[0][1], 100.0)
+
+    def test_process_age(self):
+        age = process_age()
+        if age is not None:
+            self.assertGreaterEqual(age, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
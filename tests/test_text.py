@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import MagicMock
+
+import pygame
+
+from kpo.text import TextCache
+
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        self.font = MagicMock()
+        self.font.render.side_effect = lambda text, antialias, color: MagicMock(text=text)
+        self.cache = TextCache(max_size=2)
+
+    def test_render_hits_and_misses(self):
+        first = self.cache.render(self.font, 'Score: 1', (255, 255, 255))
+        second = self.cache.render(self.font, 'Score: 1', (255, 255, 255))
+
+        self.assertIs(first, second)
+        self.font.render.assert_called_once_with('Score: 1', True, (255, 255, 255))
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+        # A different color is a different surface
+        self.cache.render(self.font, 'Score: 1', (255, 0, 0))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.render(self.font, 'a', (0, 0, 0))
+        self.cache.render(self.font, 'b', (0, 0, 0))
+        self.cache.render(self.font, 'a', (0, 0, 0))
+        self.cache.render(self.font, 'c', (0, 0, 0))
+
+        self.assertEqual(len(self.cache), 2)
+        self.cache.render(self.font, 'a', (0, 0, 0))
+        self.assertEqual(self.cache.hits, 2)
+        self.cache.render(self.font, 'b', (0, 0, 0))
+        self.assertEqual(self.font.render.call_count, 4)
+
+    def test_digit_strip(self):
+        pygame.font.init()
+        font = pygame.font.Font(None, 30)
+        strip = self.cache.digits(font, (255, 255, 255))
+
+        self.assertIs(self.cache.digits(font, (255, 255, 255)), strip)
+        target = pygame.Surface((200, 50))
+        rect = strip.draw(target, '12.5', (10, 5))
+        self.assertEqual(rect.topleft, (10, 5))
+        self.assertEqual(rect.width, sum(strip.areas[char].width for char in '12.5'))
+
+
+if __name__ == '__main__':
+    unittest.main()